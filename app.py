@@ -1,15 +1,39 @@
 
-import pandas as pd
-import plotly.express as px
+import logging
+from mlb import config, startup
+
+# Profiling Startup From the First Import When MLB_STARTUP_PROFILE=1
+startup.begin()
+
 import dash
 from dash import Dash, html, dcc, Input, Output
 import dash_bootstrap_components as dbc
-from pybaseball import batting_stats, pitching_stats
+from mlb.datasets import load_datasets
+from mlb.export import register_export
+from mlb.instrumentation import dataset_loads, instrument
+from mlb.refresh import start_refresh
+from mlb.seasons import DEFAULT_SEASON, SEASONS
+
+logging.basicConfig(level=logging.INFO,format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+# Loading Every Page Dataset Up Front, Unless Lazy Startup Leaves It to the First Request
+if not config.LAZY_STARTUP:
+    with startup.phase('datasets'):
+        load_datasets()
+
+# Refetching the Current Season in the Background
+refresh_scheduler=start_refresh()
 
 
 # Instantiating the Dashboard
 dashboard = Dash(__name__,external_stylesheets=[dbc.themes.SANDSTONE],use_pages=True)
 server=dashboard.server
+
+# Timing Every Callback and Serving /metrics
+instrument(server)
+
+# Streaming Chart Data Downloads From /export
+register_export(server)
 dashboard.title = 'Project 6 Dashboard'
 
 # The Dashboard Layout
@@ -17,9 +41,24 @@ dashboard.layout = dbc.Container(
     children=[
         # Page Navigation
         dbc.NavbarSimple(
-            brand='2022 MLB Season Dashboard',
+            brand='MLB Season Dashboard',
             children=[
+                # Season Selector Shared by Every Page
+                dbc.NavItem(
+                    dcc.Dropdown(
+                        id='season_choice',
+                        options=[dict(label=str(x),value=x) for x in reversed(SEASONS)],
+                        value=[DEFAULT_SEASON],
+                        multi=True,
+                        clearable=False,
+                        persistence=True,
+                        placeholder='Season(s), up to {}'.format(config.MAX_SEASONS),
+                        style={'min-width':'220px'}
+                    ),
+                    className='me-3 my-auto'
+                ),
                 dbc.NavItem(dbc.NavLink('Home',href='/')),
+                dbc.NavItem(dbc.NavLink('Leaderboards',href='/leaderboard')),
                 dbc.DropdownMenu(
                     children=[
                         dbc.DropdownMenuItem('Batting Data',href='/player-batting'),
@@ -50,6 +89,21 @@ dashboard.layout = dbc.Container(
     class_name='px-0'
 )
 
+# Keeping the Season Selection Within What the Season Cache Holds
+@dashboard.callback(
+    Output('season_choice','value'),
+    Input('season_choice','value'),
+)
+
+def limit_seasons(seasons):
+    # The most recently picked seasons are kept
+    if seasons and len(seasons)>config.MAX_SEASONS:
+        return seasons[-config.MAX_SEASONS:]
+    return dash.no_update
+
+# Reporting the Startup Profile
+startup.finish(dataset_loads())
+
 
 # run the app
 if __name__ == '__main__':
@@ -0,0 +1,137 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.offline import FIXTURE_SEASON, RESULTS_DIR, git_commit, missing_fixtures_message, use_fixtures
+
+# Pointing the Data Layer at the Recorded Fixtures Before Anything Imports It
+use_fixtures()
+
+SELECTION_SIZES = ['1', '10', 'all']
+CHART_OUTPUTS = {
+    'player-batting': 'batter_chart.figure',
+    'player-pitching': 'pitcher_chart.figure',
+    'team-batting': 'team_batting_chart.figure',
+    'team-pitching': 'team_pitching_bar_chart.figure',
+}
+
+
+# Loading the Dashboard and Its Page Callbacks
+def load_pages():
+    try:
+        import app  # noqa: F401
+    except FileNotFoundError as error:
+        sys.exit(missing_fixtures_message(error))
+
+    # Dash wraps each callback, the original function sits underneath
+    from dash._callback import GLOBAL_CALLBACK_MAP
+    return {page: GLOBAL_CALLBACK_MAP[output]['callback'].__wrapped__ for page, output in CHART_OUTPUTS.items()}
+
+
+def ranked_labels(name, column):
+    from mlb.datasets import get_dataset
+    data = get_dataset(name, FIXTURE_SEASON)
+    return data.sort_values(column, ascending=False).index.tolist()
+
+
+def selection(labels, size):
+    return labels if size == 'all' else labels[:int(size)]
+
+
+# Building the Input Matrix for Every Page
+def input_matrix():
+    from mlb.datasets import get_dataset, stat_columns
+
+    seasons = [FIXTURE_SEASON]
+    matrix = []
+
+    batters = ranked_labels('player_batting', 'Plate Appearances (PA)')
+    for stat in stat_columns(get_dataset('player_batting', FIXTURE_SEASON)):
+        for size in SELECTION_SIZES:
+            matrix.append(('player-batting', stat, size, (stat, selection(batters, size), seasons, 'value', 0)))
+
+    # The scatter plots every pitcher above an innings cutoff, so the cutoff sets the point count
+    innings = sorted(get_dataset('player_pitching', FIXTURE_SEASON)['Innings Pitched (IP)'], reverse=True)
+    cutoffs = {'1': innings[0], '10': innings[9], 'all': 0}
+    for stat in stat_columns(get_dataset('player_pitching', FIXTURE_SEASON)):
+        for size in SELECTION_SIZES:
+            matrix.append(('player-pitching', stat, size, (stat, 'Earned Run Average (ERA)', seasons, cutoffs[size])))
+
+    for page, name in [('team-batting', 'team_batting'), ('team-pitching', 'team_pitching')]:
+        teams = ranked_labels(name, 'Games Played (G)')
+        for stat in stat_columns(get_dataset(name, FIXTURE_SEASON)):
+            for size in SELECTION_SIZES:
+                matrix.append((page, stat, size, (stat, selection(teams, size), seasons, 'value', 0)))
+    return matrix
+
+
+# Timing Each Callback Cold (Cache Cleared) and Warm (Cache Hit)
+def run(repeat):
+    from mlb.figure_cache import figure_cache
+
+    callbacks = load_pages()
+    timings = {}
+    for page, stat, size, args in input_matrix():
+        for mode in ['cold', 'warm']:
+            bucket = timings.setdefault((page, size, mode), dict(latencies=[], sizes=[]))
+            for _ in range(repeat):
+                if mode == 'cold':
+                    figure_cache.invalidate()
+                started = time.perf_counter()
+                figure = callbacks[page](*args)
+                bucket['latencies'].append(time.perf_counter() - started)
+            bucket['sizes'].append(len(json.dumps(figure)))
+
+    results = []
+    for (page, size, mode), bucket in sorted(timings.items()):
+        latencies = np.array(bucket['latencies']) * 1000
+        results.append(dict(
+            page=page,
+            selection=size,
+            mode=mode,
+            calls=len(latencies),
+            p50_ms=float(np.percentile(latencies, 50)),
+            p99_ms=float(np.percentile(latencies, 99)),
+            json_bytes=int(np.median(bucket['sizes'])),
+        ))
+    return results
+
+
+# Reporting and Comparing Results
+def print_results(results, baseline=None):
+    previous = {}
+    if baseline is not None:
+        previous = {(x['page'], x['selection'], x['mode']): x for x in baseline['results']}
+
+    print('{:<16} {:>9} {:>5} {:>10} {:>10} {:>11} {:>9}'.format('page', 'selection', 'mode', 'p50 ms', 'p99 ms', 'json bytes', 'p50 vs'))
+    for row in results:
+        before = previous.get((row['page'], row['selection'], row['mode']))
+        change = '{:+.0%}'.format(row['p50_ms'] / before['p50_ms'] - 1) if before else ''
+        print('{:<16} {:>9} {:>5} {:>10.3f} {:>10.3f} {:>11,} {:>9}'.format(row['page'], row['selection'], row['mode'], row['p50_ms'], row['p99_ms'], row['json_bytes'], change))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time the page callbacks offline against recorded fixtures.')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='JSON results file (defaults to benchmarks/results/callbacks-<commit>.json)')
+    parser.add_argument('--compare', help='Earlier JSON results file to compare p50 latency against')
+    arguments = parser.parse_args()
+
+    commit = git_commit()
+    report = dict(commit=commit, season=FIXTURE_SEASON, repeat=arguments.repeat, recorded_at=time.strftime('%Y-%m-%dT%H:%M:%S'), results=run(arguments.repeat))
+
+    baseline = None
+    if arguments.compare:
+        with open(arguments.compare) as handle:
+            baseline = json.load(handle)
+    print_results(report['results'], baseline)
+
+    output = arguments.output or os.path.join(RESULTS_DIR, 'callbacks-{}.json'.format(commit))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as handle:
+        json.dump(report, handle, indent=2)
+    print('Results written to {}'.format(output))
@@ -0,0 +1,95 @@
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from mlb.figures import bar_figure, bar_template, scatter_figure, scatter_template
+
+# Benchmark Settings
+STAT = 'Home Runs (HR)'
+SIZES = [1, 10, 130, 800]
+
+
+# Reference Path Matching the Original Page Callbacks
+def px_bar_chart(subset, stat, color_map):
+    figure = px.bar(subset, x=stat, y='Name (Team)', orientation='h', text_auto=True, title=' ', color='Name (Team)', color_discrete_map=color_map)
+    figure.update_xaxes(title_font={'size': 18, 'color': 'black'}, tickfont=dict(size=14, color='black'), showgrid=True, gridwidth=1, gridcolor='black', showline=True, linewidth=1, linecolor='black')
+    figure.update_yaxes(title_text='Player(s) (Team Abbreviation)', title_font={'size': 18, 'color': 'black'}, tickfont=dict(size=14, color='black'), showline=True, linewidth=1, linecolor='black', categoryorder='total ascending')
+    figure.update_layout(title_font={'size': 24, 'color': 'black'}, title_x=0.5, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', margin=dict(l=0, r=0, t=0, b=0), showlegend=False)
+    figure.update_traces(marker_line_color='black', marker_line_width=0.5, textfont_size=14)
+    return figure.to_json()
+
+
+def px_scatter_chart(data, x_stat, y_stat, color_map):
+    figure = px.scatter(data, x=x_stat, y=y_stat, title=' ', hover_name=data.index, color=data.index, color_discrete_map=color_map)
+    figure.update_xaxes(title_font={'size': 18, 'color': 'black'}, tickfont=dict(size=14, color='black'), showgrid=True, gridwidth=0.5, gridcolor='black', showline=True, linewidth=1, linecolor='black')
+    figure.update_yaxes(title_font={'size': 18, 'color': 'black'}, tickfont=dict(size=14, color='black'), showline=True, linewidth=1, linecolor='black', showgrid=True, gridwidth=1, gridcolor='black')
+    figure.update_layout(title_font={'size': 24, 'color': 'black'}, title_x=0.5, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', margin=dict(l=0, r=0, t=0, b=0), showlegend=False)
+    figure.update_traces(marker_size=11, marker_line_color='black', marker_line_width=1, textfont_size=14)
+    return figure.to_json()
+
+
+# Template Path Used by the Pages
+batting_template = bar_template('Player(s) (Team Abbreviation)')
+pitching_template = scatter_template()
+
+
+def template_bar_chart(subset, stat, color_map):
+    colors = [color_map[x] for x in subset['Name (Team)']]
+    figure = bar_figure(batting_template, subset['Name (Team)'].tolist(), subset[stat].tolist(), colors, stat, 'Name (Team)', marker_line_width=0.5)
+    return json.dumps(figure)
+
+
+def template_scatter_chart(data, x_stat, y_stat, color_map):
+    colors = [color_map[x] for x in data.index]
+    figure = scatter_figure(pitching_template, data.index.tolist(), data[x_stat].tolist(), data[y_stat].tolist(), colors, x_stat, y_stat)
+    return json.dumps(figure)
+
+
+# Timing Helpers
+def sample_frame(size):
+    rng = np.random.default_rng(size)
+    labels = ['Player {} (NYY)'.format(x) for x in range(size)]
+    return pd.DataFrame({'Name (Team)': labels, STAT: rng.integers(0, 60, size), 'ERA': rng.random(size) * 6})
+
+
+def time_call(function, args, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        payload = function(*args)
+        timings.append(time.perf_counter() - started)
+    return dict(mean_ms=1000 * sum(timings) / repeat, min_ms=1000 * min(timings), payload_bytes=len(payload))
+
+
+def run(repeat):
+    results = []
+    for size in SIZES:
+        subset = sample_frame(size)
+        color_map = {label: '#003087' for label in subset['Name (Team)']}
+        scatter_data = subset.set_index('Name (Team)')
+        cases = [
+            ('bar', px_bar_chart, template_bar_chart, (subset, STAT, color_map)),
+            ('scatter', px_scatter_chart, template_scatter_chart, (scatter_data, STAT, 'ERA', color_map)),
+        ]
+        for chart, reference, candidate, args in cases:
+            before = time_call(reference, args, repeat)
+            after = time_call(candidate, args, repeat)
+            results.append(dict(chart=chart, points=size, plotly_express=before, template=after, speedup=before['mean_ms'] / after['mean_ms']))
+            print('{:<8} {:>4} points  px {:8.2f} ms  template {:6.3f} ms  speedup {:6.1f}x'.format(chart, size, before['mean_ms'], after['mean_ms'], results[-1]['speedup']))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare plotly express figures with the template figure builder.')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    arguments = parser.parse_args()
+
+    results = run(arguments.repeat)
+    if arguments.output:
+        with open(arguments.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
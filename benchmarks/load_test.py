@@ -0,0 +1,211 @@
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from benchmarks.offline import FIXTURE_SEASON, RESULTS_DIR, git_commit, missing_fixtures_message, use_fixtures
+
+# Pointing the Data Layer at the Recorded Fixtures Before Anything Imports It
+server_environment = use_fixtures()
+
+CALLBACK_PATH = '/_dash-update-component'
+
+
+# Building Callback Bodies the Way the Dash Renderer Sends Them
+def callback_body(output, inputs, state=()):
+    component_id, prop = output.rsplit('.', 1)
+    return dict(
+        output=output,
+        outputs=dict(id=component_id, property=prop),
+        inputs=[dict(id=x.rsplit('.', 1)[0], property=x.rsplit('.', 1)[1], value=value) for x, value in inputs],
+        state=[dict(id=x.rsplit('.', 1)[0], property=x.rsplit('.', 1)[1], value=value) for x, value in state],
+        changedPropIds=[inputs[0][0]],
+    )
+
+
+class TrafficMix:
+    def __init__(self, seed):
+        from mlb.datasets import get_dataset, stat_columns
+
+        self.random = random.Random(seed)
+        self.seasons = [FIXTURE_SEASON]
+        batting = get_dataset('player_batting', FIXTURE_SEASON)
+        pitching = get_dataset('player_pitching', FIXTURE_SEASON)
+        teams = get_dataset('team_batting', FIXTURE_SEASON)
+
+        # Most users pick from the regulars, so selections come from the top of the PA list
+        self.batters = batting.sort_values('Plate Appearances (PA)', ascending=False).index[:200].tolist()
+        self.teams = teams.index.tolist()
+        self.stats = {
+            'player_batting': stat_columns(batting),
+            'player_pitching': stat_columns(pitching),
+            'team_batting': stat_columns(teams),
+            'team_pitching': stat_columns(get_dataset('team_pitching', FIXTURE_SEASON)),
+        }
+        self.requests = [self.batter_chart, self.batter_search, self.pitcher_chart, self.team_batting_chart, self.team_pitching_chart]
+
+    def pick(self, items, most=5):
+        return self.random.sample(items, self.random.randint(1, min(most, len(items))))
+
+    def batter_chart(self):
+        return 'batter_chart', callback_body('batter_chart.figure', [
+            ('batter_stat_choice.value', self.random.choice(self.stats['player_batting'])),
+            ('player_dropdown.value', self.pick(self.batters)),
+            ('season_choice.value', self.seasons),
+            ('batter_bar_order.value', self.random.choice(['value', 'value', 'percentile'])),
+            ('batter_min_percentile.value', 0),
+        ])
+
+    def batter_search(self):
+        name = self.random.choice(self.batters)
+        return 'player_search', callback_body('player_dropdown.options', [
+            ('player_dropdown.search_value', name[:self.random.randint(2, 5)]),
+            ('season_choice.value', self.seasons),
+            ('batter_pa_threshold.value', 502),
+        ], state=[('player_dropdown.value', ['Aaron Judge (NYY)'])])
+
+    def pitcher_chart(self):
+        x_stat, y_stat = self.random.sample(self.stats['player_pitching'], 2)
+        return 'pitcher_chart', callback_body('pitcher_chart.figure', [
+            ('pitcher_stat_dropdown1.value', x_stat),
+            ('pitcher_stat_dropdown2.value', y_stat),
+            ('season_choice.value', self.seasons),
+            ('pitcher_ip_threshold.value', self.random.choice([162, 162, 50, 0])),
+        ])
+
+    def team_batting_chart(self):
+        return 'team_batting_chart', callback_body('team_batting_chart.figure', [
+            ('team_batting_stat_choice.value', self.random.choice(self.stats['team_batting'])),
+            ('team_dropdown.value', self.pick(self.teams)),
+            ('season_choice.value', self.seasons),
+            ('team_batting_bar_order.value', self.random.choice(['value', 'value', 'percentile'])),
+            ('team_batting_min_percentile.value', 0),
+        ])
+
+    def team_pitching_chart(self):
+        return 'team_pitching_chart', callback_body('team_pitching_bar_chart.figure', [
+            ('team_pitching_stat_choice.value', self.random.choice(self.stats['team_pitching'])),
+            ('pitching_team_dropdown.value', self.pick(self.teams)),
+            ('season_choice.value', self.seasons),
+            ('team_pitching_bar_order.value', self.random.choice(['value', 'value', 'percentile'])),
+            ('team_pitching_min_percentile.value', 0),
+        ])
+
+    def next_request(self):
+        return self.random.choice(self.requests)()
+
+
+# Replaying Traffic From a Pool of Simulated Users
+def user_loop(address, mix, stop_at, samples, lock):
+    connection = http.client.HTTPConnection(address.hostname, address.port, timeout=30)
+    while time.perf_counter() < stop_at:
+        name, body = mix.next_request()
+        started = time.perf_counter()
+        try:
+            connection.request('POST', CALLBACK_PATH, json.dumps(body), {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            ok = False
+            connection.close()
+            connection = http.client.HTTPConnection(address.hostname, address.port, timeout=30)
+        with lock:
+            samples.append((name, time.perf_counter() - started, ok))
+    connection.close()
+
+
+def run_stage(address, users, duration, seed):
+    samples = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+    threads = [threading.Thread(target=user_loop, args=(address, TrafficMix(seed + x), stop_at, samples, lock)) for x in range(users)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = np.array([x[1] for x in samples]) * 1000
+    errors = sum(1 for x in samples if not x[2])
+    return dict(
+        users=users,
+        requests=len(samples),
+        throughput_rps=len(samples) / elapsed,
+        p50_ms=float(np.percentile(latencies, 50)) if len(samples) else None,
+        p95_ms=float(np.percentile(latencies, 95)) if len(samples) else None,
+        p99_ms=float(np.percentile(latencies, 99)) if len(samples) else None,
+        error_rate=errors / len(samples) if samples else 1.0,
+        by_callback={name: int(sum(1 for x in samples if x[0] == name)) for name in sorted(set(x[0] for x in samples))},
+    )
+
+
+# Starting a Local gunicorn Server on the Fixtures
+def start_server(port, workers):
+    command = [sys.executable, '-m', 'gunicorn', 'app:server', '--workers', str(workers), '--bind', '127.0.0.1:{}'.format(port)]
+    server = subprocess.Popen(command, env=server_environment)
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if server.poll() is not None:
+            sys.exit('gunicorn exited with code {}'.format(server.returncode))
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            connection.request('GET', '/')
+            if connection.getresponse().status == 200:
+                return server
+        except OSError:
+            time.sleep(0.5)
+    server.terminate()
+    sys.exit('gunicorn did not answer within two minutes')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay Dash callback traffic against a server and ramp up concurrency.')
+    parser.add_argument('--url', help='Existing server to test, for example http://127.0.0.1:8050 (default: start gunicorn locally)')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers when starting a local server')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--users', default='1,2,4,8,16,32', help='Comma-separated concurrency levels to ramp through')
+    parser.add_argument('--duration', type=float, default=15, help='Seconds spent at each concurrency level')
+    parser.add_argument('--seed', type=int, default=406)
+    parser.add_argument('--output', help='JSON results file (defaults to benchmarks/results/load-<commit>.json)')
+    arguments = parser.parse_args()
+
+    server = None
+    if arguments.url is None:
+        server = start_server(arguments.port, arguments.workers)
+        arguments.url = 'http://127.0.0.1:{}'.format(arguments.port)
+
+    try:
+        try:
+            TrafficMix(arguments.seed)
+        except FileNotFoundError as error:
+            sys.exit(missing_fixtures_message(error))
+
+        address = urlsplit(arguments.url)
+        stages = []
+        print('{:>5} {:>9} {:>9} {:>9} {:>9} {:>9} {:>7}'.format('users', 'requests', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'errors'))
+        for users in [int(x) for x in arguments.users.split(',')]:
+            stage = run_stage(address, users, arguments.duration, arguments.seed)
+            stages.append(stage)
+            print('{users:>5} {requests:>9} {throughput_rps:>9.1f} {p50_ms:>9.1f} {p95_ms:>9.1f} {p99_ms:>9.1f} {error_rate:>7.1%}'.format(**stage))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    commit = git_commit()
+    report = dict(commit=commit, url=arguments.url, workers=arguments.workers if server else None, duration=arguments.duration, stages=stages)
+    output = arguments.output or os.path.join(RESULTS_DIR, 'load-{}.json'.format(commit))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as handle:
+        json.dump(report, handle, indent=2)
+    print('Results written to {}'.format(output))
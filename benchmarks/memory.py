@@ -0,0 +1,42 @@
+import argparse
+import json
+import sys
+
+from benchmarks.offline import FIXTURE_SEASON, missing_fixtures_message, use_fixtures
+
+# Pointing the Data Layer at the Recorded Fixtures Before Anything Imports It
+use_fixtures()
+
+from mlb.compact import compact_frame, memory_usage  # noqa: E402
+from mlb.datasets import DATASETS, build_dataset  # noqa: E402
+
+
+def run(season):
+    results = []
+    for name in DATASETS:
+        try:
+            before = build_dataset(name, season, compact=False)
+        except FileNotFoundError as error:
+            sys.exit(missing_fixtures_message(error))
+        after = compact_frame(before)
+        results.append(dict(
+            dataset=name,
+            rows=len(before),
+            before_bytes=memory_usage(before),
+            after_bytes=memory_usage(after),
+            dtypes={str(x): int(count) for x, count in after.dtypes.astype(str).value_counts().items()},
+        ))
+        print('{:<16} {:>6,} rows  {:>10,} -> {:>10,} bytes  ({:.0%} of the original)'.format(name, len(before), results[-1]['before_bytes'], results[-1]['after_bytes'], results[-1]['after_bytes'] / results[-1]['before_bytes']))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Report stat frame memory before and after dtype compaction.')
+    parser.add_argument('--season', type=int, default=FIXTURE_SEASON)
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    arguments = parser.parse_args()
+
+    results = run(arguments.season)
+    if arguments.output:
+        with open(arguments.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
@@ -0,0 +1,46 @@
+import atexit
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+# Recorded (or Synthetic) Fixtures Used in Place of pybaseball
+FIXTURE_DIR = os.environ.get('MLB_FIXTURE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures'))
+FIXTURE_SEASON = int(os.environ.get('MLB_DEFAULT_SEASON', 2022))
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def scratch_dir(variable, prefix):
+    # Only made when the variable is unset, and removed when the benchmark exits
+    if not os.environ.get(variable):
+        os.environ[variable] = tempfile.mkdtemp(prefix=prefix)
+        atexit.register(shutil.rmtree, os.environ[variable], ignore_errors=True)
+    return os.environ[variable]
+
+
+def use_fixtures(synthetic=True):
+    # Must run before anything imports mlb, since mlb.config reads the environment once
+    os.environ['MLB_SNAPSHOT_DIR'] = FIXTURE_DIR
+    os.environ['MLB_OFFLINE'] = '1'
+    os.environ['MLB_DEFAULT_SEASON'] = str(FIXTURE_SEASON)
+    scratch_dir('MLB_STORE_DIR', 'mlb-bench-store-')
+
+    # A fresh clone has no recorded fixtures, so a deterministic synthetic season stands in
+    if synthetic:
+        from benchmarks.synthetic_fixtures import write_fixtures
+        written = write_fixtures(FIXTURE_SEASON)
+        if written:
+            print('No recorded fixtures for {}, wrote synthetic {}'.format(FIXTURE_SEASON, ', '.join(written)), file=sys.stderr)
+    return dict(os.environ)
+
+
+def missing_fixtures_message(error):
+    return '{}\nRecord fixtures first with: python -m benchmarks.record_fixtures --season {}'.format(error, FIXTURE_SEASON)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
@@ -0,0 +1,26 @@
+import argparse
+import os
+
+from benchmarks.offline import FIXTURE_DIR, FIXTURE_SEASON
+
+# Recording Into the Fixture Directory Instead of the Live Snapshot Cache
+os.environ['MLB_SNAPSHOT_DIR'] = FIXTURE_DIR
+
+from mlb.datasets import DATASETS  # noqa: E402
+from mlb.snapshots import fetch_from_pybaseball, snapshot_key, write_snapshot  # noqa: E402
+
+
+def record(season):
+    for name, spec in DATASETS.items():
+        fetch_args = spec.get('fetch_args', {})
+        frame = fetch_from_pybaseball(spec['fetch'], season, **fetch_args)
+        key = snapshot_key(spec['fetch'], season, **fetch_args)
+        write_snapshot(key, frame, function=spec['fetch'], season=season, kwargs=fetch_args)
+        print('Recorded {} ({} rows) as {}'.format(name, len(frame), key))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Record pybaseball frames as offline benchmark fixtures.')
+    parser.add_argument('--season', type=int, default=FIXTURE_SEASON)
+    arguments = parser.parse_args()
+    record(arguments.season)
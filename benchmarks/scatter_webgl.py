@@ -0,0 +1,48 @@
+import argparse
+import json
+import time
+
+import numpy as np
+
+from mlb.figures import scatter_figure, scatter_template
+from mlb.teams import TEAM_COLORS, team_colors
+
+# Benchmark Settings
+SIZES = [100, 1000, 10000]
+MODES = {'svg': float('inf'), 'webgl': 0}
+
+pitching_template = scatter_template()
+
+
+def sample_points(size):
+    rng = np.random.default_rng(size)
+    teams = rng.choice(list(TEAM_COLORS), size)
+    labels = ['Pitcher {} ({})'.format(x, team) for x, team in enumerate(teams)]
+    return labels, (rng.random(size) * 200).tolist(), (rng.random(size) * 6).tolist(), team_colors(teams)
+
+
+def run(repeat):
+    results = []
+    for size in SIZES:
+        labels, x_values, y_values, colors = sample_points(size)
+        for mode, threshold in MODES.items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                payload = json.dumps(scatter_figure(pitching_template, labels, x_values, y_values, colors, 'Innings Pitched (IP)', 'Earned Run Average (ERA)', webgl_threshold=threshold))
+                timings.append(time.perf_counter() - started)
+            results.append(dict(points=size, mode=mode, build_ms=1000 * sum(timings) / repeat, payload_bytes=len(payload)))
+            print('{:>6} points  {:<6} build {:7.2f} ms  payload {:>9,} bytes'.format(size, mode, results[-1]['build_ms'], len(payload)))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Record scatter figure build time and payload size for SVG and WebGL traces.')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    arguments = parser.parse_args()
+
+    results = run(arguments.repeat)
+    if arguments.output:
+        with open(arguments.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
@@ -0,0 +1,56 @@
+import argparse
+import json
+import sys
+import time
+
+from benchmarks.offline import FIXTURE_SEASON, missing_fixtures_message, use_fixtures
+
+# Pointing the Data Layer at the Recorded Fixtures Before Anything Imports It
+use_fixtures()
+
+import numpy as np  # noqa: E402
+
+from mlb.datasets import DATASETS, get_dataset  # noqa: E402
+from mlb.derived import base_stats  # noqa: E402
+from mlb.similar import SimilarityIndex  # noqa: E402
+
+# Benchmark Settings
+ROSTER_COPIES = [1, 4, 16]
+WEIGHTS = {'Home Runs (HR)': 2, 'Strikeouts (SO)': 1, 'Walks (BB)': 1, 'Batting Average (AVG)': 1, 'On-Base Percentage (OBP)': 1, 'Slugging Percentage (SLG)': 1}
+
+
+def run(season, repeat, count):
+    try:
+        data = get_dataset('player_batting', season)
+    except FileNotFoundError as error:
+        sys.exit(missing_fixtures_message(error))
+
+    index = SimilarityIndex(data, base_stats(DATASETS['player_batting']))
+    results = []
+    for copies in ROSTER_COPIES:
+        # Stacking copies of the league stands in for several seasons searched at once
+        index.matrix = np.tile(index.matrix[:len(data)], (copies, 1))
+        pool = np.ones(len(index.matrix), dtype=bool)
+        weights = index.weight_vector(WEIGHTS)
+        target = index.matrix[0]
+        started = time.perf_counter()
+        for _ in range(repeat):
+            index.nearest(target, weights, pool, count, exclude=0)
+        milliseconds = 1000 * (time.perf_counter() - started) / repeat
+        results.append(dict(players=len(index.matrix), stats=index.matrix.shape[1], query_ms=milliseconds))
+        print('{:>7,} players x {} stats  {:6.3f} ms per query'.format(len(index.matrix), index.matrix.shape[1], milliseconds))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time similar-player queries against league-sized and larger stat matrices.')
+    parser.add_argument('--season', type=int, default=FIXTURE_SEASON)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--count', type=int, default=10)
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    arguments = parser.parse_args()
+
+    results = run(arguments.season, arguments.repeat, arguments.count)
+    if arguments.output:
+        with open(arguments.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
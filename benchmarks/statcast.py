@@ -0,0 +1,81 @@
+import argparse
+import json
+import sys
+import time
+from datetime import date
+
+from benchmarks.offline import FIXTURE_SEASON, scratch_dir
+
+# Ingesting Into a Scratch Directory Instead of the Live Statcast Store, With the Tests' Local Stand-In
+scratch_dir('MLB_STATCAST_DIR', 'mlb-bench-statcast-')
+
+from mlb import statcast  # noqa: E402
+from mlb.figures import heatmap_figure  # noqa: E402
+from mlb.heatmaps import HEATMAP_KINDS, bin_pitches, grid_values  # noqa: E402
+from tests.test_statcast import Interrupted, StatcastStandIn, interrupt_after  # noqa: E402
+
+
+def timed_read(season, columns, **filters):
+    started = time.perf_counter()
+    frame = statcast.read_pitches(season, columns, **filters)
+    return len(frame), time.perf_counter() - started
+
+
+def run(season, chunk_days, interrupt):
+    today = date(season, 12, 31)
+    stand_in = StatcastStandIn()
+
+    # A first run stopped partway through, then a second run picking up where it stopped
+    try:
+        statcast.ingest_season(season, fetch=interrupt_after(stand_in, interrupt), lookup=stand_in.names, chunk_days=chunk_days, today=today)
+    except Interrupted:
+        pass
+    first_calls = len(stand_in.calls)
+    started = time.perf_counter()
+    manifest = statcast.ingest_season(season, fetch=stand_in, lookup=stand_in.names, chunk_days=chunk_days, today=today)
+    resume_seconds = time.perf_counter() - started
+
+    chunks = list(statcast.season_chunks(season, chunk_days, today))
+    results = dict(
+        chunks=len(chunks),
+        fetched_before_interrupt=first_calls,
+        fetched_on_resume=len(stand_in.calls) - first_calls,
+        resume_seconds=resume_seconds,
+        pitches=sum(x['rows'] for x in manifest['chunks'].values()),
+    )
+
+    everything = timed_read(season, None)
+    month = timed_read(season, ['plate_x', 'plate_z'], start='{}-06-01'.format(season), end='{}-06-30'.format(season))
+    pitcher = timed_read(season, ['plate_x', 'plate_z', 'pitch_type'], pitcher_label=['Number 7 Pitcher (NYY)', 'Number 7 Pitcher (BOS)'])
+    results.update(full_read=everything, month_read=month, pitcher_read=pitcher)
+
+    # The binned chart stays the same size however many pitches feed it
+    points = statcast.read_pitches(season, ['plate_x', 'plate_z'])
+    counts, x_centers, y_centers = bin_pitches(points['plate_x'], points['plate_z'], HEATMAP_KINDS['location'])
+    results.update(
+        raw_points_bytes=len(json.dumps(dict(x=points['plate_x'].tolist(), y=points['plate_z'].tolist()))),
+        heatmap_bytes=len(json.dumps(heatmap_figure(HEATMAP_KINDS['location'], grid_values(counts), x_centers.tolist(), y_centers.tolist(), 'League'))),
+    )
+
+    print('{} chunks: {} fetched before the interruption, {} fetched on resume ({:.2f}s)'.format(results['chunks'], first_calls, results['fetched_on_resume'], resume_seconds))
+    # Every chunk is fetched exactly once across both runs, or the resume refetched finished work
+    if first_calls + results['fetched_on_resume'] != results['chunks']:
+        sys.exit('Resuming fetched {} chunks, expected the {} the first run did not finish'.format(results['fetched_on_resume'], results['chunks'] - first_calls))
+    for label, (rows, seconds) in [('Every column and partition', everything), ('One month, two columns', month), ('One pitcher, three columns', pitcher)]:
+        print('{:<28} {:>9,} rows in {:.3f}s'.format(label, rows, seconds))
+    print('League location chart: {:,} bytes as raw points, {:,} bytes as a binned heatmap'.format(results['raw_points_bytes'], results['heatmap_bytes']))
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ingest a synthetic Statcast season with a local stand-in, resume after an interruption and time pruned reads.')
+    parser.add_argument('--season', type=int, default=FIXTURE_SEASON)
+    parser.add_argument('--chunk-days', type=int, default=7)
+    parser.add_argument('--interrupt', type=int, default=5, help='Chunks fetched before the simulated interruption')
+    parser.add_argument('--output', help='Optional JSON file for the results')
+    arguments = parser.parse_args()
+
+    results = run(arguments.season, arguments.chunk_days, arguments.interrupt)
+    if arguments.output:
+        with open(arguments.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
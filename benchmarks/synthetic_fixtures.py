@@ -0,0 +1,199 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.offline import FIXTURE_SEASON, use_fixtures
+
+# Roster Sizes Close to a Real Season's qual=0 Leaderboards
+BATTERS = 650
+PITCHERS = 550
+TRADED = 0.05
+TEAM_GAMES = 162
+
+
+# Deterministic League Built From Binomial Draws, One Seed per Season
+def teams():
+    from mlb.teams import TEAM_NAMES
+    return [x for x in TEAM_NAMES if x != 'ATH']
+
+
+def player_teams(random, count):
+    names = np.asarray(teams())[random.integers(0, 30, count)]
+    # Players who changed teams mid-season are listed by FanGraphs without one
+    return np.where(random.random(count) < TRADED, '- - -', names).astype(object)
+
+
+def ratio(numerator, denominator, scale=1):
+    numerator, denominator = np.asarray(numerator, dtype=float), np.asarray(denominator, dtype=float)
+    return np.divide(numerator * scale, denominator, out=np.full(len(numerator), np.nan), where=denominator > 0).round(3)
+
+
+def batting_rates(frame):
+    ab = frame['PA'] - frame['BB'] - frame['HBP'] - frame['SF'] - frame['SH']
+    frame['AVG'] = ratio(frame['H'], ab)
+    frame['OBP'] = ratio(frame['H'] + frame['BB'] + frame['HBP'], ab + frame['BB'] + frame['HBP'] + frame['SF'])
+    frame['SLG'] = ratio(frame['1B'] + 2 * frame['2B'] + 3 * frame['3B'] + 4 * frame['HR'], ab)
+    frame['OPS'] = (frame['OBP'] + frame['SLG']).round(3)
+    frame['K%'] = ratio(frame['SO'], frame['PA'])
+    frame['BB%'] = ratio(frame['BB'], frame['PA'])
+    frame['BB/K'] = ratio(frame['BB'], frame['SO'])
+    frame['BABIP'] = ratio(frame['H'] - frame['HR'], ab - frame['SO'] - frame['HR'] + frame['SF'])
+    weighted = 0.69 * (frame['BB'] - frame['IBB']) + 0.72 * frame['HBP'] + 0.88 * frame['1B'] + 1.25 * frame['2B'] + 1.58 * frame['3B'] + 2.03 * frame['HR']
+    frame['wOBA'] = ratio(weighted, ab + frame['BB'] - frame['IBB'] + frame['SF'] + frame['HBP'])
+    frame['wRC'] = (((frame['wOBA'].fillna(0) - 0.31) / 1.25 + 0.12) * frame['PA']).round(0)
+    return frame
+
+
+def batted_ball_shares(random, count):
+    shares = random.dirichlet([20, 43, 37], count)
+    return dict(zip(['LD%', 'GB%', 'FB%'], shares.round(3).T))
+
+
+def batting_stats(random, season, count=BATTERS):
+    # Most of the league gets a handful of plate appearances, a few hundred play every day
+    pa = (random.beta(0.6, 1.1, count) * 720).astype(int) + 1
+    bb = random.binomial(pa, 0.085)
+    hbp = random.binomial(pa - bb, 0.011)
+    sf = random.binomial(pa - bb - hbp, 0.008)
+    sh = random.binomial(pa - bb - hbp - sf, 0.003)
+    ab = pa - bb - hbp - sf - sh
+    h = random.binomial(ab, np.clip(random.normal(0.245, 0.035, count), 0.1, 0.4))
+    hr = random.binomial(h, np.clip(random.normal(0.13, 0.05, count), 0, 0.35))
+    doubles = random.binomial(h - hr, 0.25)
+    triples = random.binomial(h - hr - doubles, 0.03)
+    so = np.minimum(random.binomial(pa, np.clip(random.normal(0.22, 0.05, count), 0.05, 0.45)), ab - h)
+    g = np.clip((pa / 4.1 + random.normal(0, 5, count)).round(), 1, TEAM_GAMES).astype(int)
+    sb = random.binomial(g, np.clip(random.exponential(0.04, count), 0, 0.4))
+    frame = pd.DataFrame({
+        'IDfg': np.arange(count) + 10000,
+        'Season': season,
+        'Name': ['Aaron Judge'] + ['Synthetic Batter {:03d}'.format(x) for x in range(1, count)],
+        'Team': player_teams(random, count),
+        'G': g, 'PA': pa, 'H': h, '1B': h - hr - doubles - triples, '2B': doubles, '3B': triples, 'HR': hr,
+        'R': random.binomial(h + bb + hbp, 0.4), 'RBI': random.binomial(h, 0.35) + hr, 'SO': so,
+        'BB': bb, 'IBB': random.binomial(bb, 0.08), 'HBP': hbp, 'SF': sf, 'SH': sh,
+        'SB': sb, 'CS': random.binomial(sb + 1, 0.2),
+        **batted_ball_shares(random, count),
+    })
+    frame.loc[0, 'Team'] = 'NYY'
+    frame = batting_rates(frame)
+    frame['WAR'] = (frame['wRC'] / 12 - frame['PA'] * 0.01 + random.normal(0, 0.5, count)).round(1)
+    return frame
+
+
+def innings(outs):
+    # FanGraphs writes thirds of an inning as .1 and .2
+    return outs // 3 + outs % 3 / 10
+
+
+def pitching_rates(frame, outs):
+    ip = outs / 3
+    frame['K/9'] = ratio(frame['SO'], ip, 9)
+    frame['BB/9'] = ratio(frame['BB'], ip, 9)
+    frame['H/9'] = ratio(frame['H'], ip, 9)
+    frame['HR/9'] = ratio(frame['HR'], ip, 9)
+    frame['K/BB'] = ratio(frame['SO'], frame['BB'])
+    frame['AVG'] = ratio(frame['H'], frame['TBF'] - frame['BB'] - frame['HBP'])
+    frame['ERA'] = ratio(frame['ER'], ip, 9)
+    frame['WHIP'] = ratio(frame['BB'] + frame['H'], ip)
+    frame['BABIP'] = ratio(frame['H'] - frame['HR'], frame['TBF'] - frame['BB'] - frame['HBP'] - frame['SO'] - frame['HR'])
+    frame['FIP'] = (ratio(13 * frame['HR'] + 3 * (frame['BB'] + frame['HBP']) - 2 * frame['SO'], ip) + 3.1).round(2)
+    frame['LOB%'] = ratio(frame['H'] + frame['BB'] + frame['HBP'] - frame['R'], frame['H'] + frame['BB'] + frame['HBP'] - 1.4 * frame['HR'])
+    frame['GB/FB'] = ratio(frame['GB%'], frame['FB%'])
+    return frame
+
+
+def pitching_stats(random, season, count=PITCHERS):
+    starters = random.random(count) < 0.3
+    outs = np.where(starters, random.beta(1.2, 1.5, count) * 620, random.beta(0.9, 2.5, count) * 240).astype(int) + 1
+    g = np.where(starters, outs // 17 + 1, np.clip(outs // 3 + random.integers(0, 10, count), 1, 80))
+    tbf = (outs * random.normal(1.4, 0.08, count)).round().astype(int) + 1
+    bb = random.binomial(tbf, np.clip(random.normal(0.08, 0.02, count), 0.02, 0.2))
+    hbp = random.binomial(tbf - bb, 0.01)
+    h = random.binomial(tbf - bb - hbp, 0.23)
+    r = random.binomial(h + bb + hbp, 0.32)
+    pitches = (tbf * random.normal(3.9, 0.15, count)).round().astype(int)
+    frame = pd.DataFrame({
+        'IDfg': np.arange(count) + 20000,
+        'Season': season,
+        'Name': ['Gerrit Cole'] + ['Synthetic Pitcher {:03d}'.format(x) for x in range(1, count)],
+        'Team': player_teams(random, count),
+        'W': random.binomial(g, np.where(starters, 0.35, 0.06)), 'L': random.binomial(g, np.where(starters, 0.3, 0.06)),
+        'SV': np.where(starters, 0, random.binomial(g, 0.1)), 'BS': np.where(starters, 0, random.binomial(g, 0.03)),
+        'G': g, 'CG': np.where(starters, random.binomial(g, 0.01), 0), 'IP': innings(outs), 'TBF': tbf,
+        'Pitches': pitches, 'Strikes': random.binomial(pitches, 0.64),
+        'H': h, 'R': r, 'ER': random.binomial(r, 0.92), 'HR': random.binomial(h, 0.13), 'BB': bb, 'HBP': hbp,
+        'SO': random.binomial(tbf - bb - hbp - h, np.clip(random.normal(0.3, 0.06, count), 0.1, 0.55)),
+        'WP': random.binomial(tbf, 0.006), 'BK': random.binomial(tbf, 0.0005),
+        **batted_ball_shares(random, count),
+    })
+    frame.loc[0, 'Team'] = 'NYY'
+    frame = pitching_rates(frame, outs)
+    frame['WAR'] = ((4.5 - frame['FIP'].fillna(4.5)) * outs / 27 / 10).round(1)
+    return frame, outs
+
+
+def team_totals(players, columns, shares):
+    # Each team's line is the sum of its players, with every team through a full season
+    listed = players[players['Team'] != '- - -']
+    totals = listed.groupby('Team', sort=True)[columns].sum().reset_index()
+    totals[list(shares)] = listed.groupby('Team', sort=True)[list(shares)].mean().round(3).to_numpy()
+    return totals
+
+
+def team_batting(players, season):
+    counts = ['PA', 'H', '1B', '2B', '3B', 'HR', 'R', 'RBI', 'SO', 'BB', 'IBB', 'HBP', 'SF', 'SH', 'SB', 'CS', 'WAR']
+    frame = batting_rates(team_totals(players, counts, ['LD%', 'GB%', 'FB%']))
+    frame.insert(0, 'Season', season)
+    frame['G'] = TEAM_GAMES
+    return frame
+
+
+def team_pitching(players, outs, season):
+    counts = ['W', 'L', 'SV', 'BS', 'G', 'CG', 'TBF', 'Pitches', 'Strikes', 'H', 'R', 'ER', 'HR', 'BB', 'HBP', 'SO', 'WP', 'BK', 'WAR']
+    players = players.assign(outs=outs)
+    frame = team_totals(players, counts + ['outs'], ['LD%', 'GB%', 'FB%'])
+    team_outs = frame.pop('outs').to_numpy()
+    frame['IP'] = innings(team_outs)
+    frame = pitching_rates(frame, team_outs)
+    frame.insert(0, 'Season', season)
+    return frame
+
+
+def synthetic_frames(season):
+    random = np.random.default_rng(season)
+    batters = batting_stats(random, season)
+    pitchers, outs = pitching_stats(random, season)
+    return dict(
+        batting_stats=batters,
+        pitching_stats=pitchers,
+        team_batting=team_batting(batters, season),
+        team_pitching=team_pitching(pitchers, outs, season),
+    )
+
+
+# Writing Only the Fixtures That Have Not Been Recorded
+def write_fixtures(season):
+    from mlb.datasets import DATASETS
+    from mlb.snapshots import snapshot_exists, snapshot_key, write_snapshot
+
+    missing = {name: spec for name, spec in DATASETS.items() if not snapshot_exists(spec['fetch'], season, **spec.get('fetch_args', {}))}
+    if not missing:
+        return []
+    frames = synthetic_frames(season)
+    for name, spec in missing.items():
+        fetch_args = spec.get('fetch_args', {})
+        key = snapshot_key(spec['fetch'], season, **fetch_args)
+        write_snapshot(key, frames[spec['fetch']], function=spec['fetch'], season=season, kwargs=fetch_args, synthetic=True)
+    return list(missing)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write a deterministic synthetic season for any benchmark fixture that has not been recorded.')
+    parser.add_argument('--season', type=int, default=FIXTURE_SEASON)
+    arguments = parser.parse_args()
+
+    use_fixtures(synthetic=False)
+    for name in write_fixtures(arguments.season):
+        print('Wrote synthetic {} for {}'.format(name, arguments.season))
@@ -0,0 +1,45 @@
+from mlb.startup import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Largest Rounding Error Accepted When Storing a Rate Stat as float32
+FLOAT32_TOLERANCE = 5e-5
+
+
+def memory_usage(frame):
+    return int(frame.memory_usage(deep=True).sum() + frame.index.memory_usage(deep=True))
+
+
+def compact_column(values):
+    if pd.api.types.is_bool_dtype(values) or not pd.api.types.is_numeric_dtype(values):
+        return values.astype('category')
+
+    numbers = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    finite = np.isfinite(numbers)
+
+    # Counting stats without gaps fit the smallest integer type that holds their range
+    if finite.all() and np.array_equal(numbers, np.round(numbers)):
+        return pd.to_numeric(values, downcast='integer')
+
+    # Rate stats drop to float32 only when no value moves by more than the tolerance
+    narrowed = numbers.astype(np.float32)
+    if np.allclose(numbers[finite], narrowed[finite], rtol=0, atol=FLOAT32_TOLERANCE):
+        return pd.Series(narrowed, index=values.index, name=values.name)
+    return values
+
+
+def compact_frame(frame):
+    compacted = frame.apply(compact_column)
+    compacted.index = frame.index.astype('category')
+    compacted.attrs = dict(frame.attrs)
+    return compacted
+
+
+# Sending float32 Stats to the Browser
+def display_values(values):
+    # Going through the shortest text form keeps 0.312 from arriving as 0.31200000643730164
+    values = np.asarray(values)
+    if values.dtype == np.float32:
+        return values.astype(str).astype(np.float64).tolist()
+    return values.tolist()
@@ -0,0 +1,54 @@
+import os
+
+# Project Directories
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Snapshot Cache Settings
+SNAPSHOT_DIR = os.environ.get('MLB_SNAPSHOT_DIR', os.path.join(BASE_DIR, 'snapshots'))
+SNAPSHOT_TTL = float(os.environ.get('MLB_SNAPSHOT_TTL', 24 * 60 * 60))
+OFFLINE = os.environ.get('MLB_OFFLINE', '0') == '1'
+
+# Upstream Fetch Settings, With Retries Waiting BACKOFF, 2 * BACKOFF, 4 * BACKOFF... Seconds
+FETCH_TIMEOUT = float(os.environ.get('MLB_FETCH_TIMEOUT', 30))
+FETCH_RETRIES = int(os.environ.get('MLB_FETCH_RETRIES', 3))
+FETCH_BACKOFF = float(os.environ.get('MLB_FETCH_BACKOFF', 2))
+
+# Background Refresh Settings, Where an Interval of 0 Turns Refreshing Off
+REFRESH_INTERVAL = float(os.environ.get('MLB_REFRESH_INTERVAL', SNAPSHOT_TTL))
+
+# Statcast Pitch Data Settings, Where a Fetch Timeout of 0 Waits as Long as a Chunk Takes
+STATCAST_DIR = os.environ.get('MLB_STATCAST_DIR', os.path.join(BASE_DIR, 'statcast'))
+STATCAST_CHUNK_DAYS = int(os.environ.get('MLB_STATCAST_CHUNK_DAYS', 7))
+STATCAST_FETCH_TIMEOUT = float(os.environ.get('MLB_STATCAST_FETCH_TIMEOUT', 30 * 60))
+
+# Heatmaps Are Binned Into a Grid This Many Cells Across
+HEATMAP_BINS = int(os.environ.get('MLB_HEATMAP_BINS', 40))
+
+# Shared Stats Store Settings
+STORE_DIR = os.environ.get('MLB_STORE_DIR', os.path.join(BASE_DIR, 'stats_store'))
+
+# Season Cache Settings
+DEFAULT_SEASON = os.environ.get('MLB_DEFAULT_SEASON')
+MAX_SEASONS = int(os.environ.get('MLB_MAX_SEASONS', 4))
+
+# Figure Cache Settings
+FIGURE_CACHE_SIZE = int(os.environ.get('MLB_FIGURE_CACHE_SIZE', 512))
+
+# Scatter Plots With More Points Than This Are Drawn With WebGL
+WEBGL_THRESHOLD = int(os.environ.get('MLB_WEBGL_THRESHOLD', 1000))
+
+# Number of Matches Returned by Player Searches
+SEARCH_LIMIT = int(os.environ.get('MLB_SEARCH_LIMIT', 50))
+
+# Startup Settings
+# Lazy startup defers pandas, numpy, pyarrow and the dataset preload until the first request
+LAZY_STARTUP = os.environ.get('MLB_LAZY_STARTUP', '0') == '1'
+STARTUP_PROFILE = os.environ.get('MLB_STARTUP_PROFILE', '0') == '1'
+
+# Export Settings
+# Rows per streamed block, and how many replaced store files per dataset season download links can still point at
+EXPORT_CHUNK_ROWS = int(os.environ.get('MLB_EXPORT_CHUNK_ROWS', 500))
+EXPORT_ARCHIVES = int(os.environ.get('MLB_EXPORT_ARCHIVES', 3))
+
+# Longest Leaderboard Kept Precomputed for Each Stat
+LEADERBOARD_SIZE = int(os.environ.get('MLB_LEADERBOARD_SIZE', 50))
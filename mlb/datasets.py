@@ -0,0 +1,399 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from mlb import config
+from mlb.compact import compact_frame, memory_usage
+from mlb.derived import add_derived, base_stats, derived_names
+from mlb.startup import lazy_import
+from mlb.seasons import DEFAULT_SEASON, SeasonCache, latest_season, normalize_seasons
+from mlb.shared_store import shared_frame, store_path
+from mlb.snapshots import cached_fetch, snapshot_exists
+from mlb.teams import TEAM_NAMES
+from mlb.instrumentation import record_dataset_load
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+logger = logging.getLogger(__name__)
+
+# Player Batting Columns and Display Names
+PLAYER_BATTING_COLUMNS = ['Season','Name','Team','G','PA','H','2B','3B','HR','R','RBI','SO','BB','IBB','HBP','SB','AVG','OBP','SLG','OPS','wOBA','wRC','WAR']
+PLAYER_BATTING_NAMES = {
+    'G': 'Games Played (G)',
+    'PA':'Plate Appearances (PA)',
+    'H':'Hits (H)',
+    '2B':'Doubles (2B)',
+    '3B':'Triples (3B)',
+    'HR':'Home Runs (HR)',
+    'R':'Runs Scored (R)',
+    'RBI':'Runs Batted In (RBI)',
+    'SO':'Strikeouts (SO)',
+    'BB':'Walks (BB)',
+    'IBB':'Intentional Walks (IBB)',
+    'HBP':'Hit By Pitches (HBP)',
+    'SB':'Stolen Bases',
+    'AVG':'Batting Average (AVG)',
+    'OBP':'On-Base Percentage (OBP)',
+    'SLG':'Slugging Percentage (SLG)',
+    'OPS':'On-Base Plus Slugging (OPS)',
+    'wOBA':'Weighted On-Base Average (wOBA)',
+    'wRC':'Weighted Runs Created (wRC)',
+    'WAR':'Wins Above Replacement (WAR)'
+}
+
+# Player Pitching Columns and Display Names
+PLAYER_PITCHING_COLUMNS = ['Season','Name','Team','W','L','G','IP','TBF','H','R','ER','HR','BB','HBP','SO','K/9','BB/9','K/BB','AVG','ERA','WHIP','BABIP','FIP','WAR']
+PLAYER_PITCHING_NAMES = {
+    'W':'Wins (W)',
+    'L':'Losses (L)',
+    'G':'Games Played (G)',
+    'IP':'Innings Pitched (IP)',
+    'TBF':'Total Batters Faced (TBF)',
+    'H':'Hits (H)',
+    'R':'Runs Scored Against (R)',
+    'ER':'Earned Runs (ER)',
+    'HR':'Home Runs Allowed (HR)',
+    'BB':'Walks (BB)',
+    'HBP':'Batters Hit By Pitches (HBP)',
+    'SO':'Strikeouts (SO)',
+    'K/9':'Number of Strikeouts Per 9 Innings (K/9)',
+    'BB/9':'Number of Walks Per 9 Innings (BB/9)',
+    'K/BB':'Strikeout to Walk Ratio (K/BB)',
+    'AVG':"Opponents' Batting Average (AVG)",
+    'ERA':'Earned Run Average (ERA)',
+    'WHIP':'Walks And Hits Per Inning Pitched (WHIP)',
+    'BABIP':'Batting Average on Balls in Play (BABIP)',
+    'FIP':'Fielding Independent Pitching (FIP)',
+    'WAR':'Wins Above Replacement (WAR)'
+}
+
+# Team Batting Columns and Display Names
+TEAM_BATTING_COLUMNS = ['Season','Team','G','PA','H','1B','2B','3B','HR','R','RBI','SO','K%','BB','BB%','IBB','BB/K','HBP','SF','SH','SB','CS','AVG','OBP','SLG','OPS','BABIP','LD%','GB%','FB%','wOBA','wRC','WAR']
+TEAM_BATTING_NAMES = {
+    'G': 'Games Played (G)',
+    'PA':'Plate Appearances (PA)',
+    'H':'Hits (H)',
+    '1B':'Singles (1B)',
+    '2B':'Doubles (2B)',
+    '3B':'Triples (3B)',
+    'HR':'Home Runs (HR)',
+    'R':'Runs Scored (R)',
+    'RBI':'Runs Batted In (RBI)',
+    'SO':'Strikeouts (SO)',
+    'K%':'Strikeout Percentage (K%)',
+    'BB':'Walks (BB)',
+    'BB%':'Walk Percentage (BB%)',
+    'IBB':'Intentional Walks (IBB)',
+    'BB/K':'Walk-to-Strikeout Ratio (BB/K)',
+    'HBP':'Hit By Pitches (HBP)',
+    'SF':'Sacrifice Flies (SF)',
+    'SH':'Sacrifice Hits (Bunts)',
+    'SB':'Stolen Bases',
+    'CS':'Caught Stealing (CS)',
+    'AVG':'Batting Average (AVG)',
+    'OBP':'On-Base Percentage (OBP)',
+    'SLG':'Slugging Percentage (SLG)',
+    'OPS':'On-Base Plus Slugging (OPS)',
+    'BABIP':'Batting Average on Balls in Play (BABIP)',
+    'LD%':'Line Drive Percentage (LD%)',
+    'GB%':'Ground Ball Percentage (GD%)',
+    'FB%':'Fly Ball Percentage (FB%)',
+    'wOBA':'Weighted On-Base Average (wOBA)',
+    'wRC':'Weighted Runs Created (wRC)',
+    'WAR':'Wins Above Replacement (WAR)'
+}
+
+# Team Pitching Columns and Display Names
+TEAM_PITCHING_COLUMNS = ['Season','Team','Pitches','Strikes','W','L','SV','BS','G','CG','IP','TBF','H','R','ER','HR','BB','HBP','SO','WP','BK','K/9','BB/9','K/BB','GB/FB','LD%','GB%','FB%','LOB%','H/9','HR/9','AVG','ERA','WHIP','BABIP','FIP','WAR']
+TEAM_PITCHING_NAMES = {
+    'W':'Wins (W)',
+    'L':'Losses (L)',
+    'SV':'Saves (SV)',
+    'BS':'Blown Saves (BS)',
+    'G':'Games Played (G)',
+    'CG':'Complete Games (CG)',
+    'IP':'Innings Pitched (IP)',
+    'TBF':'Total Batters Faced (TBF)',
+    'H':'Hits (H)',
+    'R':'Runs Scored Against (R)',
+    'ER':'Earned Runs (ER)',
+    'HR':'Home Runs Allowed (HR)',
+    'BB':'Walks (BB)',
+    'HBP':'Batters Hit By Pitches (HBP)',
+    'SO':'Strikeouts (SO)',
+    'WP':'Wild Pitches',
+    'BK':'Balks',
+    'K/9':'Number of Strikeouts Per 9 Innings (K/9)',
+    'BB/9':'Number of Walks Per 9 Innings (BB/9)',
+    'K/BB':'Strikeout to Walk Ratio (K/BB)',
+    'GB/FB':'Ground Ball-to-Fly Ball Ratio (GB/FB)','LD%':'Line Drive Percentage (LD%)',
+    'GB%':'Ground Ball Percentage (GB%)',
+    'FB%':'Fly Ball Percentage (FB%)',
+    'LOB%':'Runners Left On Base Percentage (LOB%)',
+    'H/9':'Hits Given Up Per 9 Innings (H/9)',
+    'HR/9':'Home Runs Given Up Per 9 Innings (HR/9)',
+    'AVG':"Opponents' Batting Average (AVG)",
+    'ERA':'Earned Run Average (ERA)',
+    'WHIP':'Walks And Hits Per Inning Pitched (WHIP)',
+    'BABIP':'Batting Average on Balls in Play (BABIP)',
+    'FIP':'Fielding Independent Pitching (FIP)',
+    'WAR':'Wins Above Replacement (WAR)'
+}
+# Dataset Definitions for Each Page
+# Player pages load the full league (qual=0) and filter by playing time per request
+# qualified is the full-season cutoff, and qualify_rate is the same cutoff per team game
+# Stats listed under lower are ones where a smaller value ranks higher
+DATASETS = {
+    'player_batting': dict(fetch='batting_stats', fetch_args=dict(qual=0), columns=PLAYER_BATTING_COLUMNS, names=PLAYER_BATTING_NAMES, index='Name (Team)', qualify='Plate Appearances (PA)', qualified=502, qualify_rate=3.1,
+                           rates=dict(columns=['H','2B','3B','HR','R','RBI','SO','BB','IBB','HBP','SB'], basis='PA', scale=1, label='per PA'), lower=['SO']),
+    'player_pitching': dict(fetch='pitching_stats', fetch_args=dict(qual=0), columns=PLAYER_PITCHING_COLUMNS, names=PLAYER_PITCHING_NAMES, index='Name (Team)', qualify='Innings Pitched (IP)', qualified=162, qualify_rate=1,
+                            rates=dict(columns=['H','R','ER','HR','HBP'], basis='IP', scale=9, label='per 9 IP'), lower=['L','H','R','ER','HR','BB','HBP','BB/9','AVG','ERA','WHIP','BABIP','FIP']),
+    'team_batting': dict(fetch='team_batting', columns=TEAM_BATTING_COLUMNS, names=TEAM_BATTING_NAMES, index='Team',
+                         rates=dict(columns=['H','1B','2B','3B','HR','R','RBI','SO','BB','IBB','HBP','SF','SH','SB','CS'], basis='PA', scale=1, label='per PA'), lower=['SO','K%','CS']),
+    'team_pitching': dict(fetch='team_pitching', columns=TEAM_PITCHING_COLUMNS, names=TEAM_PITCHING_NAMES, index='Team',
+                          rates=dict(columns=['R','ER','HBP','WP','BK'], basis='IP', scale=9, label='per 9 IP'), lower=['L','BS','H','R','ER','HR','BB','HBP','WP','BK','BB/9','H/9','HR/9','AVG','ERA','WHIP','BABIP','FIP']),
+}
+
+# Non-Stat Columns Kept Alongside the Stats
+INFO_COLUMNS = ['Team']
+
+
+# Fetching and Reshaping a Single Dataset
+def build_dataset(name, season=DEFAULT_SEASON, ttl=None, stale_ok=False, compact=True):
+    spec = DATASETS[name]
+    fetched = cached_fetch(spec['fetch'], season, ttl=ttl, stale_ok=stale_ok, **spec.get('fetch_args', {}))
+    data = fetched[spec['columns']].copy()
+    data.rename(columns=spec['names'], inplace=True)
+    data.attrs['fetched_at'] = fetched.attrs['fetched_at']
+
+    # Creating and Setting an Index
+    if spec['index'] == 'Name (Team)':
+        data['Name (Team)'] = data['Name'] + ' (' + data['Team'] + ')'
+        data.drop(columns=['Name'], inplace=True)
+    else:
+        data['Team'] = data['Team'].replace(TEAM_NAMES)
+    data.set_index(spec['index'], inplace=True)
+
+    # Removing the Season Column
+    data.drop(columns=['Season'], inplace=True)
+
+    # Adding Rates, League Indexes and z-Scores Once Per Build
+    data = add_derived(data, spec)
+
+    if not compact:
+        return data
+
+    # Shrinking Counting Stats, Rate Stats and Labels to Compact Types
+    compacted = compact_frame(data)
+    logger.info('Compacted %s %s from %.2f MB to %.2f MB', name, season, memory_usage(data) / 1e6, memory_usage(compacted) / 1e6)
+    return compacted
+
+
+def timed_build(name, season=DEFAULT_SEASON, max_age=None, stale_ok=False):
+    started = time.perf_counter()
+    data = shared_frame(name, season, partial(build_dataset, ttl=max_age, stale_ok=stale_ok), max_age, stale_ok)
+    seconds = time.perf_counter() - started
+    record_dataset_load(name, season, seconds)
+    logger.info('Loaded %s (%d rows) in %.2fs', name, len(data), seconds)
+    return data
+
+
+def has_local_data(name, season):
+    spec = DATASETS[name]
+    return os.path.exists(store_path(name, season)) or snapshot_exists(spec['fetch'], season, **spec.get('fetch_args', {}))
+
+
+def is_stale(data, season):
+    return season >= latest_season() and time.time() - data.attrs['fetched_at'] >= config.SNAPSHOT_TTL
+
+
+# Serving the Last Good Data Right Away and Revalidating It in the Background
+def load_dataset(name, season=DEFAULT_SEASON):
+    data = timed_build(name, season, stale_ok=True)
+    if is_stale(data, season):
+        revalidate(name, season)
+    return data
+
+
+# Seasons Kept in Memory, Mapped From the Shared Store on First Use
+season_cache = SeasonCache(load_dataset, config.MAX_SEASONS)
+
+
+# Loading Every Dataset Concurrently
+def load_datasets(names=None, season=DEFAULT_SEASON):
+    if names is None:
+        names = list(DATASETS)
+
+    # Datasets with nothing on disk are fetched in the background so startup never waits on upstream
+    local = [x for x in names if config.OFFLINE or has_local_data(x, season)]
+    for name in names:
+        if name not in local:
+            logger.warning('No local data for %s %s, fetching it in the background', name, season)
+            revalidate(name, season)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(len(local), 1)) as pool:
+        futures = [pool.submit(season_cache.get, name, season) for name in local]
+        for future in futures:
+            future.result()
+    logger.info('Loaded %d datasets in %.2fs', len(local), time.perf_counter() - started)
+
+
+# Refetching a Dataset Off to the Side and Swapping It In
+def refresh_dataset(name, season, max_age=None):
+    if max_age is None:
+        max_age = config.REFRESH_INTERVAL
+    # Returns None when the rebuilt data is no newer than the snapshot being served
+    return season_cache.swap(name, season, timed_build(name, season, max_age=max_age))
+
+
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+
+def revalidate(name, season):
+    if config.OFFLINE:
+        return
+    with _revalidating_lock:
+        if (name, season) in _revalidating:
+            return
+        _revalidating.add((name, season))
+    threading.Thread(target=run_revalidation, args=(name, season), name='mlb-revalidate', daemon=True).start()
+
+
+def run_revalidation(name, season):
+    try:
+        snapshot = refresh_dataset(name, season, max_age=config.SNAPSHOT_TTL)
+        if snapshot is not None:
+            logger.info('Revalidated %s %s as version %d', name, season, snapshot.version)
+    except Exception:
+        logger.warning('Revalidating %s %s failed, still serving the last good data', name, season, exc_info=True)
+    finally:
+        with _revalidating_lock:
+            _revalidating.discard((name, season))
+
+
+def get_dataset(name, season=DEFAULT_SEASON):
+    return season_cache.get(name, season)
+
+
+def stat_columns(data):
+    return [x for x in data.columns if x not in INFO_COLUMNS]
+
+
+def stat_names(name):
+    # Read from the dataset definition so pages can build their layouts without loading data
+    spec = DATASETS[name]
+    return base_stats(spec) + derived_names(spec)
+
+
+def data_version(name, seasons):
+    versions = []
+    for season in normalize_seasons(seasons):
+        versions.append(season_cache.version(name, season))
+    return tuple(versions)
+
+
+# Filtering Players by Playing Time
+def qualified(name, data, minimum):
+    # Comparing the column's values in place avoids copying the frame per request
+    column = DATASETS[name].get('qualify')
+    if minimum is None or column is None:
+        return np.ones(len(data), dtype=bool)
+    return data[column].to_numpy() >= minimum
+
+
+def team_games(season):
+    # The typical team's games played so far, read only from team batting already in memory or on disk
+    if ('team_batting', season) not in season_cache.loaded() and not has_local_data('team_batting', season):
+        return None
+    games = get_dataset('team_batting', season)['Games Played (G)'].to_numpy(dtype=np.float64)
+    return float(np.nanmedian(games))
+
+
+def qualifying_minimum(name, season):
+    # Prorated like FanGraphs' qual, so a season in progress has qualified players
+    spec = DATASETS[name]
+    if 'qualify_rate' not in spec:
+        return spec.get('qualified')
+    # Callbacks never wait on upstream for team data, so without it the full-season cutoff is used
+    try:
+        games = team_games(season)
+        if games is not None:
+            return int(spec['qualify_rate'] * games)
+    except Exception:
+        logger.warning('Reading team games for %s failed, using the full-season cutoff for %s', season, name, exc_info=True)
+    return spec['qualified']
+
+
+def lowest_qualifying_minimum(name, seasons):
+    return min(qualifying_minimum(name, season) for season in normalize_seasons(seasons))
+
+
+def qualifying_minimums(name, seasons):
+    # Part of the figure cache key wherever ranks or leaders are drawn, since the pools change with the cutoff
+    return tuple(qualifying_minimum(name, season) for season in normalize_seasons(seasons))
+
+
+# Combining Seasons for Cross-Season Comparisons
+def season_label(label, season, seasons):
+    return label if len(seasons) == 1 else '{} {}'.format(label, season)
+
+
+def season_arrays(name, columns, seasons, minimum=None):
+    seasons = normalize_seasons(seasons)
+    labels = []
+    arrays = {x: [] for x in columns}
+    for season in seasons:
+        data = get_dataset(name, season)
+        mask = qualified(name, data, minimum)
+        labels.extend(season_label(x, season, seasons) for x in data.index[mask])
+        for column in columns:
+            arrays[column].append(data[column].to_numpy()[mask])
+    return labels, {x: np.concatenate(values) for x, values in arrays.items()}
+
+
+def season_rows(name, labels, stat, seasons):
+    # Players picked by name are charted whatever their playing time
+    seasons = normalize_seasons(seasons)
+    frames = []
+    for season in seasons:
+        data = get_dataset(name, season)
+        mask = data.index.isin(labels)
+        rows = data.loc[mask, [stat] + [x for x in INFO_COLUMNS if x in data.columns]].assign(Season=season)
+        frames.append(rows.set_axis([season_label(x, season, seasons) for x in rows.index]))
+    combined = pd.concat(frames)
+    combined.index.name = DATASETS[name]['index']
+    return combined.reset_index()
+
+
+# Reporting How Old the Data Behind a Chart Is
+def data_fetched_at(name, seasons):
+    # The oldest of the selected seasons is the one worth reporting
+    return min(season_cache.snapshot(name, season).fetched_at for season in normalize_seasons(seasons))
+
+
+def age_text(age):
+    for unit, seconds in (('day', 24 * 60 * 60), ('hour', 60 * 60), ('minute', 60)):
+        if age >= seconds:
+            count = int(age // seconds)
+            return '{} {}{} ago'.format(count, unit, '' if count == 1 else 's')
+    return 'just now'
+
+
+def data_age_text(name, seasons):
+    fetched_at = data_fetched_at(name, seasons)
+    updated = time.strftime('%b %d, %Y at %H:%M', time.localtime(fetched_at))
+    return 'Data last updated {} ({})'.format(updated, age_text(time.time() - fetched_at))
+
+
+def season_labels(name, seasons, minimum=None):
+    labels = set()
+    for season in normalize_seasons(seasons):
+        data = get_dataset(name, season)
+        labels.update(data.index[qualified(name, data, minimum)])
+    return sorted(labels)
@@ -0,0 +1,88 @@
+from mlb.startup import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Decimal Places Kept for Each Kind of Derived Stat
+RATE_DECIMALS = 4
+INDEX_DECIMALS = 1
+Z_SCORE_DECIMALS = 2
+
+
+# Naming Derived Stats From the Dataset Definition
+def base_stats(spec):
+    return [spec['names'].get(x, x) for x in spec['columns'] if x not in ['Season', 'Name', 'Team']]
+
+
+def rate_stats(spec):
+    rates = spec.get('rates')
+    if rates is None:
+        return []
+    return [(spec['names'][x], '{} {}'.format(spec['names'][x], rates['label'])) for x in rates['columns']]
+
+
+def derived_names(spec):
+    stats = base_stats(spec)
+    return (
+        [rate for _, rate in rate_stats(spec)]
+        + ['{} League Index'.format(x) for x in stats]
+        + ['{} z-Score'.format(x) for x in stats]
+    )
+
+
+def lower_better_stats(spec):
+    # Rates, indexes and z-scores keep the direction of the stat they come from
+    lower = set(spec['names'][x] for x in spec.get('lower', []))
+    lower.update(rate for stat, rate in rate_stats(spec) if stat in lower)
+    lower.update(['{} League Index'.format(x) for x in list(lower)] + ['{} z-Score'.format(x) for x in list(lower)])
+    return lower
+
+
+def innings(values):
+    # Innings are written in outs, so 6.1 and 6.2 mean six and one or two thirds
+    whole = np.floor(values)
+    return whole + (values - whole) * 10 / 3
+
+
+def playing_time(data, column):
+    values = data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+    return innings(values) if column == 'Innings Pitched (IP)' else values
+
+
+# Computing Every Derived Stat in One Pass Over the Stat Matrix
+def add_derived(data, spec):
+    stats = base_stats(spec)
+    values = data[stats].to_numpy(dtype=np.float64, na_value=np.nan)
+    derived = {}
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Counting stats per plate appearance or per nine innings
+        rates = spec.get('rates')
+        if rates is not None:
+            pairs = rate_stats(spec)
+            counts = data[[x for x, _ in pairs]].to_numpy(dtype=np.float64, na_value=np.nan)
+            per = counts * rates['scale'] / playing_time(data, spec['names'][rates['basis']])[:, None]
+            for position, (_, rate) in enumerate(pairs):
+                derived[rate] = per[:, position].round(RATE_DECIMALS)
+
+        # League averages weighted by playing time, so a handful of at-bats cannot skew them
+        weights = playing_time(data, spec['qualify']) if 'qualify' in spec else np.ones(len(data))
+        present = np.isfinite(values) & np.isfinite(weights)[:, None]
+        column_weights = np.where(present, weights[:, None], 0.0)
+        filled = np.where(present, values, 0.0)
+        totals = column_weights.sum(axis=0)
+        means = (filled * column_weights).sum(axis=0) / totals
+        spread = np.sqrt((((filled - means) ** 2) * column_weights).sum(axis=0) / totals)
+
+        index = values / means * 100
+        z_scores = (values - means) / spread
+
+    for position, stat in enumerate(stats):
+        derived['{} League Index'.format(stat)] = index[:, position].round(INDEX_DECIMALS)
+    for position, stat in enumerate(stats):
+        derived['{} z-Score'.format(stat)] = z_scores[:, position].round(Z_SCORE_DECIMALS)
+
+    derived = pd.DataFrame(derived, index=data.index).replace([np.inf, -np.inf], np.nan)
+    combined = pd.concat([data, derived], axis=1)
+    combined.attrs = dict(data.attrs)
+    return combined
@@ -0,0 +1,210 @@
+import importlib
+from urllib.parse import urlencode
+
+import flask
+
+from mlb import config
+from mlb.compact import display_values
+from mlb.datasets import DATASETS, INFO_COLUMNS, qualified, season_cache, season_label, stat_columns
+from mlb.seasons import normalize_seasons
+from mlb.shared_store import stored_frame
+from mlb.startup import lazy_import
+
+np = lazy_import('numpy')
+pa = lazy_import('pyarrow')
+
+EXPORT_PATH = '/export'
+
+# File Types Offered by the Download Buttons
+EXPORT_FORMATS = {
+    'csv': dict(label='CSV', mimetype='text/csv'),
+    'parquet': dict(label='Parquet', mimetype='application/vnd.apache.parquet'),
+    'arrow': dict(label='Arrow', mimetype='application/vnd.apache.arrow.stream'),
+}
+
+
+# Building Download Links for the Selection a Chart Is Showing
+def export_url(name, file_format, seasons, labels=None, stats=None, minimum=None):
+    seasons = normalize_seasons(seasons)
+    query = [('season', x) for x in seasons]
+    for season in seasons:
+        # The link names the data the chart was drawn from by its fetch stamp, which every worker shares
+        fetched_at = float(season_cache.snapshot(name, season).fetched_at)
+        query.append(('fetched', '{}:{!r}'.format(season, fetched_at)))
+    query += [('label', x) for x in labels or []]
+    query += [('stat', x) for x in stats or []]
+    if minimum is not None:
+        query.append(('minimum', minimum))
+    return '{}/{}.{}?{}'.format(EXPORT_PATH, name, file_format, urlencode(query))
+
+
+def export_links(name, seasons, labels=None, stats=None, minimum=None, scope='selection'):
+    if scope == 'full':
+        labels, stats, minimum = None, None, None
+    return [export_url(name, x, seasons, labels, stats, minimum) for x in EXPORT_FORMATS]
+
+
+def resolve_frame(name, season, stamp):
+    current = season_cache.snapshot(name, season)
+    if stamp is None or current.fetched_at == stamp:
+        return current.frame
+
+    # Another worker made the link from a newer file, or this one has refreshed since
+    frame = stored_frame(name, season, stamp)
+    if frame is None:
+        flask.abort(410, 'This download link points at data that has since been refreshed. Reload the page for a new link.')
+    if stamp > current.fetched_at:
+        season_cache.swap(name, season, frame)
+    return frame
+
+
+# Selecting Rows and Columns From the Linked Data
+def export_columns(frames, stats):
+    info = [x for x in INFO_COLUMNS if all(x in frame.columns for frame in frames)]
+    return info + list(stats or stat_columns(frames[0]))
+
+
+def export_schema(name, frames, columns):
+    fields = [pa.field(DATASETS[name]['index'], pa.string()), pa.field('Season', pa.int16())]
+    for column in columns:
+        kinds = {frame[column].dtype.kind for frame in frames}
+        # A stat stored as integers in one season and floats in another is exported as floats
+        if kinds <= {'i', 'u'}:
+            fields.append(pa.field(column, pa.int64()))
+        elif kinds <= {'i', 'u', 'f'}:
+            fields.append(pa.field(column, pa.float64()))
+        else:
+            fields.append(pa.field(column, pa.string()))
+    return pa.schema(fields)
+
+
+def label_mask(data, labels, season, seasons):
+    # Chart labels carry the season when several are shown, as in 'Aaron Judge (NYY) 2022'
+    wanted = set(labels)
+    suffix = ' {}'.format(season)
+    if len(seasons) > 1:
+        wanted.update(x[:-len(suffix)] for x in labels if x.endswith(suffix))
+    return data.index.isin(list(wanted))
+
+
+def plain_values(values, field):
+    if pa.types.is_string(field.type):
+        return values.astype(str).to_numpy()
+    values = values.to_numpy()
+    if values.dtype == np.float32:
+        return display_values(values)
+    return values.astype(field.type.to_pandas_dtype())
+
+
+def export_chunks(name, frames, seasons, schema, labels=None, minimum=None):
+    columns = schema.names[2:]
+    for season in seasons:
+        data = frames[season]
+        # Players picked by name are exported whatever their playing time, as on the chart
+        mask = label_mask(data, labels, season, seasons) if labels else qualified(name, data, minimum)
+        positions = np.flatnonzero(mask)
+        for start in range(0, len(positions), config.EXPORT_CHUNK_ROWS):
+            rows = data.iloc[positions[start:start + config.EXPORT_CHUNK_ROWS]]
+            arrays = [[season_label(x, season, seasons) for x in rows.index], np.full(len(rows), season, dtype=np.int16)]
+            arrays += [plain_values(rows[x], schema.field(x)) for x in columns]
+            yield pa.Table.from_arrays([pa.array(x, type=field.type, from_pandas=True) for x, field in zip(arrays, schema)], schema=schema)
+
+
+# Streaming Writers That Never Hold More Than One Block of the File
+class BlockSink:
+    def __init__(self):
+        self.blocks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        self.blocks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.blocks)
+        self.blocks = []
+        return data
+
+
+def stream_csv(chunks, schema):
+    csv = importlib.import_module('pyarrow.csv')
+    sink = BlockSink()
+    writer = csv.CSVWriter(pa.PythonFile(sink, mode='w'), schema)
+    for chunk in chunks:
+        writer.write_table(chunk)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def stream_parquet(chunks, schema):
+    parquet = importlib.import_module('pyarrow.parquet')
+    sink = BlockSink()
+    # Each block becomes its own row group, and the footer is written last
+    writer = parquet.ParquetWriter(pa.PythonFile(sink, mode='w'), schema)
+    for chunk in chunks:
+        writer.write_table(chunk)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def stream_arrow(chunks, schema):
+    sink = BlockSink()
+    writer = pa.ipc.new_stream(pa.PythonFile(sink, mode='w'), schema)
+    for chunk in chunks:
+        writer.write_table(chunk)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+EXPORT_WRITERS = {'csv': stream_csv, 'parquet': stream_parquet, 'arrow': stream_arrow}
+
+
+# The Export Endpoint
+def export_response(name, file_format, arguments):
+    if name not in DATASETS or file_format not in EXPORT_FORMATS:
+        flask.abort(404)
+
+    try:
+        seasons = normalize_seasons([int(x) for x in arguments.getlist('season')])
+        stamps = {int(season): float(stamp) for season, stamp in (x.split(':', 1) for x in arguments.getlist('fetched'))}
+        minimum = arguments.get('minimum')
+        minimum = None if minimum is None else float(minimum)
+    except ValueError:
+        flask.abort(400, 'Seasons must be whole numbers, and fetch stamps and minimums must be numbers.')
+
+    # Every season is resolved before streaming starts, so the whole file comes from one set of data
+    frames = {season: resolve_frame(name, season, stamps.get(season)) for season in seasons}
+    ordered = [frames[x] for x in seasons]
+    stats = arguments.getlist('stat')
+    unknown = [x for x in stats if x not in stat_columns(ordered[0])]
+    if unknown:
+        flask.abort(400, 'Unknown statistical measure(s): {}'.format(', '.join(unknown)))
+
+    schema = export_schema(name, ordered, export_columns(ordered, stats))
+    chunks = export_chunks(name, frames, seasons, schema, arguments.getlist('label'), minimum)
+    filename = '{}_{}.{}'.format(name, '-'.join(str(x) for x in seasons), file_format)
+    return flask.Response(
+        flask.stream_with_context(EXPORT_WRITERS[file_format](chunks, schema)),
+        mimetype=EXPORT_FORMATS[file_format]['mimetype'],
+        headers={'Content-Disposition': 'attachment; filename="{}"'.format(filename)},
+    )
+
+
+def register_export(server):
+    @server.route('{}/<name>.<file_format>'.format(EXPORT_PATH))
+    def export(name, file_format):
+        return export_response(name, file_format, flask.request.args)
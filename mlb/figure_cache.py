@@ -0,0 +1,85 @@
+import json
+import threading
+from collections import OrderedDict
+
+from mlb import config
+from mlb.datasets import data_version
+from mlb.instrumentation import record_cache_result, timed
+from mlb.seasons import normalize_seasons
+
+
+# Bounded Cache of Serialized Figures
+class FigureCache:
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, figure):
+        # Storing the JSON-ready form means a hit skips both the build and validation, figures built as dicts already are
+        entry = dict(figure=figure if isinstance(figure, dict) else json.loads(figure.to_json()))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return dict(
+                entries=len(self._entries),
+                hits=self.hits,
+                misses=self.misses,
+                hit_rate=self.hits / lookups if lookups else 0.0,
+            )
+
+
+figure_cache = FigureCache(config.FIGURE_CACHE_SIZE)
+
+
+# Normalizing Callback Inputs Into a Cache Key
+def figure_key(name, stats, selection, seasons, options=(), version=None):
+    if isinstance(stats, str):
+        stats = [stats]
+    if isinstance(selection, str):
+        selection = [selection]
+    return (
+        name,
+        tuple(stats),
+        tuple(sorted(selection or [])),
+        tuple(normalize_seasons(seasons)),
+        data_version(name, seasons) if version is None else version,
+        tuple(options),
+    )
+
+
+def cached_figure(name, stats, selection, seasons, build, options=(), version=None):
+    # Charts drawn from another data source pass that source's version instead
+    # Building the key looks up each season's data version, which loads any season not yet in memory
+    with timed('data'):
+        key = figure_key(name, stats, selection, seasons, options, version)
+    entry = figure_cache.get(key)
+    record_cache_result(entry is not None)
+    if entry is None:
+        figure = build()
+        with timed('serialize'):
+            entry = figure_cache.put(key, figure)
+    return entry['figure']
@@ -0,0 +1,145 @@
+import copy
+
+from mlb import config
+
+
+# Building Styled Axis and Layout Templates
+def axis_template(title_text=None, title_size=18, tick_size=14, gridwidth=None):
+    axis = dict(
+        title=dict(font=dict(size=title_size, color='black'), standoff=15),
+        tickfont=dict(size=tick_size, color='black'),
+        showline=True,
+        linewidth=1,
+        linecolor='black',
+        automargin=True,
+        ticks='',
+        gridcolor='white',
+        zerolinecolor='white',
+        zerolinewidth=2,
+    )
+    if title_text is not None:
+        axis['title']['text'] = title_text
+    if gridwidth is not None:
+        axis.update(showgrid=True, gridwidth=gridwidth, gridcolor='black')
+    return axis
+
+
+def layout_template(xaxis, yaxis, **extra):
+    layout = dict(
+        font=dict(color='#2a3f5f'),
+        hovermode='closest',
+        hoverlabel=dict(align='left'),
+        title=dict(text=' ', x=0.5, font=dict(size=24, color='black')),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        margin=dict(l=0, r=0, t=0, b=0),
+        showlegend=False,
+        xaxis=xaxis,
+        yaxis=yaxis,
+    )
+    layout.update(extra)
+    return layout
+
+
+def bar_template(label_title, title_size=18, tick_size=14):
+    yaxis = axis_template(label_title, title_size, tick_size)
+    yaxis['categoryorder'] = 'total ascending'
+    return layout_template(axis_template(None, title_size, tick_size, gridwidth=1), yaxis, barmode='relative')
+
+
+def scatter_template():
+    return layout_template(axis_template(gridwidth=0.5), axis_template(gridwidth=1))
+
+
+# Filling a Template With Data
+def with_axis_titles(template, x_title, y_title=None):
+    layout = copy.copy(template)
+    layout['xaxis'] = dict(template['xaxis'], title=dict(template['xaxis']['title'], text=x_title))
+    if y_title is not None:
+        layout['yaxis'] = dict(template['yaxis'], title=dict(template['yaxis']['title'], text=y_title))
+    return layout
+
+
+def bar_figure(template, labels, values, colors, stat, label_name, marker_line_width=None, notes=None, order=None):
+    # One trace with per-bar colors keeps the figure size flat as the selection grows
+    marker = dict(color=colors)
+    if marker_line_width is not None:
+        marker['line'] = dict(color='black', width=marker_line_width)
+    trace = dict(
+        type='bar',
+        orientation='h',
+        x=values,
+        y=labels,
+        marker=marker,
+        textposition='auto',
+        texttemplate='%{x}',
+        textfont=dict(size=14),
+        hovertemplate=label_name + '=%{y}<br>' + stat + '=%{x}<extra></extra>',
+    )
+    if notes is not None:
+        trace.update(text=notes, texttemplate='%{x} (%{text})', hovertemplate=label_name + '=%{y}<br>' + stat + '=%{x}<br>%{text}<extra></extra>')
+
+    layout = with_axis_titles(template, stat)
+    if order is not None:
+        # Bars are drawn bottom to top, so the order runs from last place to first
+        layout['yaxis'] = dict(layout['yaxis'], categoryorder='array', categoryarray=order)
+    return dict(data=[trace], layout=layout)
+
+
+def scatter_type(points, webgl_threshold=None):
+    if webgl_threshold is None:
+        webgl_threshold = config.WEBGL_THRESHOLD
+    return 'scattergl' if points > webgl_threshold else 'scatter'
+
+
+def scatter_figure(template, labels, x_values, y_values, colors, x_stat, y_stat, webgl_threshold=None):
+    trace = dict(
+        type=scatter_type(len(labels), webgl_threshold),
+        mode='markers',
+        x=x_values,
+        y=y_values,
+        hovertext=labels,
+        marker=dict(color=colors, size=11, symbol='circle', line=dict(color='black', width=1)),
+        hovertemplate='<b>%{hovertext}</b><br><br>' + x_stat + '=%{x}<br>' + y_stat + '=%{y}<extra></extra>',
+    )
+    return dict(data=[trace], layout=with_axis_titles(template, x_stat, y_stat))
+
+
+def heatmap_figure(spec, z, x_centers, y_centers, title):
+    # The payload is one grid of counts, so its size depends on the bins rather than the pitch count
+    trace = dict(
+        type='heatmap',
+        x=x_centers,
+        y=y_centers,
+        z=z,
+        colorscale='YlOrRd',
+        showscale=False,
+        hoverongaps=False,
+        hovertemplate='%{z}<extra></extra>',
+    )
+    xaxis = dict(axis_template(spec['x_title']), range=list(spec['x_range']), zeroline=False)
+    yaxis = dict(axis_template(spec['y_title']), range=list(spec['y_range']), zeroline=False, scaleanchor='x')
+    shapes = [dict(shape, line=dict(color='black', width=2)) for shape in spec.get('shapes', [])]
+    layout = layout_template(xaxis, yaxis, shapes=shapes)
+    layout['title'] = dict(layout['title'], text=title, font=dict(size=18, color='black'))
+    layout['margin'] = dict(l=0, r=0, t=40, b=0)
+    return dict(data=[trace], layout=layout)
+
+
+def line_template():
+    return layout_template(axis_template('Game Date', gridwidth=0.5), axis_template(gridwidth=1), showlegend=True, legend=dict(orientation='h', y=-0.2))
+
+
+def line_figure(template, series, colors, stat):
+    traces = []
+    for (label, x_values, y_values), color in zip(series, colors):
+        traces.append(dict(
+            type='scatter',
+            mode='lines',
+            name=label,
+            x=x_values,
+            y=y_values,
+            line=dict(color=color, width=2),
+            hovertemplate='<b>' + label + '</b><br>%{x}<br>' + stat + '=%{y}<extra></extra>',
+        ))
+    return dict(data=traces, layout=with_axis_titles(template, 'Game Date', stat))
@@ -0,0 +1,140 @@
+from mlb import statcast
+from mlb.datasets import season_cache, season_label
+from mlb.heatmaps import split_label
+from mlb.seasons import normalize_seasons
+from mlb.startup import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Plate Appearance Outcomes Counted in Each Game Log
+TOTAL_BASES = {'single':1, 'double':2, 'triple':3, 'home_run':4}
+WALKS = ['walk', 'intent_walk']
+SACRIFICE_FLIES = ['sac_fly', 'sac_fly_double_play']
+STRIKEOUTS = ['strikeout', 'strikeout_double_play']
+NOT_AT_BATS = WALKS + SACRIFICE_FLIES + ['hit_by_pitch', 'sac_bunt', 'sac_bunt_double_play', 'catcher_interf']
+GAME_LOG_COLUMNS = ['PA', 'AB', 'H', 'TB', 'HR', 'BB', 'HBP', 'SF', 'SO']
+
+# Rolling Windows Precomputed for Every Player, in Games
+TREND_WINDOWS = (7, 15, 30)
+
+
+# Rolling Stats Built From Windowed Counting Totals
+def ratio(numerator, denominator):
+    return np.divide(numerator, denominator, out=np.full(len(numerator), np.nan), where=denominator > 0)
+
+
+def on_base(sums):
+    return ratio(sums['H'] + sums['BB'] + sums['HBP'], sums['AB'] + sums['BB'] + sums['HBP'] + sums['SF'])
+
+
+def slugging(sums):
+    return ratio(sums['TB'], sums['AB'])
+
+
+TREND_STATS = {
+    'Batting Average (AVG)': lambda sums: ratio(sums['H'], sums['AB']),
+    'On-Base Percentage (OBP)': on_base,
+    'Slugging Percentage (SLG)': slugging,
+    'On-Base Plus Slugging (OPS)': lambda sums: on_base(sums) + slugging(sums),
+    'Home Runs (HR)': lambda sums: sums['HR'].astype(float),
+    'Strikeout Percentage (K%)': lambda sums: ratio(sums['SO'], sums['PA']),
+}
+
+
+# Per-Game Batting Lines From the Final Pitch of Each Plate Appearance
+def game_log(season):
+    pitches = statcast.read_pitches(season, ['game_date', 'game_pk', 'batter', 'batter_name', 'batter_team', 'events'])
+    pitches = pitches[pitches['events'].notna()]
+    events = pitches['events'].astype(str)
+    bases = events.map(TOTAL_BASES).fillna(0).to_numpy()
+
+    counts = pd.DataFrame(dict(
+        batter=pitches['batter'].to_numpy(),
+        game_date=pitches['game_date'].astype(str).to_numpy(),
+        game_pk=pitches['game_pk'].to_numpy(),
+        PA=1,
+        AB=(~events.isin(NOT_AT_BATS)).to_numpy(int),
+        H=(bases > 0).astype(int),
+        TB=bases.astype(int),
+        HR=events.eq('home_run').to_numpy(int),
+        BB=events.isin(WALKS).to_numpy(int),
+        HBP=events.eq('hit_by_pitch').to_numpy(int),
+        SF=events.isin(SACRIFICE_FLIES).to_numpy(int),
+        SO=events.isin(STRIKEOUTS).to_numpy(int),
+    ))
+    # Sorting by player and date leaves each player's games in one contiguous run
+    log = counts.groupby(['batter', 'game_date', 'game_pk'], sort=True)[GAME_LOG_COLUMNS].sum()
+    names = pitches.sort_values('game_date').groupby('batter')[['batter_name', 'batter_team']].last()
+    return log, names
+
+
+def rolling_sums(values, first, window):
+    # Differencing one running total gives every window at once, without crossing into the previous player
+    totals = np.concatenate([[0], np.cumsum(values)])
+    positions = np.arange(1, len(values) + 1)
+    return totals[positions] - totals[np.maximum(positions - window, first)]
+
+
+# Rolling Trends for Every Player, Stored as One Array per Stat and Window
+class TrendIndex:
+    def __init__(self, log, names, windows=TREND_WINDOWS):
+        batters = log.index.get_level_values('batter').to_numpy()
+        self.dates = log.index.get_level_values('game_date').to_numpy()
+        starts = np.flatnonzero(np.r_[True, batters[1:] != batters[:-1]]) if len(batters) else np.zeros(0, dtype=int)
+        stops = np.r_[starts[1:], len(batters)] if len(batters) else starts
+        self.offsets = dict(zip(batters[starts].tolist(), zip(starts.tolist(), stops.tolist())))
+
+        first = np.repeat(starts, stops - starts)
+        games = np.arange(len(batters)) - first + 1
+        self.trends = {}
+        for window in windows:
+            sums = {x: rolling_sums(log[x].to_numpy(), first, window) for x in GAME_LOG_COLUMNS}
+            for stat, formula in TREND_STATS.items():
+                values = formula(sums)
+                # A window is only reported once the player has played that many games
+                values[games < window] = np.nan
+                self.trends[(stat, window)] = values.round(3).astype(np.float32)
+
+        self.names = {}
+        for batter, row in names.iterrows():
+            self.names.setdefault(str(row['batter_name']).lower(), []).append((batter, row['batter_team']))
+
+    def batter(self, name, team=None):
+        candidates = self.names.get(name.lower(), [])
+        # Players sharing a name are told apart by their team when the label has one
+        if len(candidates) > 1 and team is not None:
+            candidates = [x for x in candidates if x[1] == team] or candidates
+        return candidates[0][0] if candidates else None
+
+    def series(self, batter, stat, window):
+        start, stop = self.offsets.get(batter, (0, 0))
+        return self.dates[start:stop], self.trends[(stat, window)][start:stop]
+
+
+# One Index per Season, Rebuilt When New Statcast Chunks Are Ingested
+_indexes = season_cache.index_cache()
+
+
+def trend_index(season):
+    # Dropped with the season's frames, so only recently viewed seasons keep a game log in memory
+    return _indexes.get('trends', season, statcast.data_version(season), lambda: TrendIndex(*game_log(season)))
+
+
+def trends_version(seasons):
+    return tuple(statcast.data_version(x) for x in normalize_seasons(seasons))
+
+
+def trend_series(labels, stat, window, seasons):
+    seasons = normalize_seasons(seasons)
+    series = []
+    for label in labels:
+        name, team, _ = split_label(label, seasons)
+        for season in seasons:
+            index = trend_index(season)
+            batter = index.batter(name, team)
+            if batter is None:
+                continue
+            dates, values = index.series(batter, stat, window)
+            series.append((season_label(label, season, seasons), team, dates, values))
+    return series
@@ -0,0 +1,142 @@
+from mlb import config, statcast
+from mlb.figure_cache import FigureCache
+from mlb.figures import heatmap_figure
+from mlb.instrumentation import record_cache_result, timed
+from mlb.seasons import normalize_seasons
+from mlb.startup import lazy_import
+
+np = lazy_import('numpy')
+
+# Chart Kinds, Their Statcast Columns and the Area Each Grid Covers
+HEATMAP_KINDS = {
+    'location': dict(
+        x='plate_x',
+        y='plate_z',
+        x_range=(-2.0, 2.0),
+        y_range=(0.0, 5.0),
+        x_title='Horizontal Location (ft, Catcher View)',
+        y_title='Height (ft)',
+        # The rulebook strike zone for an average batter
+        shapes=[dict(type='rect', x0=-0.83, x1=0.83, y0=1.5, y1=3.5)],
+        unit='pitches',
+    ),
+    'spray': dict(
+        x='hc_x',
+        y='hc_y',
+        x_range=(0.0, 250.0),
+        y_range=(0.0, 250.0),
+        x_title='Field Position (Spray Chart)',
+        y_title=' ',
+        # Statcast hit coordinates grow downward from the top of the field image
+        flip_y=True,
+        # Foul lines running out from home plate
+        shapes=[
+            dict(type='line', x0=125.42, y0=51.73, x1=25.42, y1=151.73),
+            dict(type='line', x0=125.42, y0=51.73, x1=225.42, y1=151.73),
+        ],
+        unit='batted balls',
+    ),
+}
+
+# Pitch Types Offered by the Heatmap Filters
+PITCH_TYPES = {
+    'FF':'Four-Seam Fastball',
+    'SI':'Sinker',
+    'FC':'Cutter',
+    'SL':'Slider',
+    'ST':'Sweeper',
+    'CU':'Curveball',
+    'KC':'Knuckle Curve',
+    'CH':'Changeup',
+    'FS':'Splitter',
+}
+
+# The Opposing Hand Column for Each Role
+ROLES = {
+    'pitcher': dict(name='pitcher_name', team='pitcher_team', opponent_hand='stand'),
+    'batter': dict(name='batter_name', team='batter_team', opponent_hand='p_throws'),
+}
+
+
+# Splitting Dashboard Labels Into Name, Team and Season
+def split_label(label, seasons):
+    seasons = normalize_seasons(seasons)
+    # Cross-season charts label points as 'Name (Team) 2022'
+    if len(seasons) > 1 and label[-4:].isdigit() and int(label[-4:]) in seasons:
+        label, seasons = label[:-5], [int(label[-4:])]
+    name, _, team = label.rpartition(' (')
+    if not name:
+        return label, None, seasons
+    team = team.rstrip(')')
+    # FanGraphs lists traded players without a single team
+    return name, (None if team.startswith('-') else team), seasons
+
+
+def player_filters(role, name, team, pitch_types=None, hand=None):
+    columns = ROLES[role]
+    # Batter names come from the Chadwick register in title case, as in 'Jeff Mcneil'
+    filters = {columns['name']: sorted({name, name.title()})}
+    if team is not None:
+        filters[columns['team']] = [team]
+    if pitch_types:
+        filters['pitch_type'] = list(pitch_types)
+    if hand:
+        filters[columns['opponent_hand']] = [hand]
+    return filters
+
+
+# Vectorized 2D Binning Into a Fixed Grid
+def bin_pitches(x_values, y_values, spec, bins=None):
+    if bins is None:
+        bins = config.HEATMAP_BINS
+    x_values = np.asarray(x_values, dtype=float)
+    y_values = np.asarray(y_values, dtype=float)
+    if spec.get('flip_y'):
+        y_values = spec['y_range'][1] - y_values
+    finite = np.isfinite(x_values) & np.isfinite(y_values)
+    counts, x_edges, y_edges = np.histogram2d(x_values[finite], y_values[finite], bins=bins, range=[spec['x_range'], spec['y_range']])
+    return counts.T.astype(np.int32), (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2
+
+
+def player_grid(kind, role, name, team, seasons, pitch_types=None, hand=None):
+    spec = HEATMAP_KINDS[kind]
+    filters = player_filters(role, name, team, pitch_types, hand)
+    counts = None
+    for season in seasons:
+        pitches = statcast.read_pitches(season, [spec['x'], spec['y']], **filters)
+        season_counts, x_centers, y_centers = bin_pitches(pitches[spec['x']], pitches[spec['y']], spec)
+        counts = season_counts if counts is None else counts + season_counts
+    return counts, x_centers, y_centers
+
+
+# Empty Cells Are Left Blank Instead of Drawn as Zero
+def grid_values(counts):
+    return [[x or None for x in row] for row in counts.tolist()] if counts.any() else []
+
+
+def heatmap_title(kind, label, counts):
+    total = int(counts.sum())
+    if not total:
+        return 'No Statcast data on disk for {}'.format(label)
+    return '{}: {:,} {}'.format(label, total, HEATMAP_KINDS[kind]['unit'])
+
+
+# Heatmap Figures Cached per Player and Filters
+heatmap_cache = FigureCache(config.FIGURE_CACHE_SIZE)
+
+
+def cached_heatmap(kind, role, label, seasons, pitch_types=None, hand=None):
+    name, team, seasons = split_label(label, seasons)
+    pitch_types = tuple(sorted(pitch_types or []))
+    with timed('data'):
+        key = (kind, role, name, team, tuple(seasons), pitch_types, hand, tuple(statcast.data_version(x) for x in seasons))
+    entry = heatmap_cache.get(key)
+    record_cache_result(entry is not None)
+    if entry is None:
+        with timed('subset'):
+            counts, x_centers, y_centers = player_grid(kind, role, name, team, seasons, pitch_types, hand)
+        with timed('build'):
+            figure = heatmap_figure(HEATMAP_KINDS[kind], grid_values(counts), x_centers.tolist(), y_centers.tolist(), heatmap_title(kind, label, counts))
+        with timed('serialize'):
+            entry = heatmap_cache.put(key, figure)
+    return entry['figure']
@@ -0,0 +1,176 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import flask
+
+# Histogram Buckets
+LATENCY_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0]
+SIZE_BUCKETS = [1000, 5000, 10000, 50000, 100000, 500000, 1000000, 5000000]
+
+CALLBACK_PATH = '/_dash-update-component'
+
+
+# Prometheus-Style Histogram
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.count = 0
+
+    def observe(self, value):
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[position] += 1
+        self.total += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        lines = []
+        for bound, count in zip(self.buckets, self.counts):
+            lines.append('{}_bucket{{{},le="{}"}} {}'.format(name, labels, bound, count))
+        lines.append('{}_bucket{{{},le="+Inf"}} {}'.format(name, labels, self.count))
+        lines.append('{}_sum{{{}}} {}'.format(name, labels, self.total))
+        lines.append('{}_count{{{}}} {}'.format(name, labels, self.count))
+        return lines
+
+
+# Metrics Collected by This Worker
+_lock = threading.Lock()
+_latencies = {}
+_sizes = {}
+_requests = {}
+_cache_results = {}
+_dataset_loads = {}
+
+
+def observe(store, key, buckets, value):
+    with _lock:
+        if key not in store:
+            store[key] = Histogram(buckets)
+        store[key].observe(value)
+
+
+def count(store, key):
+    with _lock:
+        store[key] = store.get(key, 0) + 1
+
+
+def record_dataset_load(name, season, seconds):
+    with _lock:
+        _dataset_loads[(name, season)] = seconds
+
+
+def dataset_loads():
+    with _lock:
+        return dict(_dataset_loads)
+
+
+def record_cache_result(hit):
+    callback = current_callback()
+    if callback is not None:
+        count(_cache_results, (callback, 'hit' if hit else 'miss'))
+
+
+# Timing Phases Inside the Current Callback Request
+def current_callback():
+    if not flask.has_request_context():
+        return None
+    return flask.g.get('callback')
+
+
+@contextmanager
+def timed(phase):
+    if current_callback() is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases = flask.g.phases
+        phases[phase] = phases.get(phase, 0.0) + time.perf_counter() - started
+
+
+def start_timing():
+    if flask.request.path != CALLBACK_PATH:
+        return
+    body = flask.request.get_json(silent=True) or {}
+    flask.g.callback = body.get('output', 'unknown').strip('.')
+    flask.g.phases = {}
+    flask.g.started = time.perf_counter()
+
+
+def finish_timing(response):
+    callback = current_callback()
+    if callback is None:
+        return response
+
+    total = time.perf_counter() - flask.g.started
+    phases = dict(flask.g.phases)
+
+    # Whatever the page code did not time, such as Dash dispatch, is reported on its own
+    phases['other'] = max(total - sum(phases.values()), 0.0)
+    phases['total'] = total
+
+    for phase, seconds in phases.items():
+        observe(_latencies, (callback, phase), LATENCY_BUCKETS, seconds)
+    size = response.content_length if response.content_length is not None else len(response.get_data())
+    observe(_sizes, callback, SIZE_BUCKETS, size)
+    count(_requests, (callback, str(response.status_code)))
+
+    response.headers['Server-Timing'] = ', '.join('{};dur={:.2f}'.format(phase, seconds * 1000) for phase, seconds in phases.items())
+    return response
+
+
+# Prometheus Text Exposition
+def render_metrics():
+    lines = []
+    with _lock:
+        lines.append('# HELP mlb_callback_duration_seconds Dash callback latency split by phase.')
+        lines.append('# TYPE mlb_callback_duration_seconds histogram')
+        for (callback, phase), histogram in sorted(_latencies.items()):
+            lines.extend(histogram.lines('mlb_callback_duration_seconds', 'callback="{}",phase="{}"'.format(callback, phase)))
+
+        lines.append('# HELP mlb_callback_response_bytes Size of Dash callback responses.')
+        lines.append('# TYPE mlb_callback_response_bytes histogram')
+        for callback, histogram in sorted(_sizes.items()):
+            lines.extend(histogram.lines('mlb_callback_response_bytes', 'callback="{}"'.format(callback)))
+
+        lines.append('# HELP mlb_callback_requests_total Dash callback requests by status code.')
+        lines.append('# TYPE mlb_callback_requests_total counter')
+        for (callback, status), value in sorted(_requests.items()):
+            lines.append('mlb_callback_requests_total{{callback="{}",status="{}"}} {}'.format(callback, status, value))
+
+        lines.append('# HELP mlb_callback_cache_total Figure cache lookups made by each callback.')
+        lines.append('# TYPE mlb_callback_cache_total counter')
+        for (callback, result), value in sorted(_cache_results.items()):
+            lines.append('mlb_callback_cache_total{{callback="{}",result="{}"}} {}'.format(callback, result, value))
+
+        lines.append('# HELP mlb_dataset_load_seconds Time spent loading each dataset.')
+        lines.append('# TYPE mlb_dataset_load_seconds gauge')
+        for (name, season), seconds in sorted(_dataset_loads.items()):
+            lines.append('mlb_dataset_load_seconds{{dataset="{}",season="{}"}} {}'.format(name, season, seconds))
+
+    # Imported here because the figure cache itself depends on the data layer, which records into this module
+    from mlb.figure_cache import figure_cache
+
+    stats = figure_cache.stats()
+    lines.append('# HELP mlb_figure_cache_hit_ratio Share of figure cache lookups that were hits.')
+    lines.append('# TYPE mlb_figure_cache_hit_ratio gauge')
+    lines.append('mlb_figure_cache_hit_ratio {}'.format(stats['hit_rate']))
+    lines.append('# HELP mlb_figure_cache_entries Figures currently held in the cache.')
+    lines.append('# TYPE mlb_figure_cache_entries gauge')
+    lines.append('mlb_figure_cache_entries {}'.format(stats['entries']))
+    return '\n'.join(lines) + '\n'
+
+
+def instrument(server):
+    server.before_request(start_timing)
+    server.after_request(finish_timing)
+
+    @server.route('/metrics')
+    def metrics():
+        return flask.Response(render_metrics(), mimetype='text/plain; version=0.0.4')
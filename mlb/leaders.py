@@ -0,0 +1,68 @@
+from mlb import config
+from mlb.datasets import DATASETS, INFO_COLUMNS, qualified, qualifying_minimum, season_cache, season_label, stat_columns
+from mlb.seasons import normalize_seasons
+from mlb.startup import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+
+# Top and Bottom Rows of Every Stat, Kept per Dataset Version
+class LeaderIndex:
+    def __init__(self, data, stats, pool, size):
+        self.columns = {x: position for position, x in enumerate(stats)}
+        self.rows = np.flatnonzero(pool)
+        values = data[stats].to_numpy(dtype=np.float64, na_value=np.nan)[self.rows]
+        self.size = min(size, len(self.rows))
+        self.counts = np.isfinite(values).sum(axis=0)
+
+        # Missing values are pushed past the end of both orderings
+        self.top = self.partial_order(-np.where(np.isnan(values), -np.inf, values))
+        self.bottom = self.partial_order(np.where(np.isnan(values), np.inf, values))
+
+    def partial_order(self, keys):
+        # argpartition finds each column's leaders, and only those few get sorted
+        if self.size < len(keys):
+            candidates = np.argpartition(keys, self.size - 1, axis=0)[:self.size]
+        else:
+            candidates = np.tile(np.arange(len(keys))[:, None], (1, keys.shape[1]))
+        order = np.argsort(np.take_along_axis(keys, candidates, axis=0), axis=0, kind='stable')
+        return self.rows[np.take_along_axis(candidates, order, axis=0)]
+
+    def leaders(self, stat, count, direction):
+        position = self.columns[stat]
+        count = min(count, self.size, int(self.counts[position]))
+        return (self.top if direction == 'top' else self.bottom)[:count, position]
+
+
+# One Index per Dataset and Season, Rebuilt When the Season Is Reloaded
+_indexes = season_cache.index_cache()
+
+
+def build_index(name, data, minimum):
+    # Players have to qualify for a leaderboard, teams always do
+    pool = qualified(name, data, minimum)
+    return LeaderIndex(data, stat_columns(data), pool, config.LEADERBOARD_SIZE)
+
+
+def leader_index(name, season, snapshot):
+    # The cutoff grows as teams play more games, so it is part of the version
+    minimum = qualifying_minimum(name, season)
+    return _indexes.get(name, season, (snapshot.version, minimum), lambda: build_index(name, snapshot.frame, minimum))
+
+
+# Combining Each Season's Leaders
+def leader_rows(name, stat, seasons, count, direction):
+    seasons = normalize_seasons(seasons)
+    frames = []
+    for season in seasons:
+        snapshot = season_cache.snapshot(name, season)
+        data = snapshot.frame
+        positions = leader_index(name, season, snapshot).leaders(stat, count, direction)
+        rows = data.iloc[positions][[stat] + [x for x in INFO_COLUMNS if x in data.columns]].assign(Season=season)
+        frames.append(rows.set_axis([season_label(x, season, seasons) for x in rows.index]))
+
+    # Each season is already in order, so only its first rows compete across seasons
+    combined = pd.concat(frames).sort_values(stat, ascending=direction != 'top', kind='stable').head(count)
+    combined.index.name = DATASETS[name]['index']
+    return combined.reset_index()
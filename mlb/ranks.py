@@ -0,0 +1,75 @@
+from mlb.datasets import DATASETS, qualified, qualifying_minimum, season_cache, stat_columns
+from mlb.derived import lower_better_stats
+from mlb.startup import lazy_import
+
+np = lazy_import('numpy')
+
+
+# Every Stat Column Sorted Once per Dataset Version
+class RankIndex:
+    def __init__(self, data, stats, pool, lower_better):
+        self.columns = {x: position for position, x in enumerate(stats)}
+        self.lower_better = lower_better
+        values = data[stats].to_numpy(dtype=np.float64, na_value=np.nan)[pool]
+
+        # One column-wise argsort covers every stat, and missing values sort to the end
+        order = np.argsort(values, axis=0, kind='stable')
+        self.sorted = np.take_along_axis(values, order, axis=0)
+        self.counts = np.isfinite(values).sum(axis=0)
+
+    def lookup(self, stat, values):
+        # Binary searches keep each lookup proportional to the selection, not the league
+        position = self.columns[stat]
+        count = int(self.counts[position])
+        ordered = self.sorted[:count, position]
+        values = np.asarray(values, dtype=np.float64)
+        if stat in self.lower_better:
+            ahead = np.searchsorted(ordered, values, side='left')
+            at_least = count - ahead
+        else:
+            at_least = np.searchsorted(ordered, values, side='right')
+            ahead = count - at_least
+        percentiles = np.floor(100 * at_least / max(count, 1))
+        return ahead + 1, count, percentiles, ~np.isfinite(values)
+
+
+# One Index per Dataset and Season, Rebuilt When the Season Is Reloaded
+_indexes = season_cache.index_cache()
+
+
+def build_index(name, data, minimum):
+    # Players are ranked against the qualified pool, teams against the whole league
+    pool = qualified(name, data, minimum)
+    return RankIndex(data, stat_columns(data), pool, lower_better_stats(DATASETS[name]))
+
+
+def rank_index(name, season, snapshot):
+    # The cutoff grows as teams play more games, so it is part of the version
+    minimum = qualifying_minimum(name, season)
+    return _indexes.get(name, season, (snapshot.version, minimum), lambda: build_index(name, snapshot.frame, minimum))
+
+
+# Annotating Chart Rows With League Context
+def ordinal(number):
+    suffix = 'th' if 10 <= number % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(number % 10, 'th')
+    return '{}{}'.format(number, suffix)
+
+
+def rank_rows(name, rows, stat, min_percentile=None):
+    ranks = np.zeros(len(rows), dtype=np.int64)
+    counts = np.zeros(len(rows), dtype=np.int64)
+    percentiles = np.full(len(rows), np.nan)
+    seasons = rows['Season'].to_numpy()
+    for season in np.unique(seasons):
+        at = seasons == season
+        index = rank_index(name, int(season), season_cache.snapshot(name, int(season)))
+        season_ranks, count, season_percentiles, missing = index.lookup(stat, rows[stat].to_numpy()[at])
+        ranks[at] = season_ranks
+        counts[at] = count
+        percentiles[at] = np.where(missing, np.nan, season_percentiles)
+
+    notes = ['' if np.isnan(percentile) else 'rank {} of {} / {} percentile'.format(rank, count, ordinal(int(percentile))) for rank, count, percentile in zip(ranks, counts, percentiles)]
+    ranked = rows.assign(Rank=ranks, Percentile=percentiles, Note=notes)
+    if min_percentile:
+        ranked = ranked[ranked['Percentile'] >= min_percentile]
+    return ranked
@@ -0,0 +1,50 @@
+import logging
+import threading
+
+from mlb import config
+from mlb.datasets import refresh_dataset, season_cache
+from mlb.seasons import latest_season
+
+logger = logging.getLogger(__name__)
+
+
+# Refetching Loaded Datasets on a Background Thread
+class RefreshScheduler:
+    def __init__(self, interval):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name='mlb-refresh', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            self.refresh_all()
+
+    def refresh_all(self):
+        # Finished seasons never change, so only the current season is refetched
+        for name, season in season_cache.loaded():
+            if season < latest_season():
+                continue
+            try:
+                snapshot = refresh_dataset(name, season)
+            except Exception:
+                logger.warning('Refreshing %s %s failed, keeping the current snapshot', name, season, exc_info=True)
+                continue
+            if snapshot is not None:
+                logger.info('Swapped in %s %s as version %d', name, season, snapshot.version)
+
+
+def start_refresh():
+    # Offline workers have nothing to refetch from
+    if config.OFFLINE or config.REFRESH_INTERVAL <= 0:
+        return None
+    scheduler = RefreshScheduler(config.REFRESH_INTERVAL)
+    scheduler.start()
+    return scheduler
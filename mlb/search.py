@@ -0,0 +1,84 @@
+from bisect import bisect_left
+
+from mlb import config
+from mlb.datasets import DATASETS, qualified, season_cache
+from mlb.seasons import normalize_seasons
+from mlb.startup import lazy_import
+
+np = lazy_import('numpy')
+
+
+# Splitting Names and Team Abbreviations Into Searchable Tokens
+def label_tokens(label, team):
+    tokens = set()
+    for word in label.replace('(', ' ').replace(')', ' ').lower().split():
+        tokens.add(word)
+        tokens.add(word.replace('.', '').replace("'", ''))
+    tokens.add(str(team).lower())
+    tokens.discard('')
+    return tokens
+
+
+# Sorted Token Index Answering Prefix Queries With Binary Search
+class PrefixIndex:
+    def __init__(self, labels, teams, popularity):
+        self.labels = list(labels)
+        pairs = sorted((token, position) for position, (label, team) in enumerate(zip(self.labels, teams)) for token in label_tokens(label, team))
+        self.tokens = [x[0] for x in pairs]
+        self.positions = np.array([x[1] for x in pairs], dtype=np.int64)
+
+        # Players with more playing time are listed first
+        self.rank = np.empty(len(self.labels), dtype=np.int64)
+        self.rank[np.argsort(-np.asarray(popularity, dtype=float), kind='stable')] = np.arange(len(self.labels))
+
+    def prefix_positions(self, term):
+        start = bisect_left(self.tokens, term)
+        stop = bisect_left(self.tokens, term + '\uffff')
+        return self.positions[start:stop]
+
+    def search(self, text, mask=None, limit=None):
+        matches = None
+        for term in (text or '').lower().split():
+            positions = np.unique(self.prefix_positions(term))
+            matches = positions if matches is None else np.intersect1d(matches, positions, assume_unique=True)
+
+        if matches is None:
+            matches = np.arange(len(self.labels))
+        if mask is not None:
+            matches = matches[mask[matches]]
+
+        ordered = matches[np.argsort(self.rank[matches], kind='stable')]
+        if limit is not None:
+            ordered = ordered[:limit]
+        return [self.labels[x] for x in ordered]
+
+
+# One Index per Dataset and Season, Rebuilt When the Season Is Reloaded
+_indexes = season_cache.index_cache()
+
+
+def build_index(name, data):
+    spec = DATASETS[name]
+    teams = data['Team'] if 'Team' in data.columns else data.index
+    popularity = data[spec['qualify']].to_numpy() if 'qualify' in spec else np.zeros(len(data))
+    return PrefixIndex(data.index, teams, popularity)
+
+
+def season_index(name, season, snapshot):
+    return _indexes.get(name, season, snapshot.version, lambda: build_index(name, snapshot.frame))
+
+
+def search_labels(name, text, seasons, minimum=None, limit=None):
+    if limit is None:
+        limit = config.SEARCH_LIMIT
+
+    seasons = normalize_seasons(seasons)
+    results = []
+    for season in reversed(seasons):
+        # The mask and the index come from one snapshot so a refresh cannot misalign them
+        snapshot = season_cache.snapshot(name, season)
+        mask = qualified(name, snapshot.frame, minimum)
+        for label in season_index(name, season, snapshot).search(text, mask, limit):
+            if label not in results:
+                results.append(label)
+    return results[:limit]
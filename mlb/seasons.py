@@ -0,0 +1,128 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import date
+
+from mlb import config
+
+# Seasons Offered by the Dashboard
+FIRST_SEASON = 2015
+
+
+def latest_season():
+    # Regular seasons start in late March, so earlier dates still belong to last year
+    today = date.today()
+    return today.year if today.month >= 4 else today.year - 1
+
+
+SEASONS = list(range(FIRST_SEASON, latest_season() + 1))
+DEFAULT_SEASON = int(config.DEFAULT_SEASON) if config.DEFAULT_SEASON else SEASONS[-1]
+
+
+def normalize_seasons(seasons):
+    if not seasons:
+        return [DEFAULT_SEASON]
+    if isinstance(seasons, int):
+        return [seasons]
+    # The season cache only holds MAX_SEASONS, so a larger selection would evict and reload on every request
+    return sorted(set(int(x) for x in seasons))[-config.MAX_SEASONS:]
+
+
+# Immutable View of One Dataset Season, Replaced Whole on Refresh
+Snapshot = namedtuple('Snapshot', ['frame', 'version', 'fetched_at'])
+
+
+def fetch_time(frame):
+    return frame.attrs.get('fetched_at', time.time())
+
+
+# Indexes Built From One Dataset Season, Rebuilt When Its Version Changes
+class IndexCache:
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, name, season, version, build):
+        with self._lock:
+            cached = self._entries.get((name, season))
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        # Building outside the lock, and only the newest version of each season is kept
+        index = build()
+        with self._lock:
+            self._entries[(name, season)] = (version, index)
+        return index
+
+    def evict(self, season):
+        with self._lock:
+            for key in [x for x in self._entries if x[1] == season]:
+                del self._entries[key]
+
+
+# Lazily Loaded Seasons With LRU Eviction
+class SeasonCache:
+    def __init__(self, load, max_seasons):
+        self.load = load
+        self.max_seasons = max_seasons
+        self._seasons = OrderedDict()
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        self._index_caches = []
+
+    def snapshot(self, name, season):
+        with self._lock:
+            snapshots = self._seasons.get(season)
+            if snapshots is not None and name in snapshots:
+                self._seasons.move_to_end(season)
+                return snapshots[name]
+
+        # Loading outside the lock so one slow season does not block the others
+        frame = self.load(name, season)
+
+        with self._lock:
+            current = self._seasons.get(season, {}).get(name)
+            if current is not None and current.fetched_at >= fetch_time(frame):
+                # A background refresh got there first with data at least as new
+                return current
+            return self._store(name, season, frame)
+
+    def get(self, name, season):
+        return self.snapshot(name, season).frame
+
+    def version(self, name, season):
+        return self.snapshot(name, season).version
+
+    def swap(self, name, season, frame):
+        # Readers holding the old snapshot keep using it, new lookups see the new one
+        with self._lock:
+            current = self._seasons.get(season, {}).get(name)
+            if current is not None and current.fetched_at >= fetch_time(frame):
+                return None
+            return self._store(name, season, frame)
+
+    def _store(self, name, season, frame):
+        # Each load gets a new version so caches built on evicted or replaced data are never reused
+        snapshot = Snapshot(frame, next(self._counter), fetch_time(frame))
+        self._seasons.setdefault(season, {})[name] = snapshot
+        self._seasons.move_to_end(season)
+        while len(self._seasons) > self.max_seasons:
+            season, _ = self._seasons.popitem(last=False)
+            for cache in self._index_caches:
+                cache.evict(season)
+        return snapshot
+
+    def index_cache(self):
+        # Indexes built from a season are dropped along with that season's frames
+        cache = IndexCache()
+        self._index_caches.append(cache)
+        return cache
+
+    def loaded(self):
+        with self._lock:
+            return [(name, season) for season, snapshots in self._seasons.items() for name in snapshots]
+
+    def loaded_seasons(self):
+        with self._lock:
+            return list(self._seasons)
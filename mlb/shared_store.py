@@ -0,0 +1,132 @@
+import glob
+import logging
+import os
+import shutil
+import time
+
+from mlb import config
+from mlb.seasons import latest_season
+from mlb.startup import lazy_import
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+pa = lazy_import('pyarrow')
+
+logger = logging.getLogger(__name__)
+
+
+# Bump Whenever the Shape of the Built Frames Changes
+STORE_VERSION = 5
+
+
+# Building Store Paths
+def store_path(name, season):
+    return os.path.join(config.STORE_DIR, '{}_{}_v{}.arrow'.format(name, season, STORE_VERSION))
+
+
+def archive_path(name, season, stamp):
+    # Replaced files are named by their fetch stamp, which every worker reads the same way
+    return os.path.join(config.STORE_DIR, '{}_{}_v{}_{!r}.arrow'.format(name, season, STORE_VERSION, float(stamp)))
+
+
+def fetched_at(path):
+    # Only the file footer is read, older files without the stamp fall back to their mtime
+    with pa.memory_map(path, 'r') as source:
+        metadata = pa.ipc.open_file(source).schema.metadata or {}
+    return float(metadata.get(b'fetched_at', os.path.getmtime(path)))
+
+
+def is_current(path, season, max_age=None):
+    if not os.path.exists(path):
+        return False
+    if max_age is None:
+        max_age = config.SNAPSHOT_TTL
+    return season < latest_season() or time.time() - fetched_at(path) < max_age
+
+
+# Writing and Memory-Mapping Arrow IPC Files
+def write_frame(path, frame):
+    table = pa.Table.from_pandas(frame)
+    stamp = frame.attrs.get('fetched_at', time.time())
+    table = table.replace_schema_metadata(dict(table.schema.metadata or {}, fetched_at=str(stamp)))
+    with pa.OSFile(path + '.tmp', 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(path + '.tmp', path)
+
+
+def open_frame(path):
+    # Numeric columns stay as read-only views over the shared page cache
+    source = pa.memory_map(path, 'r')
+    table = pa.ipc.open_file(source).read_all()
+    frame = table.to_pandas(split_blocks=True)
+    metadata = table.schema.metadata or {}
+    frame.attrs['fetched_at'] = float(metadata.get(b'fetched_at', os.path.getmtime(path)))
+    return frame
+
+
+# Keeping Replaced Files for Download Links Made Before a Refresh
+def archive_frame(name, season):
+    path = store_path(name, season)
+    if not os.path.exists(path):
+        return
+    archive = archive_path(name, season, fetched_at(path))
+    if not os.path.exists(archive):
+        # A hard link keeps the old pages without copying them, and write_frame then swaps in a new inode
+        try:
+            os.link(path, archive)
+        except OSError:
+            shutil.copyfile(path, archive)
+
+    pattern = os.path.join(config.STORE_DIR, '{}_{}_v{}_*.arrow'.format(name, season, STORE_VERSION))
+    archives = sorted(glob.glob(pattern), key=os.path.getmtime)
+    for old in archives[:-config.EXPORT_ARCHIVES or None]:
+        os.remove(old)
+
+
+def stored_frame(name, season, stamp):
+    # The live file first, in case another worker refreshed it, then the kept copies
+    for path in (store_path(name, season), archive_path(name, season, stamp)):
+        # Reading the footer's stamp first means a stale live file is never opened
+        if os.path.exists(path) and fetched_at(path) == stamp:
+            frame = open_frame(path)
+            # The live file can be replaced between the two reads
+            if frame.attrs['fetched_at'] == stamp:
+                return frame
+    return None
+
+
+class StoreLock:
+    def __init__(self, path):
+        self.path = path + '.lock'
+
+    def __enter__(self):
+        self.handle = open(self.path, 'w')
+        if fcntl is not None:
+            fcntl.flock(self.handle, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc_info):
+        if fcntl is not None:
+            fcntl.flock(self.handle, fcntl.LOCK_UN)
+        self.handle.close()
+
+
+# Reading a Dataset Through the Shared Store
+def shared_frame(name, season, build, max_age=None, stale_ok=False):
+    path = store_path(name, season)
+    if (stale_ok and os.path.exists(path)) or is_current(path, season, max_age):
+        return open_frame(path)
+
+    # Only one worker builds a dataset while the others wait for its file
+    os.makedirs(config.STORE_DIR, exist_ok=True)
+    with StoreLock(path):
+        if not is_current(path, season, max_age):
+            frame = build(name, season)
+            archive_frame(name, season)
+            write_frame(path, frame)
+            logger.info('Wrote %s to the shared store', os.path.basename(path))
+    return open_frame(path)
@@ -0,0 +1,76 @@
+from mlb.datasets import DATASETS, qualified, season_cache, season_label
+from mlb.derived import base_stats
+from mlb.seasons import normalize_seasons
+from mlb.startup import lazy_import
+
+np = lazy_import('numpy')
+
+
+# League-Standardized Stat Vectors for Every Player in a Season
+class SimilarityIndex:
+    def __init__(self, data, stats):
+        self.labels = data.index.tolist()
+        self.positions = {label: position for position, label in enumerate(self.labels)}
+        self.columns = {x: position for position, x in enumerate(stats)}
+        # The z-scores are computed at build time, and a missing stat counts as league average
+        values = data[['{} z-Score'.format(x) for x in stats]].to_numpy(dtype=np.float32, na_value=np.nan)
+        self.matrix = np.nan_to_num(values, nan=0.0)
+
+    def weight_vector(self, weights):
+        vector = np.zeros(len(self.columns), dtype=np.float32)
+        for stat, weight in weights.items():
+            if stat in self.columns:
+                vector[self.columns[stat]] = weight
+        return vector
+
+    def distances(self, target, weights):
+        # Weighted root-mean-square gap in standard deviations, for every player at once
+        used = np.flatnonzero(weights)
+        gaps = self.matrix[:, used] - target[used]
+        return np.sqrt((gaps * gaps) @ weights[used] / weights[used].sum())
+
+    def nearest(self, target, weights, pool, count, exclude=None):
+        distances = np.where(pool, self.distances(target, weights), np.inf)
+        if exclude is not None:
+            distances[exclude] = np.inf
+        count = min(count, int(np.isfinite(distances).sum()))
+        if count == 0:
+            return np.zeros(0, dtype=int), np.zeros(0)
+        nearest = np.argpartition(distances, count - 1)[:count]
+        nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+        return nearest, distances[nearest]
+
+
+# One Index per Dataset and Season, Rebuilt When the Season Is Reloaded
+_indexes = season_cache.index_cache()
+
+
+def similarity_index(name, season, snapshot):
+    return _indexes.get(name, season, snapshot.version, lambda: SimilarityIndex(snapshot.frame, base_stats(DATASETS[name])))
+
+
+def similar_players(name, label, weights, seasons, minimum=None, count=5):
+    seasons = normalize_seasons(seasons)
+    weights = {stat: weight for stat, weight in weights.items() if weight}
+    if not weights:
+        return []
+
+    # Comparing against the player's latest selected season
+    snapshots = {season: season_cache.snapshot(name, season) for season in seasons}
+    indexes = {season: similarity_index(name, season, snapshots[season]) for season in seasons}
+    target_season = next((x for x in reversed(seasons) if label in indexes[x].positions), None)
+    if target_season is None:
+        return []
+    target_index = indexes[target_season]
+    target = target_index.matrix[target_index.positions[label]]
+
+    matches = []
+    for season in seasons:
+        index = indexes[season]
+        pool = qualified(name, snapshots[season].frame, minimum)
+        exclude = index.positions[label] if season == target_season else None
+        nearest, distances = index.nearest(target, index.weight_vector(weights), pool, count, exclude)
+        matches.extend((distance, season, index.labels[x]) for x, distance in zip(nearest, distances))
+
+    matches.sort(key=lambda x: x[0])
+    return [dict(label=label, season=season, display=season_label(label, season, seasons), distance=float(distance)) for distance, season, label in matches[:count]]
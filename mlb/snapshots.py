@@ -0,0 +1,162 @@
+import hashlib
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+
+from mlb import config
+from mlb.seasons import latest_season
+from mlb.startup import lazy_import
+
+pd = lazy_import('pandas')
+
+logger = logging.getLogger(__name__)
+
+
+# Building Snapshot Keys and Paths
+def snapshot_key(function_name, season, **kwargs):
+    parts = [function_name, str(season)]
+    for name in sorted(kwargs):
+        parts.append('{}-{}'.format(name, kwargs[name]))
+    return '_'.join(parts)
+
+
+def snapshot_paths(key):
+    data_path = os.path.join(config.SNAPSHOT_DIR, key + '.parquet')
+    meta_path = os.path.join(config.SNAPSHOT_DIR, key + '.json')
+    return data_path, meta_path
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Reading and Writing Snapshots
+def snapshot_exists(function_name, season, **kwargs):
+    return all(os.path.exists(x) for x in snapshot_paths(snapshot_key(function_name, season, **kwargs)))
+
+
+def read_snapshot(key):
+    data_path, meta_path = snapshot_paths(key)
+    if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return None
+
+    with open(meta_path) as handle:
+        meta = json.load(handle)
+
+    if file_checksum(data_path) != meta.get('checksum'):
+        logger.warning('Snapshot %s failed its checksum and will be ignored', key)
+        return None
+
+    return pd.read_parquet(data_path), meta
+
+
+def arrow_safe(frame):
+    # Parquet needs one type per column, so mixed object columns are stored as text
+    frame = frame.copy()
+    for column in frame.columns[frame.dtypes == object]:
+        if pd.api.types.infer_dtype(frame[column], skipna=True) not in ('string', 'empty'):
+            frame[column] = frame[column].astype(str)
+    return frame
+
+
+def write_snapshot(key, frame, **meta):
+    os.makedirs(config.SNAPSHOT_DIR, exist_ok=True)
+    data_path, meta_path = snapshot_paths(key)
+
+    # Writing to temporary files first so readers never see a partial snapshot
+    arrow_safe(frame).to_parquet(data_path + '.tmp')
+    meta.update(
+        key=key,
+        fetched_at=time.time(),
+        rows=len(frame),
+        checksum=file_checksum(data_path + '.tmp'),
+    )
+    with open(meta_path + '.tmp', 'w') as handle:
+        json.dump(meta, handle, indent=2)
+
+    os.replace(data_path + '.tmp', data_path)
+    os.replace(meta_path + '.tmp', meta_path)
+    return meta
+
+
+def is_fresh(meta, ttl):
+    return time.time() - meta['fetched_at'] < ttl
+
+
+# Fetching Data Through the Snapshot Cache
+def fetch_from_pybaseball(function_name, *args, **kwargs):
+    pybaseball = importlib.import_module('pybaseball')
+    return getattr(pybaseball, function_name)(*args, **kwargs)
+
+
+def call_with_timeout(function, timeout, *args, **kwargs):
+    # pybaseball takes no timeout, so the call runs on a daemon thread that is abandoned if it hangs
+    result = {}
+
+    def target():
+        try:
+            result['value'] = function(*args, **kwargs)
+        except Exception as error:
+            result['error'] = error
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError('Gave up after {:.0f}s'.format(timeout))
+    if 'error' in result:
+        raise result['error']
+    return result['value']
+
+
+def fetch_with_retries(function_name, *args, timeout=None, **kwargs):
+    # A timeout of 0 waits for the call however long it takes
+    if timeout is None:
+        timeout = config.FETCH_TIMEOUT
+    attempts = config.FETCH_RETRIES + 1
+    for attempt in range(attempts):
+        try:
+            return call_with_timeout(fetch_from_pybaseball, timeout or None, function_name, *args, **kwargs)
+        except Exception:
+            if attempt == attempts - 1:
+                raise
+            delay = config.FETCH_BACKOFF * 2 ** attempt
+            logger.warning('Fetching %s %s failed (attempt %d of %d), retrying in %.1fs', function_name, ' '.join(str(x) for x in args), attempt + 1, attempts, delay, exc_info=True)
+            time.sleep(delay)
+
+
+def with_fetch_time(frame, meta):
+    frame.attrs['fetched_at'] = meta['fetched_at']
+    return frame
+
+
+def cached_fetch(function_name, season, ttl=None, stale_ok=False, **kwargs):
+    if ttl is None:
+        # Finished seasons no longer change, so their snapshots never expire
+        ttl = config.SNAPSHOT_TTL if season >= latest_season() else float('inf')
+
+    key = snapshot_key(function_name, season, **kwargs)
+    snapshot = read_snapshot(key)
+    if snapshot is not None and (config.OFFLINE or stale_ok or is_fresh(snapshot[1], ttl)):
+        return with_fetch_time(*snapshot)
+
+    if config.OFFLINE:
+        raise FileNotFoundError('No snapshot for {} while running offline'.format(key))
+
+    try:
+        frame = fetch_with_retries(function_name, season, **kwargs)
+    except Exception:
+        if snapshot is None:
+            raise
+        logger.warning('Refreshing %s failed, serving the stale snapshot', key, exc_info=True)
+        return with_fetch_time(*snapshot)
+
+    meta = write_snapshot(key, frame, function=function_name, season=season, kwargs=kwargs)
+    return with_fetch_time(frame, meta)
@@ -0,0 +1,117 @@
+import builtins
+import importlib
+import importlib.util
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from mlb import config
+
+logger = logging.getLogger(__name__)
+
+
+# Deferring Heavy Imports
+def lazy_import(name):
+    # The module body only runs when one of its attributes is first used
+    if name in sys.modules:
+        # Returned as is, since even import_module would finish loading a pending lazy module
+        return sys.modules[name]
+    if not config.LAZY_STARTUP:
+        return importlib.import_module(name)
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+# Timing Module Imports Through builtins.__import__
+class ImportProfiler:
+    def __init__(self):
+        self.self_times = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._original = None
+
+    def start(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+
+    def stop(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+
+        stack = self._local.__dict__.setdefault('stack', [])
+        stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self._lock:
+                self.self_times[name] = self.self_times.get(name, 0.0) + elapsed - children
+
+    def packages(self):
+        # Rolling submodules up to their top-level package, except for this project's own modules
+        totals = {}
+        with self._lock:
+            for name, seconds in self.self_times.items():
+                package = name if name.startswith('mlb.') else name.split('.')[0]
+                totals[package] = totals.get(package, 0.0) + seconds
+        return totals
+
+
+# Startup Profile Reported Once the App Is Ready
+_profile = dict(started=None, phases={}, imports=None)
+
+
+def begin():
+    if not config.STARTUP_PROFILE:
+        return
+    _profile['started'] = time.perf_counter()
+    _profile['imports'] = ImportProfiler()
+    _profile['imports'].start()
+
+
+@contextmanager
+def phase(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _profile['phases'][name] = time.perf_counter() - started
+
+
+def finish(dataset_loads=None, top=15):
+    if _profile['started'] is None:
+        return None
+    total = time.perf_counter() - _profile['started']
+    profiler = _profile['imports']
+    profiler.stop()
+    packages = profiler.packages()
+
+    lines = ['Startup profile: {:.2f}s total ({} lazy startup)'.format(total, 'with' if config.LAZY_STARTUP else 'without')]
+    lines.append('  imports: {:.2f}s'.format(sum(packages.values())))
+    for package, seconds in sorted(packages.items(), key=lambda x: x[1], reverse=True)[:top]:
+        lines.append('    {:<32} {:>7.1f}ms'.format(package, seconds * 1000))
+    for name, seconds in _profile['phases'].items():
+        lines.append('  {}: {:.2f}s'.format(name, seconds))
+    for (name, season), seconds in sorted((dataset_loads or {}).items()):
+        lines.append('    {:<32} {:>7.1f}ms'.format('{} {}'.format(name, season), seconds * 1000))
+
+    _profile['started'] = None
+    report = '\n'.join(lines)
+    logger.info(report)
+    return report
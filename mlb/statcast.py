@@ -0,0 +1,221 @@
+import argparse
+import importlib
+import json
+import logging
+import os
+import time
+from datetime import date, timedelta
+
+from mlb import config
+from mlb.seasons import DEFAULT_SEASON
+from mlb.snapshots import fetch_with_retries
+from mlb.startup import lazy_import
+from mlb.teams import STATCAST_TEAMS
+
+pd = lazy_import('pandas')
+pa = lazy_import('pyarrow')
+
+logger = logging.getLogger(__name__)
+
+# Pitch-Level Columns Kept From Each Statcast Chunk
+STATCAST_COLUMNS = [
+    'game_pk', 'at_bat_number', 'pitch_number', 'inning_topbot', 'home_team', 'away_team',
+    'pitcher', 'batter', 'p_throws', 'stand', 'pitch_type', 'pitch_name',
+    'release_speed', 'release_spin_rate', 'pfx_x', 'pfx_z', 'plate_x', 'plate_z', 'zone',
+    'balls', 'strikes', 'type', 'description', 'events',
+    'hc_x', 'hc_y', 'launch_speed', 'launch_angle',
+]
+
+# Spring Training and the Postseason Both Fall Inside This Window
+SEASON_START = (3, 15)
+SEASON_END = (11, 15)
+
+
+# Where Each Season's Partitions and Manifest Live
+def season_dir(season):
+    return os.path.join(config.STATCAST_DIR, 'season={}'.format(season))
+
+
+def partition_dir(season, day):
+    return os.path.join(season_dir(season), 'game_date={}'.format(day))
+
+
+def manifest_path(season):
+    return os.path.join(season_dir(season), '_manifest.json')
+
+
+def names_path():
+    return os.path.join(config.STATCAST_DIR, 'players.json')
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as handle:
+        json.dump(data, handle, indent=2, sort_keys=True)
+    os.replace(temporary, path)
+
+
+def read_json(path, default):
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return default
+
+
+# Splitting a Season Into Date-Range Chunks
+def season_chunks(season, chunk_days=None, today=None):
+    if chunk_days is None:
+        chunk_days = config.STATCAST_CHUNK_DAYS
+    today = today or date.today()
+    start = date(season, *SEASON_START)
+    end = min(date(season, *SEASON_END), today)
+    while start <= end:
+        stop = min(start + timedelta(days=chunk_days - 1), end)
+        yield start, stop
+        start = stop + timedelta(days=1)
+
+
+def read_manifest(season):
+    return read_json(manifest_path(season), dict(season=season, chunks={}))
+
+
+def data_version(season):
+    # The manifest is rewritten after every chunk, so its mtime changes whenever the partitions do
+    try:
+        return os.stat(manifest_path(season)).st_mtime_ns
+    except OSError:
+        return 0
+
+
+# Fetching From pybaseball and Naming Players
+def fetch_statcast(start, end):
+    if config.OFFLINE:
+        raise FileNotFoundError('Statcast data for {} to {} is not on disk and MLB_OFFLINE is set'.format(start, end))
+    # A week of pitches takes minutes to download, far longer than a season leaderboard
+    return fetch_with_retries('statcast', start.isoformat(), end.isoformat(), timeout=config.STATCAST_FETCH_TIMEOUT)
+
+
+def lookup_player_names(ids):
+    pybaseball = importlib.import_module('pybaseball')
+    table = pybaseball.playerid_reverse_lookup(list(ids), key_type='mlbam')
+    return {int(row.key_mlbam): '{} {}'.format(row.name_first, row.name_last).title() for row in table.itertuples()}
+
+
+def player_names(ids, lookup):
+    # Names are looked up once per player and kept beside the partitions
+    names = read_json(names_path(), {})
+    missing = sorted({int(x) for x in ids} - {int(x) for x in names})
+    if missing:
+        try:
+            names.update({str(x): name for x, name in lookup(missing).items()})
+            write_json(names_path(), names)
+        except Exception:
+            logger.warning('Looking up %d player names failed', len(missing), exc_info=True)
+    return {int(x): name for x, name in names.items()}
+
+
+def team_abbreviations(teams):
+    return teams.astype(str).replace(STATCAST_TEAMS)
+
+
+def pitcher_label(name):
+    # Statcast lists pitchers as 'Last, First'
+    last, _, first = str(name).partition(', ')
+    return '{} {}'.format(first, last) if first else last
+
+
+# Shaping a Chunk Into Partition Rows
+def prepare_chunk(frame, lookup):
+    data = frame[[x for x in STATCAST_COLUMNS if x in frame.columns]].copy()
+    data['game_date'] = pd.to_datetime(frame['game_date']).dt.strftime('%Y-%m-%d')
+
+    # The pitcher's team is at home in the top of the inning
+    top = frame['inning_topbot'].astype(str).eq('Top').to_numpy()
+    home, away = team_abbreviations(frame['home_team']), team_abbreviations(frame['away_team'])
+    data['pitcher_team'] = home.where(top, away)
+    data['batter_team'] = away.where(top, home)
+
+    batters = player_names(frame['batter'].dropna().unique(), lookup)
+    data['pitcher_name'] = frame['player_name'].map(pitcher_label)
+    data['batter_name'] = frame['batter'].map(batters)
+    data['pitcher_label'] = data['pitcher_name'] + ' (' + data['pitcher_team'] + ')'
+    data['batter_label'] = data['batter_name'] + ' (' + data['batter_team'] + ')'
+    return data
+
+
+def write_chunk(season, frame, lookup):
+    data = prepare_chunk(frame, lookup)
+    # Chunks never share a date, so each date partition is written by exactly one chunk
+    for day, rows in data.groupby('game_date', sort=True):
+        directory = partition_dir(season, day)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, 'part-0.parquet')
+        rows.drop(columns='game_date').to_parquet(path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+    return len(data)
+
+
+# Resumable Ingestion
+def ingest_season(season, fetch=None, lookup=None, chunk_days=None, today=None):
+    fetch = fetch or fetch_statcast
+    lookup = lookup or lookup_player_names
+    today = today or date.today()
+    manifest = read_manifest(season)
+
+    for start, end in season_chunks(season, chunk_days, today):
+        key = '{}/{}'.format(start.isoformat(), end.isoformat())
+        if manifest['chunks'].get(key, {}).get('complete'):
+            continue
+
+        started = time.perf_counter()
+        frame = fetch(start, end)
+        rows = write_chunk(season, frame, lookup) if len(frame) else 0
+        del frame
+
+        # A chunk reaching today can still gain games, so the next run fetches it again
+        manifest['chunks'][key] = dict(rows=rows, complete=end < today, written_at=time.time())
+        write_json(manifest_path(season), manifest)
+        logger.info('Ingested Statcast %s (%d pitches) in %.1fs', key, rows, time.perf_counter() - started)
+    return manifest
+
+
+# Reading Only the Partitions and Columns a Query Needs
+def pitch_dataset(season):
+    ds = importlib.import_module('pyarrow.dataset')
+    partitioning = ds.partitioning(pa.schema([('game_date', pa.string())]), flavor='hive')
+    return ds.dataset(season_dir(season), format='parquet', partitioning=partitioning, exclude_invalid_files=True)
+
+
+def read_pitches(season, columns, start=None, end=None, **equals):
+    if not os.path.isdir(season_dir(season)):
+        return pd.DataFrame(columns=columns)
+
+    ds = importlib.import_module('pyarrow.dataset')
+    terms = []
+    if start is not None:
+        terms.append(ds.field('game_date') >= str(start))
+    if end is not None:
+        terms.append(ds.field('game_date') <= str(end))
+    for column, values in equals.items():
+        terms.append(ds.field(column).isin(list(values)))
+    condition = None
+    for term in terms:
+        condition = term if condition is None else condition & term
+
+    dataset = pitch_dataset(season)
+    if not dataset.files:
+        return pd.DataFrame(columns=columns)
+    return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    parser = argparse.ArgumentParser(description='Ingest Statcast pitch data into date-partitioned Parquet, resuming from the last completed chunk.')
+    parser.add_argument('--season', type=int, default=DEFAULT_SEASON)
+    parser.add_argument('--chunk-days', type=int, default=config.STATCAST_CHUNK_DAYS)
+    arguments = parser.parse_args()
+
+    manifest = ingest_season(arguments.season, chunk_days=arguments.chunk_days)
+    print('{} chunks, {:,} pitches in {}'.format(len(manifest['chunks']), sum(x['rows'] for x in manifest['chunks'].values()), season_dir(arguments.season)))
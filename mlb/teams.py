@@ -0,0 +1,101 @@
+# Full Team Names Used by the Team Pages
+TEAM_NAMES = {
+    'NYY':'New York Yankees',
+    'BOS':'Boston Red Sox',
+    'BAL':'Baltimore Orioles',
+    'TBR':'Tampa Bay Rays',
+    'TOR':'Toronto Blue Jays',
+    'CLE':'Cleveland Guardians',
+    'DET':'Detroit Tigers',
+    'KCR':'Kansas City Royals',
+    'MIN':'Minnesota Twins',
+    'CHW':'Chicago White Sox',
+    'HOU':'Houston Astros',
+    'OAK':'Oakland Athletics',
+    'LAA':'Los Angeles Angels',
+    'SEA':'Seattle Mariners',
+    'TEX':'Texas Rangers',
+    'NYM':'New York Mets',
+    'ATL':'Atlanta Braves',
+    'WSN':'Washington Nationals',
+    'PHI':'Philadelphia Phillies',
+    'MIA':'Miami Marlins',
+    'STL':'St. Louis Cardinals',
+    'CHC':'Chicago Cubs',
+    'PIT':'Pittsburgh Pirates',
+    'MIL':'Milwaukee Brewers',
+    'CIN':'Cincinnati Reds',
+    'SDP':'San Diego Padres',
+    'LAD':'Los Angeles Dodgers',
+    'SFG':'San Francisco Giants',
+    'ARI':'Arizona Diamondbacks',
+    'COL':'Colorado Rockies',
+    'ATH':'Athletics'
+}
+
+# Every Team Name Offered by the Team Dropdowns, Available Without Loading Data
+TEAM_NAME_LIST = sorted(set(TEAM_NAMES.values()))
+
+# Statcast Abbreviations That Differ From FanGraphs
+STATCAST_TEAMS = {
+    'AZ':'ARI',
+    'CWS':'CHW',
+    'KC':'KCR',
+    'SD':'SDP',
+    'SF':'SFG',
+    'TB':'TBR',
+    'WSH':'WSN'
+}
+
+# Team Colors Keyed by Abbreviation
+TEAM_COLORS = {
+    'NYY':'#003087',
+    'BOS':'#BD3039',
+    'BAL':'#DF4601',
+    'TBR':'#092C5C',
+    'TOR':'#134A8E',
+    'CLE':'#00385D',
+    'DET':'#0C2340',
+    'KCR':'#004687',
+    'MIN':'#002B5C',
+    'CHW':'#27251F',
+    'HOU':'#002D62',
+    'OAK':'#003831',
+    'LAA':'#BA0021',
+    'SEA':'#0C2C56',
+    'TEX':'#003278',
+    'NYM':'#002D72',
+    'ATL':'#13274F',
+    'WSN':'#AB0003',
+    'PHI':'#E81828',
+    'MIA':'#000000',
+    'STL':'#C41E3A',
+    'CHC':'#0E3386',
+    'PIT':'#FDB827',
+    'MIL':'#12284B',
+    'CIN':'#C6011F',
+    'SDP':'#2F241D',
+    'LAD':'#005A9C',
+    'SFG':'#FD5A1E',
+    'ARI':'#A71930',
+    'COL':'#333366',
+    'ATH':'#003831'
+}
+
+# Players Who Played for More Than One Team Share a Neutral Color
+MULTIPLE_TEAMS_COLOR = '#c0c0c0'
+
+# Looking Colors Up by Abbreviation or Full Team Name
+COLOR_LOOKUP = dict(TEAM_COLORS)
+COLOR_LOOKUP.update({TEAM_NAMES[x]: color for x, color in TEAM_COLORS.items()})
+
+
+def team_color(team):
+    # Cross-season team labels end in the season, as in 'Houston Astros 2022'
+    if team not in COLOR_LOOKUP and team[-4:].isdigit():
+        team = team[:-5]
+    return COLOR_LOOKUP.get(team, MULTIPLE_TEAMS_COLOR)
+
+
+def team_colors(teams):
+    return [team_color(x) for x in teams]
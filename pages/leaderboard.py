@@ -0,0 +1,258 @@
+
+import dash
+from dash import Dash, html, dcc, Input, Output, State, callback
+import dash_bootstrap_components as dbc
+from mlb.compact import display_values
+from mlb.datasets import DATASETS, data_age_text, qualifying_minimums, stat_names
+from mlb.export import EXPORT_FORMATS, export_links
+from mlb.figure_cache import cached_figure
+from mlb.instrumentation import timed
+from mlb.leaders import leader_rows
+from mlb.ranks import rank_rows
+from mlb.figures import bar_figure, bar_template
+from mlb.teams import team_colors
+
+# Leaderboards Offered on This Page
+leaderboard_choices={'player_batting':'Player Batting','player_pitching':'Player Pitching','team_batting':'Team Batting','team_pitching':'Team Pitching'}
+default_stats={'player_batting':'Wins Above Replacement (WAR)','player_pitching':'Earned Run Average (ERA)','team_batting':'Home Runs (HR)','team_pitching':'Earned Run Average (ERA)'}
+
+# Building the Chart Template Once
+leaderboard_template=bar_template('Player(s) or Team(s)')
+
+# Registering the Leaderboard Page
+dash.register_page(__name__)
+
+# The Leaderboard Page
+layout=dbc.Container(
+    children=[
+    # Title and Dashboard Explanation
+    html.H1('MLB Leaderboards (2015-Present)',className='text-center text-danger mt-3 mb-2 fs-1'),
+    html.P("Looking for the league leaders? This page ranks the top or bottom players and teams in any statistical measure, no hand-picking required! Choose a leaderboard, a statistical measure and how many places to show. Player leaderboards only include players that qualified for that season's batting title or pitching awards. Select more than one season in the navigation bar to see the best single seasons across those years.",className='text-center text-dark mb-3 mt-2 fs-6'),
+    html.H3('Leaderboard Bar Chart', className='text-primary text-center fs-2 mt-3 mb-0'),
+    # The Graph
+    dbc.Row([
+        dbc.Col(
+            children=[
+                dcc.Graph(
+                    id='leader_chart',
+                    className='m-4',
+                    config=dict(displayModeBar=False),
+                ),
+                html.P(id='leader_data_age',className='text-center text-muted fs-6 mb-0'),
+            ],
+            width=10,
+            className='offset-md-1'
+        )
+    ]),
+    # Download Buttons
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.Span('Download the data behind this chart:',className='text-dark fs-6 me-2'),
+                dcc.RadioItems(
+                    id='leader_export_scope',
+                    options=[dict(label=' Charted Rows',value='selection'),dict(label=' Full Table',value='full')],
+                    value='selection',
+                    inline=True,
+                    inputClassName='ms-3',
+                    className='d-inline-block text-dark fs-6 me-2'
+                ),
+            ]+[
+                dbc.Button(EXPORT_FORMATS[x]['label'],id='leader_export_{}'.format(x),href='',external_link=True,color='primary',outline=True,size='sm',className='ms-2') for x in EXPORT_FORMATS
+            ],
+            width=10,
+            className='offset-md-1 text-center mt-2'
+        )
+    ]),
+    # User Commands
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.P('Please select a leaderboard to review.',className='text-center text-dark fs-5 mt-3')
+            ],
+            width=6
+        ),
+        dbc.Col(
+            children=[
+                html.P('Please select a statistical measure to rank by.',className='text-center text-dark fs-5 mt-3')
+            ]
+        )
+    ]),
+    # Dropdown Boxes
+    dbc.Row([
+        dbc.Col(
+            children=[
+                dcc.Dropdown(
+                    id='leader_dataset',
+                    options=[
+                        dict(label=label,value=name) for name,label in leaderboard_choices.items()
+                    ],
+                    className='mt-1 mb-3',
+                    value='player_batting',
+                    optionHeight=25,
+                    clearable=False
+                )
+            ],
+            width=4,
+            className='offset-md-1'
+        ),
+        dbc.Col(
+            children=[
+                dcc.Dropdown(
+                    id='leader_stat',
+                    options=[
+                        dict(label=x,value=x) for x in stat_names('player_batting')
+                    ],
+                    className='mt-1 mb-3',
+                    value=default_stats['player_batting'],
+                    optionHeight=25,
+                    clearable=False
+                )
+            ],
+            width=4,
+            className='offset-md-2'
+        )
+    ]),
+
+    # Leaderboard Direction and Length
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.P('Please choose the top or the bottom of the leaderboard.',className='text-center text-dark fs-5 mt-3'),
+                dcc.RadioItems(
+                    id='leader_direction',
+                    options=[dict(label=' Top (Highest)',value='top'),dict(label=' Bottom (Lowest)',value='bottom')],
+                    value='top',
+                    inline=True,
+                    inputClassName='ms-3',
+                    className='text-center text-dark fs-6 mt-1 mb-3'
+                )
+            ],
+            width=4,
+            className='offset-md-1'
+        ),
+        dbc.Col(
+            children=[
+                html.P('Please select how many places to show.',className='text-center text-dark fs-5 mt-3'),
+                dcc.Slider(
+                    id='leader_count',
+                    min=5,
+                    max=50,
+                    step=5,
+                    value=10,
+                    marks={5:'5',10:'10',25:'25',50:'50'},
+                    tooltip=dict(placement='bottom'),
+                    className='mt-1 mb-3'
+                )
+            ],
+            width=4,
+            className='offset-md-2'
+        )
+    ]),
+
+    # Data Sources and Information
+    html.Div(
+        children=[
+            'Data Source: ',
+            html.A(
+                'Pybaseball',
+                href='https://github.com/jldbc/pybaseball',className='text-primary fs-5'
+            ),
+        ],
+        className='text-dark text-center fs-5 mt-5'
+    ),
+    html.Div(
+        children=[
+            'Baseball Data Abbreviations and Definitions: ',
+            html.A(
+                'MLB Glossary',
+                href='https://www.mlb.com/glossary',className='text-primary fs-5'
+            )
+        ],
+        className='text-dark text-center fs-5 mb-2'
+    )
+    ],
+    fluid=True
+)
+
+# Section for the Stat Options Callback
+@callback(
+    Output('leader_stat','options'),
+    Output('leader_stat','value'),
+    Input('leader_dataset','value'),
+    State('leader_stat','value'),
+)
+
+def stat_options(leaderboard,stat_selection):
+    leaderboard_stats=stat_names(leaderboard)
+    # Keeping the chosen stat when the new leaderboard has it too
+    if stat_selection not in leaderboard_stats:
+        stat_selection=default_stats[leaderboard]
+    return [dict(label=x,value=x) for x in leaderboard_stats],stat_selection
+
+# Section for the Callback
+@callback(
+    Output('leader_chart','figure'),
+    Input('leader_dataset','value'),
+    Input('leader_stat','value'),
+    Input('leader_direction','value'),
+    Input('leader_count','value'),
+    Input('season_choice','value'),
+)
+
+def charts(leaderboard,stat_selection,direction,count,seasons):
+    if stat_selection not in stat_names(leaderboard):
+        stat_selection = default_stats[leaderboard]
+
+    return cached_figure(leaderboard,stat_selection,[],seasons,lambda: leaderboard_chart(leaderboard,stat_selection,direction,count,seasons),options=['leaderboard',direction,count,qualifying_minimums(leaderboard,seasons)])
+
+# Building the Leaderboard Chart on a Cache Miss
+def leaderboard_chart(leaderboard,stat_selection,direction,count,seasons):
+    label_name=DATASETS[leaderboard]['index']
+
+    # Looking Up the Precomputed Leaders
+    with timed('subset'):
+        leaders=leader_rows(leaderboard,stat_selection,seasons,count,direction)
+        leaders=rank_rows(leaderboard,leaders,stat_selection)
+
+    # Leaderboard Chart
+    with timed('build'):
+        return bar_figure(
+            leaderboard_template,
+            leaders[label_name].tolist(),
+            display_values(leaders[stat_selection]),
+            team_colors(leaders['Team'] if 'Team' in leaders.columns else leaders[label_name]),
+            stat_selection,
+            label_name,
+            marker_line_width=0.5,
+            notes=leaders['Note'].tolist()
+        )
+
+# Section for the Data Age Callback
+@callback(
+    Output('leader_data_age','children'),
+    Input('season_choice','value'),
+    Input('leader_dataset','value'),
+)
+
+def data_age(seasons,leaderboard):
+    return data_age_text(leaderboard,seasons)
+
+# Section for the Download Links Callback
+@callback(
+    [Output('leader_export_{}'.format(x),'href') for x in EXPORT_FORMATS],
+    Input('leader_dataset','value'),
+    Input('leader_stat','value'),
+    Input('leader_direction','value'),
+    Input('leader_count','value'),
+    Input('season_choice','value'),
+    Input('leader_export_scope','value'),
+)
+
+def export_hrefs(leaderboard,stat_selection,direction,count,seasons,scope):
+    if stat_selection not in stat_names(leaderboard):
+        stat_selection = default_stats[leaderboard]
+
+    # The links name the same data the chart was just drawn from
+    leaders=leader_rows(leaderboard,stat_selection,seasons,count,direction)
+    return export_links(leaderboard,seasons,leaders[DATASETS[leaderboard]['index']].tolist(),[stat_selection],None,scope)
@@ -1,52 +1,38 @@
 
-import pandas as pd
-import plotly.express as px
 import dash
-from dash import Dash, html, dcc, Input, Output, State, callback
+from dash import Dash, html, dcc, Input, Output, State, ALL, callback
 import dash_bootstrap_components as dbc
-from pybaseball import batting_stats
-
-# Creating Batting Stats Dataframe
-batting_data_2022=batting_stats(2022)
-batting_data=batting_data_2022[['Season','Name','Team','G','PA','H','2B','3B','HR','R','RBI','SO','BB','IBB','HBP','SB','AVG','OBP','SLG','OPS','wOBA','wRC','WAR']].copy()
-batting_data.rename(
-    columns={
-        'G': 'Games Played (G)',
-        'PA':'Plate Appearances (PA)',
-        'H':'Hits (H)',
-        '2B':'Doubles (2B)',
-        '3B':'Triples (3B)',
-        'HR':'Home Runs (HR)',
-        'R':'Runs Scored (R)',
-        'RBI':'Runs Batted In (RBI)',
-        'SO':'Strikeouts (SO)',
-        'BB':'Walks (BB)',
-        'IBB':'Intentional Walks (IBB)',
-        'HBP':'Hit By Pitches (HBP)',
-        'SB':'Stolen Bases',
-        'AVG':'Batting Average (AVG)',
-        'OBP':'On-Base Percentage (OBP)',
-        'SLG':'Slugging Percentage (SLG)',
-        'OPS':'On-Base Plus Slugging (OPS)',
-        'wOBA':'Weighted On-Base Average (wOBA)',
-        'wRC':'Weighted Runs Created (wRC)',
-        'WAR':'Wins Above Replacement (WAR)'
-    },
-    inplace=True
-)
-batting_data.loc[:,('Season')]
+from mlb.datasets import DATASETS, data_age_text, lowest_qualifying_minimum, qualifying_minimums, season_rows, stat_names
+from mlb.compact import display_values
+from mlb.derived import base_stats
+from mlb.export import EXPORT_FORMATS, export_links
+from mlb.figure_cache import cached_figure
+from mlb.instrumentation import timed
+from mlb.ranks import rank_rows
+from mlb.search import search_labels
+from mlb.similar import similar_players
+from mlb.figures import bar_figure, bar_template, line_figure, line_template
+from mlb.gamelogs import TREND_STATS, TREND_WINDOWS, trend_series, trends_version
+from mlb.heatmaps import PITCH_TYPES, cached_heatmap
+from mlb.teams import team_colors
 
-# Creating and Setting an Index
-batting_data['Name (Team)'] = batting_data['Name'] + ' (' + batting_data['Team'] + ')'
-batting_data.loc[:,('Name (Team)')]
-batting_data.set_index('Name (Team)',inplace=True)
+# Plate Appearances Needed for the Batting Title Over a Full Season
+qualified_pa=DATASETS['player_batting']['qualified']
 
-# Removing Batting Dataframe Columns
-batting_data.drop(columns=['Season','Name','Team'],inplace=True)
+def pa_marks(minimum_pa):
+    marks={x:str(x) for x in range(0,701,100) if abs(x-minimum_pa)>=50}
+    marks[minimum_pa]='Qualified ({})'.format(minimum_pa)
+    return marks
 
 # Sorting Lists for Dashboard Components
-batting_stat_list=[x for x in batting_data.columns]
-batting_player_list = [x for x in batting_data.index]
+batting_stat_list=stat_names('player_batting')
+default_players=['Aaron Judge (NYY)']
+similar_stat_list=base_stats(DATASETS['player_batting'])
+default_similar_stats=['Home Runs (HR)','Strikeouts (SO)','Walks (BB)','Batting Average (AVG)','On-Base Percentage (OBP)','Slugging Percentage (SLG)']
+
+# Building the Chart Template Once
+batting_template=bar_template('Player(s) (Team Abbreviation)')
+trend_template=line_template()
 
 # Registering the Player Batting Page
 dash.register_page(__name__)
@@ -55,8 +41,8 @@ dash.register_page(__name__)
 layout=dbc.Container(
     children=[
     # Title and Dashboard Explanation
-    html.H1('MLB Player Batting Results (2022 Season)',className='text-center text-danger mt-3 mb-2 fs-1'),
-    html.P("This is the page to be at to review MLB batters' results from the 2022 MLB Season! 20 statistical measures and 130 MLB players combine on this page to create a comparison bar chart among players that qualified for the 2022 MLB batting title. To qualify for this achievement, players must have had at least 3.1 plate appearances per game (or at least 502 plate appearances during the entire season). To operate this bar chart, simply select the statistical measure that you'd like to compare players with and choose what players you'd like to review on the chart below!",className='text-center text-dark mb-3 mt-2 fs-6'),
+    html.H1('MLB Player Batting Results (2015-Present)',className='text-center text-danger mt-3 mb-2 fs-1'),
+    html.P("This is the page to be at to review MLB batters' results from any MLB season since 2015! 20 statistical measures and every MLB batter of the season (roughly 1,500 players) combine on this page to create a comparison bar chart. By default, only players that qualified for the batting title are listed. To qualify for this achievement, players must have had at least 3.1 plate appearances per game (or at least 502 plate appearances during the entire season). During the season the cutoff is prorated by the games teams have played so far. Lower the plate appearance slider to bring in the rest of the league. To operate this bar chart, simply select the statistical measure that you'd like to compare players with and choose what players you'd like to review on the chart below! Picking several seasons in the navigation bar puts each player's season next to their others, so you can follow a hitter from year to year.",className='text-center text-dark mb-3 mt-2 fs-6'),
     html.H3('Player Batting Data Bar Chart', className='text-primary text-center fs-2 mt-3 mb-0'),
     # The Graph
     dbc.Row([
@@ -67,11 +53,32 @@ layout=dbc.Container(
                     className='m-4',
                     config=dict(displayModeBar=False),
                 ),
+                html.P(id='batter_data_age',className='text-center text-muted fs-6 mb-0'),
             ],
             width=10,
             className='offset-md-1'
         )
     ]),
+    # Download Buttons
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.Span('Download the data behind this chart:',className='text-dark fs-6 me-2'),
+                dcc.RadioItems(
+                    id='batter_export_scope',
+                    options=[dict(label=' Charted Rows',value='selection'),dict(label=' Full Table',value='full')],
+                    value='selection',
+                    inline=True,
+                    inputClassName='ms-3',
+                    className='d-inline-block text-dark fs-6 me-2'
+                ),
+            ]+[
+                dbc.Button(EXPORT_FORMATS[x]['label'],id='batter_export_{}'.format(x),href='',external_link=True,color='primary',outline=True,size='sm',className='ms-2') for x in EXPORT_FORMATS
+            ],
+            width=10,
+            className='offset-md-1 text-center mt-2'
+        )
+    ]),
     # User Commands
     dbc.Row([
         dbc.Col(
@@ -110,14 +117,259 @@ layout=dbc.Container(
                 dcc.Dropdown(
                     id='player_dropdown',
                     options=[
-                        dict(label=x,value=x) for x in batting_player_list
+                        dict(label=x,value=x) for x in default_players
                     ],
                     multi=True,
-                    placeholder='Please select a player to review.',
+                    placeholder='Type a player or team abbreviation to search.',
+                    optionHeight=25,
+                    className='mt-1 mb-3',
+                    value=default_players,
+                    clearable=False
+                )
+            ],
+            width=4,
+            className='offset-md-2'
+        )
+    ]),
+
+    # Plate Appearance Slider
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.P('Please select the minimum number of plate appearances a player needs to be listed.',className='text-center text-dark fs-5 mt-3'),
+                dcc.Slider(
+                    id='batter_pa_threshold',
+                    min=0,
+                    max=750,
+                    step=10,
+                    value=qualified_pa,
+                    marks=pa_marks(qualified_pa),
+                    tooltip=dict(placement='bottom'),
+                    className='mt-1 mb-3'
+                )
+            ],
+            width=10,
+            className='offset-md-1'
+        )
+    ]),
+
+    # Percentile Ordering and Filtering
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.P('Please choose how the bars are ordered.',className='text-center text-dark fs-5 mt-3'),
+                dcc.RadioItems(
+                    id='batter_bar_order',
+                    options=[dict(label=' Value',value='value'),dict(label=' Percentile',value='percentile')],
+                    value='value',
+                    inline=True,
+                    inputClassName='ms-3',
+                    className='text-center text-dark fs-6 mt-1 mb-3'
+                )
+            ],
+            width=4,
+            className='offset-md-1'
+        ),
+        dbc.Col(
+            children=[
+                html.P('Please select the minimum percentile a player needs to be charted.',className='text-center text-dark fs-5 mt-3'),
+                dcc.Slider(
+                    id='batter_min_percentile',
+                    min=0,
+                    max=100,
+                    step=5,
+                    value=0,
+                    marks={0:'0',25:'25th',50:'50th',75:'75th',100:'100th'},
+                    tooltip=dict(placement='bottom'),
+                    className='mt-1 mb-3'
+                )
+            ],
+            width=4,
+            className='offset-md-2'
+        )
+    ]),
+
+    # Similar Players
+    html.H3('Find Similar Players', className='text-primary text-center fs-2 mt-5 mb-0'),
+    html.P("Pick one of the players charted above to find the players whose seasons look the most like theirs. Choose the statistical measures that matter to you and how much each one counts; players are compared by how far apart they sit from the league average in each measure. Add the matches to the bar chart with one click.",className='text-center text-dark mb-0 mt-2 fs-6'),
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.P('Please select a charted player.',className='text-center text-dark fs-5 mt-3'),
+                dcc.Dropdown(
+                    id='similar_player',
+                    options=[
+                        dict(label=x,value=x) for x in default_players
+                    ],
+                    value=default_players[0],
                     optionHeight=25,
                     className='mt-1 mb-3',
-                    value=['Aaron Judge (NYY)'],
                     clearable=False
+                ),
+                html.P('Please select the statistical measures to compare.',className='text-center text-dark fs-5 mt-3'),
+                dcc.Dropdown(
+                    id='similar_stats',
+                    options=[
+                        dict(label=x,value=x) for x in similar_stat_list
+                    ],
+                    value=default_similar_stats,
+                    multi=True,
+                    optionHeight=25,
+                    className='mt-1 mb-3'
+                ),
+                html.P('Please select how many similar players to find.',className='text-center text-dark fs-5 mt-3'),
+                dcc.Slider(
+                    id='similar_count',
+                    min=1,
+                    max=15,
+                    step=1,
+                    value=5,
+                    marks={1:'1',5:'5',10:'10',15:'15'},
+                    tooltip=dict(placement='bottom'),
+                    className='mt-1 mb-3'
+                )
+            ],
+            width=4,
+            className='offset-md-1'
+        ),
+        dbc.Col(
+            children=[
+                html.P('Please weight each statistical measure.',className='text-center text-dark fs-5 mt-3'),
+                html.Div(id='similar_weights')
+            ],
+            width=4,
+            className='offset-md-2'
+        )
+    ]),
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.Div(id='similar_results',className='text-center text-dark fs-6 mt-3'),
+                dcc.Store(id='similar_labels',data=[]),
+                html.Div(
+                    dbc.Button('Add Similar Players to the Bar Chart',id='similar_add',color='primary',className='mt-2 mb-3'),
+                    className='text-center'
+                )
+            ],
+            width=10,
+            className='offset-md-1'
+        )
+    ]),
+
+    # Batter Trends
+    html.H3('Batter Rolling Trends', className='text-primary text-center fs-2 mt-5 mb-0'),
+    html.P("Hot streak or cold spell? This chart follows the players charted above game by game, averaging each statistical measure over their last 7, 15 or 30 games. A point only appears once a player has played enough games to fill the window.",className='text-center text-dark mb-0 mt-2 fs-6'),
+    dbc.Row([
+        dbc.Col(
+            children=[
+                dcc.Graph(
+                    id='batter_trend_chart',
+                    className='m-4',
+                    config=dict(displayModeBar=False),
+                )
+            ],
+            width=10,
+            className='offset-md-1'
+        )
+    ]),
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.P('Please select a statistical measure to follow.',className='text-center text-dark fs-5 mt-3'),
+                dcc.Dropdown(
+                    id='batter_trend_stat',
+                    options=[
+                        dict(label=x,value=x) for x in TREND_STATS
+                    ],
+                    value='On-Base Plus Slugging (OPS)',
+                    optionHeight=25,
+                    className='mt-1 mb-3',
+                    clearable=False
+                )
+            ],
+            width=4,
+            className='offset-md-1'
+        ),
+        dbc.Col(
+            children=[
+                html.P('Please choose the rolling window.',className='text-center text-dark fs-5 mt-3'),
+                dcc.RadioItems(
+                    id='batter_trend_window',
+                    options=[dict(label=' {} Games'.format(x),value=x) for x in TREND_WINDOWS],
+                    value=15,
+                    inline=True,
+                    inputClassName='ms-3',
+                    className='text-center text-dark fs-6 mt-1 mb-3'
+                )
+            ],
+            width=4,
+            className='offset-md-2'
+        )
+    ]),
+
+    # Batter Heatmaps
+    html.H3('Batter Heatmap', className='text-primary text-center fs-2 mt-5 mb-0'),
+    html.P("Pick one of the players charted above to see where their batted balls landed or which pitches they saw. Each chart sums every Statcast pitch into a grid on the server, so it loads just as quickly for a full season as for a single week.",className='text-center text-dark mb-0 mt-2 fs-6'),
+    dbc.Row([
+        dbc.Col(
+            children=[
+                dcc.Graph(
+                    id='batter_heatmap',
+                    className='m-4',
+                    config=dict(displayModeBar=False),
+                )
+            ],
+            width=6,
+            className='offset-md-3'
+        )
+    ]),
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.P('Please select a charted player.',className='text-center text-dark fs-5 mt-3'),
+                dcc.Dropdown(
+                    id='batter_heatmap_player',
+                    options=[
+                        dict(label=x,value=x) for x in default_players
+                    ],
+                    value=default_players[0],
+                    optionHeight=25,
+                    className='mt-1 mb-3',
+                    clearable=False
+                ),
+                dcc.RadioItems(
+                    id='batter_heatmap_kind',
+                    options=[dict(label=' Spray Chart',value='spray'),dict(label=' Pitch Location',value='location')],
+                    value='spray',
+                    inline=True,
+                    inputClassName='ms-3',
+                    className='text-center text-dark fs-6 mt-1 mb-3'
+                )
+            ],
+            width=4,
+            className='offset-md-1'
+        ),
+        dbc.Col(
+            children=[
+                html.P('Please filter by pitch type and pitcher hand.',className='text-center text-dark fs-5 mt-3'),
+                dcc.Dropdown(
+                    id='batter_heatmap_pitch_types',
+                    options=[
+                        dict(label=label,value=value) for value,label in PITCH_TYPES.items()
+                    ],
+                    value=[],
+                    multi=True,
+                    placeholder='All pitch types',
+                    optionHeight=25,
+                    className='mt-1 mb-3'
+                ),
+                dcc.RadioItems(
+                    id='batter_heatmap_hand',
+                    options=[dict(label=' All Pitchers',value=''),dict(label=' vs. LHP',value='L'),dict(label=' vs. RHP',value='R')],
+                    value='',
+                    inline=True,
+                    inputClassName='ms-3',
+                    className='text-center text-dark fs-6 mt-1 mb-3'
                 )
             ],
             width=4,
@@ -150,214 +402,222 @@ layout=dbc.Container(
     fluid=True
 )
 
+# Section for the Qualifying Cutoff Callback
+@callback(
+    Output('batter_pa_threshold','value'),
+    Output('batter_pa_threshold','marks'),
+    Input('season_choice','value'),
+)
+
+def pa_threshold(seasons):
+    # The cutoff is prorated by team games played, so it moves with the selected seasons
+    minimum_pa=lowest_qualifying_minimum('player_batting',seasons)
+    return minimum_pa,pa_marks(minimum_pa)
+
+# Section for the Player Search Callback
+@callback(
+    Output('player_dropdown','options'),
+    Input('player_dropdown','search_value'),
+    Input('season_choice','value'),
+    Input('batter_pa_threshold','value'),
+    Input('player_dropdown','value'),
+)
+
+def player_options(search_value,seasons,minimum_pa,list_of_players):
+    # Only the best matches are sent, plus the players already selected
+    selected_players=list(list_of_players or [])
+    matches=search_labels('player_batting',search_value,seasons,minimum_pa)
+    return [dict(label=x,value=x) for x in selected_players+[x for x in matches if x not in selected_players]]
+
 # Section for the Callback
 @callback(
     Output('batter_chart','figure'),
     Input('batter_stat_choice','value'),
     Input('player_dropdown','value'),
+    Input('season_choice','value'),
+    Input('batter_bar_order','value'),
+    Input('batter_min_percentile','value'),
 )
 
-def charts(stat_selection1,list_of_players):
+def charts(stat_selection1,list_of_players,seasons,bar_order,min_percentile):
     if len(stat_selection1)==0:
-        stat_selection1 = ['Home Runs (HR)']
+        stat_selection1 = 'Home Runs (HR)'
 
     if len(list_of_players)==0:
         list_of_players = ['Aaron Judge (NYY)']
 
-    # Making Batting Data Subset
-    batting_data_subset=batting_data.loc[list_of_players,stat_selection1].copy().reset_index()
+    return cached_figure('player_batting',stat_selection1,list_of_players,seasons,lambda: batting_chart(stat_selection1,list_of_players,seasons,bar_order,min_percentile),options=[bar_order,min_percentile,qualifying_minimums('player_batting',seasons)])
+
+# Building the Batting Chart on a Cache Miss
+def batting_chart(stat_selection1,list_of_players,seasons,bar_order,min_percentile):
+    # Making Batting Data Subset for the Selected Players, Ranked Against the Qualified Batters
+    with timed('subset'):
+        batting_data_subset=season_rows('player_batting',list_of_players,stat_selection1,seasons)
+        batting_data_subset=rank_rows('player_batting',batting_data_subset,stat_selection1,min_percentile)
+        batting_order=batting_data_subset.sort_values('Percentile')['Name (Team)'].tolist() if bar_order=='percentile' else None
 
     # Batting Chart
-    batting_figure=px.bar(
-        batting_data_subset,
-        x=stat_selection1,
-        y='Name (Team)',
-        orientation='h',
-        text_auto=True,
-        title=' ',
-        color='Name (Team)',
-        color_discrete_map={
-            'Aaron Judge (NYY)':'#003087',
-            'Manny Machado (SDP)':'#2F241D',
-            'Nolan Arenado (STL)':'#C41E3A',
-            'Paul Goldschmidt (STL)':'#C41E3A',
-            'Freddie Freeman (LAD)':'#005A9C',
-            'Francisco Lindor (NYM)':'#002D72',
-            'Yordan Alvarez (HOU)':'#002D62',
-            'Jose Altuve (HOU)':'#002D62',
-            'Mookie Betts (LAD)':'#005A9C',
-            'J.T. Realmuto (PHI)':'#E81828',
-            'Dansby Swanson (ATL)':'#13274F',
-            'Trea Turner (LAD)':'#005A9C',
-            'Jose Ramirez (CLE)':'#00385D',
-            'Andres Gimenez (CLE)':'#00385D',
-            'Xander Bogaerts (BOS)':'#BD3039',
-            'Jeff McNeil (NYM)':'#002D72',
-            'Tommy Edman (STL)':'#C41E3A',
-            'Austin Riley (ATL)':'#13274F',
-            'Alex Bregman (HOU)':'#002D62',
-            'Julio Rodriguez (SEA)':'#0C2C56',
-            'Brandon Nimmo (NYM)':'#002D72',
-            'Sean Murphy (OAK)':'#003831',
-            'Rafael Devers (BOS)':'#BD3039',
-            'Kyle Tucker (HOU)':'#002D62',
-            'Willy Adames (MIL)':'#12284B',
-            'Daulton Varsho (ARI)':'#A71930',
-            'Bo Bichette (TOR)':'#134A8E',
-            'Corey Seager (TEX)':'#003278',
-            'Carlos Correa (MIN)':'#002B5C',
-            'Steven Kwan (CLE)':'#00385D',
-            'George Springer (TOR)':'#134A8E',
-            'Marcus Semien (TEX)':'#003278',
-            'Christian Walker (ARI)':'#A71930',
-            'Eugenio Suarez (SEA)':'#0C2C56',
-            'Matt Chapman (TOR)':'#134A8E',
-            'Jake Cronenworth (SDP)':'#2F241D',
-            'Pete Alonso (NYM)':'#002D72',
-            'Nico Hoerner (CHC)':'#0E3386',
-            'Taylor Ward (LAA)':'#BA0021',
-            'Jose Abreu (CHW)':'#27251F',
-            'Will Smith (LAD)':'#005A9C',
-            'Shohei Ohtani (LAA)':'#BA0021',
-            'Juan Soto (- - -)':'#c0c0c0',
-            'Yandy Diaz (TBR)':'#092C5C',
-            'Alejandro Kirk (TOR)':'#134A8E',
-            'Adolis Garcia (TEX)':'#003278',
-            'Ha-seong Kim (SDP)':'#2F241D',
-            'Ian Happ (CHC)':'#0E3386',
-            'Cedric Mullins II (BAL)':'#DF4601',
-            'Elvis Andrus (- - -)':'#c0c0c0',
-            'Jeremy Pena (HOU)':'#002D62',
-            'Luis Arraez (MIN)':'#002B5C',
-            'Matt Olson (ATL)':'#13274F',
-            'Nathaniel Lowe (TEX)':'#003278',
-            'Starling Marte (NYM)':'#002D72',
-            'Brandon Drury (- - -)':'#c0c0c0',
-            'Ryan McMahon (COL)':'#333366',
-            'DJ LeMahieu (NYY)':'#003087',
-            "Ke'Bryan Hayes (PIT)":'#FDB827',
-            'Vladimir Guerrero Jr. (TOR)':'#134A8E',
-            'Bryan Reynolds (PIT)':'#FDB827',
-            'Randy Arozarena (TBR)':'#092C5C',
-            'Andrew Benintendi (- - -)':'#c0c0c0',
-            'Mark Canha (NYM)':'#002D72',
-            'Gleyber Torres (NYY)':'#003087',
-            'Jorge Mateo (BAL)':'#DF4601',
-            'Josh Rojas (ARI)':'#A71930',
-            'Thairo Estrada (SFG)':'#FD5A1E',
-            'Kyle Schwarber (PHI)':'#E81828',
-            'Teoscar Hernandez (TOR)':'#134A8E',
-            'Hunter Renfroe (MIL)':'#12284B',
-            'Anthony Santander (BAL)':'#DF4601',
-            'Jurickson Profar (SDP)':'#2F241D',
-            'Anthony Rizzo (NYY)':'#003087',
-            'Justin Turner (LAD)':'#005A9C',
-            'Ty France (SEA)':'#0C2C56',
-            'Gio Urshela (MIN)':'#002B5C',
-            'Amed Rosario (CLE)':'#00385D',
-            'Max Muncy (LAD)':'#005A9C',
-            'Eduardo Escobar (NYM)':'#002D72',
-            'Bobby Witt Jr. (KCR)':'#004687',
-            'Rhys Hoskins (PHI)':'#E81828',
-            'Christian Yelich (MIL)':'#12284B',
-            'Ronald Acuna Jr. (ATL)':'#13274F',
-            'Mike Yastrzemski (SFG)':'#FD5A1E',
-            'Trent Grisham (SDP)':'#2F241D',
-            'J.P. Crawford (SEA)':'#0C2C56',
-            'Javier Baez (DET)':'#0C2340',
-            'Josh Bell (- - -)':'#c0c0c0',
-            'Myles Straw (CLE)':'#00385D',
-            'Seth Brown (OAK)':'#003831',
-            'Cody Bellinger (LAD)':'#005A9C',
-            'Brendan Rodgers (COL)':'#333366',
-            'Ryan Mountcastle (BAL)':'#DF4601',
-            'Luis Rengifo (LAA)':'#BA0021',
-            'Josh Donaldson (NYY)':'#003087',
-            'Austin Hays (BAL)':'#DF4601',
-            'Alec Bohm (PHI)':'#E81828',
-            'Whit Merrifield (- - -)':'#c0c0c0',
-            'Tony Kemp (OAK)':'#003831',
-            'Jonathan Schoop (DET)':'#0C2340',
-            'Ketel Marte (ARI)':'#A71930',
-            'Wilmer Flores (SFG)':'#FD5A1E',
-            'Kyle Farmer (CIN)':'#C6011F',
-            'Isiah Kiner-Falefa (NYY)':'#003087',
-            'C.J. Cron (COL)':'#333366',
-            'Alex Verdugo (BOS)':'#BD3039',
-            'Miguel Rojas (MIA)':'#000000',
-            'Lane Thomas (WSN)':'#AB0003',
-            'Adam Frazier (SEA)':'#0C2C56',
-            'J.D. Martinez (BOS)':'#BD3039',
-            'Patrick Wisdom (CHC)':'#0E3386',
-            'Carlos Santana (- - -)':'#c0c0c0',
-            'Trey Mancini (- - -)':'#c0c0c0',
-            'Rowdy Tellez (MIL)':'#12284B',
-            'Tommy Pham (- - -)':'#c0c0c0',
-            'Jesse Winker (SEA)':'#0C2C56',
-            'A.J. Pollock (CHW)':'#27251F',
-            'Cesar Hernandez (WSN)':'#AB0003',
-            'Andrew McCutchen (MIL)':'#12284B',
-            'Luke Voit (- - -)':'#c0c0c0',
-            'Charlie Blackmon (COL)':'#333366',
-            'Randal Grichuk (COL)':'#333366',
-            'MJ Melendez (KCR)':'#004687',
-            'Jesus Aguilar (- - -)':'#c0c0c0',
-            'Andrew Vaughn (CHW)':'#27251F',
-            'Marcell Ozuna (ATL)':'#13274F',
-            'Nick Castellanos (PHI)':'#E81828',
-            'Nelson Cruz (WSN)':'#AB0003',
-            'Yuli Gurriel (HOU)':'#002D62'
-        }
-    )
+    with timed('build'):
+        return bar_figure(
+            batting_template,
+            batting_data_subset['Name (Team)'].tolist(),
+            display_values(batting_data_subset[stat_selection1]),
+            team_colors(batting_data_subset['Team']),
+            stat_selection1,
+            'Name (Team)',
+            marker_line_width=0.5,
+            notes=batting_data_subset['Note'].tolist(),
+            order=batting_order
+        )
 
-    batting_figure.update_xaxes(
-        title_font={
-        'size': 18,
-        'color': 'black'
-        },
-        tickfont=dict(
-            size=14,
-            color='black'
-        ),
-        showgrid=True,
-        gridwidth=1,
-        gridcolor='black',
-        showline=True,
-        linewidth=1,
-        linecolor='black'
-    )
+# Section for the Data Age Callback
+@callback(
+    Output('batter_data_age','children'),
+    Input('season_choice','value'),
+)
 
-    batting_figure.update_yaxes(
-        title_text='Player(s) (Team Abbreviation)',
-        title_font={
-        'size': 18,
-        'color': 'black'
-        },
-        tickfont=dict(
-            size=14,
-            color='black'
-        ),
-        showline=True,
-        linewidth=1,
-        linecolor='black',
-        categoryorder='total ascending'
-    )
+def data_age(seasons):
+    return data_age_text('player_batting',seasons)
 
-    batting_figure.update_layout(
-        title_font={
-        'size': 24,
-        'color': 'black'
-        },
-        title_x=0.5,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        margin=dict(l=0,r=0,t=0,b=0),
-        showlegend=False,
-    )
+# Section for the Charted Player Options Callback
+@callback(
+    Output('batter_heatmap_player','options'),
+    Output('batter_heatmap_player','value'),
+    Output('similar_player','options'),
+    Output('similar_player','value'),
+    Input('player_dropdown','value'),
+    State('batter_heatmap_player','value'),
+    State('similar_player','value'),
+)
+
+def charted_players(list_of_players,heatmap_player,similar_player):
+    list_of_players=list_of_players or default_players
+    charted_options=[dict(label=x,value=x) for x in list_of_players]
+    # Keeping the chosen players while they are still charted
+    if heatmap_player not in list_of_players:
+        heatmap_player=list_of_players[0]
+    if similar_player not in list_of_players:
+        similar_player=list_of_players[0]
+    return charted_options,heatmap_player,charted_options,similar_player
 
-    batting_figure.update_traces(
-        marker_line_color='black',
-        marker_line_width=0.5,
-        textfont_size=14
+# Section for the Heatmap Callback
+@callback(
+    Output('batter_heatmap','figure'),
+    Input('batter_heatmap_player','value'),
+    Input('batter_heatmap_kind','value'),
+    Input('batter_heatmap_pitch_types','value'),
+    Input('batter_heatmap_hand','value'),
+    Input('season_choice','value'),
 )
-    return batting_figure
+
+def heatmap(heatmap_player,kind,pitch_types,hand,seasons):
+    return cached_heatmap(kind,'batter',heatmap_player or default_players[0],seasons,pitch_types,hand)
+
+# Section for the Trend Callback
+@callback(
+    Output('batter_trend_chart','figure'),
+    Input('batter_trend_stat','value'),
+    Input('batter_trend_window','value'),
+    Input('player_dropdown','value'),
+    Input('season_choice','value'),
+)
+
+def trends(trend_stat,window,list_of_players,seasons):
+    list_of_players=list_of_players or default_players
+
+    return cached_figure('player_batting',trend_stat,list_of_players,seasons,lambda: trend_chart(trend_stat,window,list_of_players,seasons),options=['trend',window],version=trends_version(seasons))
+
+# Building the Trend Chart on a Cache Miss
+def trend_chart(trend_stat,window,list_of_players,seasons):
+    # Slicing Each Player's Precomputed Rolling Values
+    with timed('subset'):
+        trend_data=trend_series(list_of_players,trend_stat,window,seasons)
+
+    # Trend Chart
+    with timed('build'):
+        return line_figure(
+            trend_template,
+            [(label,dates.tolist(),display_values(values)) for label,team,dates,values in trend_data],
+            team_colors([team or '' for label,team,dates,values in trend_data]),
+            trend_stat
+        )
+
+# Section for the Similarity Weights Callback
+@callback(
+    Output('similar_weights','children'),
+    Input('similar_stats','value'),
+    State({'type':'similar_weight','index':ALL},'value'),
+    State({'type':'similar_weight','index':ALL},'id'),
+)
+
+def similarity_weights(similar_stats,weights,weight_ids):
+    # Keeping the weights already set for stats that stay selected
+    current={x['index']:weight for x,weight in zip(weight_ids,weights)}
+    return [
+        html.Div(
+            children=[
+                html.P(x,className='text-center text-dark fs-6 mb-0'),
+                dcc.Slider(
+                    id={'type':'similar_weight','index':x},
+                    min=0,
+                    max=3,
+                    step=0.5,
+                    value=current.get(x,1),
+                    marks={0:'Off',1:'1x',2:'2x',3:'3x'},
+                    className='mt-1 mb-2'
+                )
+            ]
+        ) for x in similar_stats or []
+    ]
+
+# Section for the Similar Players Callback
+@callback(
+    Output('similar_results','children'),
+    Output('similar_labels','data'),
+    Input('similar_player','value'),
+    Input({'type':'similar_weight','index':ALL},'value'),
+    Input('similar_count','value'),
+    Input('season_choice','value'),
+    Input('batter_pa_threshold','value'),
+    State({'type':'similar_weight','index':ALL},'id'),
+)
+
+def similar(similar_player,weights,count,seasons,minimum_pa,weight_ids):
+    stat_weights={x['index']:weight for x,weight in zip(weight_ids,weights) if weight}
+    if not stat_weights:
+        return html.P('Please select at least one statistical measure with a weight above zero.',className='mb-0'),[]
+
+    with timed('subset'):
+        matches=similar_players('player_batting',similar_player,stat_weights,seasons,minimum_pa,count)
+    if not matches:
+        return html.P('No similar players were found for {} in the selected season(s).'.format(similar_player),className='mb-0'),[]
+
+    results=[html.P('Most similar to {}:'.format(similar_player),className='fs-5 mb-1')]
+    results+=[html.P('{}. {} ({:.2f} standard deviations apart on average)'.format(position,x['display'],x['distance']),className='mb-0') for position,x in enumerate(matches,1)]
+    return results,[x['label'] for x in matches]
+
+# Section for the Add Similar Players Callback
+@callback(
+    Output('player_dropdown','value'),
+    Input('similar_add','n_clicks'),
+    State('similar_labels','data'),
+    State('player_dropdown','value'),
+    prevent_initial_call=True,
+)
+
+def add_similar(n_clicks,similar_labels,list_of_players):
+    list_of_players=list(list_of_players or [])
+    return list_of_players+[x for x in similar_labels if x not in list_of_players]
+
+# Section for the Download Links Callback
+@callback(
+    [Output('batter_export_{}'.format(x),'href') for x in EXPORT_FORMATS],
+    Input('batter_stat_choice','value'),
+    Input('player_dropdown','value'),
+    Input('season_choice','value'),
+    Input('batter_export_scope','value'),
+)
+
+def export_hrefs(stat_selection1,list_of_players,seasons,scope):
+    # The links name the same data the chart was just drawn from
+    return export_links('player_batting',seasons,list_of_players or default_players,[stat_selection1 or 'Home Runs (HR)'],None,scope)
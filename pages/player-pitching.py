@@ -1,52 +1,30 @@
 
-import pandas as pd
-import plotly.express as px
 import dash
 from dash import Dash, html, dcc, Input, Output, State, callback
 import dash_bootstrap_components as dbc
-from pybaseball import pitching_stats
+from mlb.datasets import DATASETS, data_age_text, lowest_qualifying_minimum, season_arrays, stat_names
+from mlb.compact import display_values
+from mlb.export import EXPORT_FORMATS, export_links
+from mlb.figure_cache import cached_figure
+from mlb.instrumentation import timed
+from mlb.figures import scatter_figure, scatter_template
+from mlb.heatmaps import PITCH_TYPES, cached_heatmap
+from mlb.teams import team_colors
 
-# Creating Pitching Stats Dataframe
-pitching_data_2022=pitching_stats(2022)
-pitching_data=pitching_data_2022[['Season','Name','Team','W','L','G','IP','TBF','H','R','ER','HR','BB','HBP','SO','K/9','BB/9','K/BB','AVG','ERA','WHIP','BABIP','FIP','WAR']].copy()
-pitching_data.rename(
-    columns={
-        'W':'Wins (W)',
-        'L':'Losses (L)',
-        'G':'Games Played (G)',
-        'IP':'Innings Pitched (IP)',
-        'TBF':'Total Batters Faced (TBF)',
-        'H':'Hits (H)',
-        'R':'Runs Scored Against (R)',
-        'ER':'Earned Runs (ER)',
-        'HR':'Home Runs Allowed (HR)',
-        'BB':'Walks (BB)',
-        'HBP':'Batters Hit By Pitches (HBP)',
-        'SO':'Strikeouts (SO)',
-        'K/9':'Number of Strikeouts Per 9 Innings (K/9)',
-        'BB/9':'Number of Walks Per 9 Innings (BB/9)',
-        'K/BB':'Strikeout to Walk Ratio (K/BB)',
-        'AVG':"Opponents' Batting Average (AVG)",
-        'ERA':'Earned Run Average (ERA)',
-        'WHIP':'Walks And Hits Per Inning Pitched (WHIP)',
-        'BABIP':'Batting Average on Balls in Play (BABIP)',
-        'FIP':'Fielding Independent Pitching (FIP)',
-        'WAR':'Wins Above Replacement (WAR)'
-    },
-    inplace=True
-)
-pitching_data.loc[:,('Season')]
-
-# Creating and Setting an Index
-pitching_data['Name (Team)'] = pitching_data['Name'] + ' (' + pitching_data['Team'] + ')'
-pitching_data.loc[:,('Name (Team)')]
-pitching_data.set_index('Name (Team)',inplace=True)
+# Innings Needed for the Pitching Awards Over a Full Season
+qualified_ip=DATASETS['player_pitching']['qualified']
 
-# Removing Batting Dataframe Columns
-pitching_data.drop(columns=['Season','Name','Team'],inplace=True)
+def ip_marks(minimum_ip):
+    marks={x:str(x) for x in range(0,251,50) if abs(x-minimum_ip)>=25}
+    marks[minimum_ip]='Qualified ({})'.format(minimum_ip)
+    return marks
 
 # Sorting a List for Dashboard Components
-pitching_stat_list=[x for x in pitching_data.columns]
+pitching_stat_list=stat_names('player_pitching')
+default_pitcher='Gerrit Cole (NYY)'
+
+# Building the Chart Template Once
+pitching_template=scatter_template()
 
 # Registering the Pitching Page
 dash.register_page(__name__)
@@ -55,8 +33,8 @@ dash.register_page(__name__)
 layout=dbc.Container(
     children=[
     # Title and Dashboard Explanation
-    html.H1('MLB Player Pitching Results (2022 Season)',className='text-center text-danger mt-3 mb-2 fs-1'),
-    html.P("This page is the destination for reviewing MLB pitchers' results from the 2022 MLB Season! Included in the chart below is more than 20 statistical measures that determine how pitchers performed during play last season. Also included is 45 plotted points that represent the 45 MLB pitchers that qualified for 2022 MLB pitching awards. To qualify to be a pitcher on this graph, pitchers must have pitched at least 1 inning per game (or at least 162 innings during the entire season) last season. To make this scatter plot work, select two statistical measures (for both axes) that you'd like to use to compare pitchers with on this chart!",className='text-center text-dark mb-3 mt-2 fs-6'),
+    html.H1('MLB Player Pitching Results (2015-Present)',className='text-center text-danger mt-3 mb-2 fs-1'),
+    html.P("This page is the destination for reviewing MLB pitchers' results from any MLB season since 2015! Included in the chart below is more than 20 statistical measures that determine how pitchers performed during play each season. By default, the plotted points represent the roughly 45 MLB pitchers per season that qualified for that season's MLB pitching awards. To qualify for these awards, pitchers must have pitched at least 1 inning per game (or at least 162 innings during the entire season). During the season the cutoff is prorated by the games teams have played so far. Lower the innings pitched slider to plot the rest of the league's 800+ pitchers. To make this scatter plot work, select two statistical measures (for both axes) that you'd like to use to compare pitchers with on this chart! Select more than one season in the navigation bar to plot each pitcher's seasons side by side.",className='text-center text-dark mb-3 mt-2 fs-6'),
     html.H3('Player Pitching Data Scatter Plot', className='text-primary text-center fs-2 mt-3 mb-0'),
     # The Graph
     dbc.Row([
@@ -67,11 +45,32 @@ layout=dbc.Container(
                     className='m-4',
                     config=dict(displayModeBar=False),
                 ),
+                html.P(id='pitcher_data_age',className='text-center text-muted fs-6 mb-0'),
             ],
             width=10,
             className='offset-md-1'
         )
     ]),
+    # Download Buttons
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.Span('Download the data behind this chart:',className='text-dark fs-6 me-2'),
+                dcc.RadioItems(
+                    id='pitcher_export_scope',
+                    options=[dict(label=' Charted Rows',value='selection'),dict(label=' Full Table',value='full')],
+                    value='selection',
+                    inline=True,
+                    inputClassName='ms-3',
+                    className='d-inline-block text-dark fs-6 me-2'
+                ),
+            ]+[
+                dbc.Button(EXPORT_FORMATS[x]['label'],id='pitcher_export_{}'.format(x),href='',external_link=True,color='primary',outline=True,size='sm',className='ms-2') for x in EXPORT_FORMATS
+            ],
+            width=10,
+            className='offset-md-1 text-center mt-2'
+        )
+    ]),
     # User Commands
     dbc.Row([
         dbc.Col(
@@ -123,6 +122,87 @@ layout=dbc.Container(
         )
     ]),
 
+    # Innings Pitched Slider
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.P('Please select the minimum number of innings a pitcher needs to be plotted.',className='text-center text-dark fs-5 mt-3'),
+                dcc.Slider(
+                    id='pitcher_ip_threshold',
+                    min=0,
+                    max=250,
+                    step=5,
+                    value=qualified_ip,
+                    marks=ip_marks(qualified_ip),
+                    tooltip=dict(placement='bottom'),
+                    className='mt-1 mb-3'
+                )
+            ],
+            width=10,
+            className='offset-md-1'
+        )
+    ]),
+
+    # Pitcher Heatmaps
+    html.H3('Pitcher Heatmap', className='text-primary text-center fs-2 mt-5 mb-0'),
+    html.P("Click any pitcher on the scatter plot above to see where their pitches crossed the plate or where the balls put in play against them landed. Each chart sums every Statcast pitch into a grid on the server, so it loads just as quickly for a full season as for a single week.",className='text-center text-dark mb-0 mt-2 fs-6'),
+    dbc.Row([
+        dbc.Col(
+            children=[
+                dcc.Graph(
+                    id='pitcher_heatmap',
+                    className='m-4',
+                    config=dict(displayModeBar=False),
+                )
+            ],
+            width=6,
+            className='offset-md-3'
+        )
+    ]),
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.P('Please choose a chart and the batter hand.',className='text-center text-dark fs-5 mt-3'),
+                dcc.RadioItems(
+                    id='pitcher_heatmap_kind',
+                    options=[dict(label=' Pitch Location',value='location'),dict(label=' Spray Chart Allowed',value='spray')],
+                    value='location',
+                    inline=True,
+                    inputClassName='ms-3',
+                    className='text-center text-dark fs-6 mt-1 mb-3'
+                ),
+                dcc.RadioItems(
+                    id='pitcher_heatmap_hand',
+                    options=[dict(label=' All Batters',value=''),dict(label=' vs. LHB',value='L'),dict(label=' vs. RHB',value='R')],
+                    value='',
+                    inline=True,
+                    inputClassName='ms-3',
+                    className='text-center text-dark fs-6 mt-1 mb-3'
+                )
+            ],
+            width=4,
+            className='offset-md-1'
+        ),
+        dbc.Col(
+            children=[
+                html.P('Please filter by pitch type.',className='text-center text-dark fs-5 mt-3'),
+                dcc.Dropdown(
+                    id='pitcher_heatmap_pitch_types',
+                    options=[
+                        dict(label=label,value=value) for value,label in PITCH_TYPES.items()
+                    ],
+                    value=[],
+                    multi=True,
+                    placeholder='All pitch types',
+                    optionHeight=25,
+                    className='mt-1 mb-3'
+                )
+            ],
+            width=4,
+            className='offset-md-2'
+        )
+    ]),
+
     # Data Sources and Information
     html.Div(
         children=[
@@ -148,123 +228,85 @@ layout=dbc.Container(
     fluid=True
 )
 
+# Section for the Qualifying Cutoff Callback
+@callback(
+    Output('pitcher_ip_threshold','value'),
+    Output('pitcher_ip_threshold','marks'),
+    Input('season_choice','value'),
+)
+
+def ip_threshold(seasons):
+    # The cutoff is prorated by team games played, so it moves with the selected seasons
+    minimum_ip=lowest_qualifying_minimum('player_pitching',seasons)
+    return minimum_ip,ip_marks(minimum_ip)
+
 # Section for the Callback
 @callback(
     Output('pitcher_chart','figure'),
     Input('pitcher_stat_dropdown1','value'),
-    Input('pitcher_stat_dropdown2','value')
+    Input('pitcher_stat_dropdown2','value'),
+    Input('season_choice','value'),
+    Input('pitcher_ip_threshold','value')
 )
 
-def charts(stat_selection2,stat_selection3):
-        # Pitching Chart
-    pitching_figure=px.scatter(
-        pitching_data,
-        x=stat_selection2,
-        y=stat_selection3,
-        title=' ',
-        hover_name=pitching_data.index,
-        color=pitching_data.index,
-        color_discrete_map={
-            'Aaron Nola (PHI)':'#E81828',
-            'Carlos Rodon (SFG)':'#FD5A1E',
-            'Justin Verlander (HOU)':'#002D62',
-            'Sandy Alcantara (MIA)':'#000000',
-            'Kevin Gausman (TOR)':'#134A8E',
-            'Shohei Ohtani (LAA)':'#BA0021',
-            'Max Fried (ATL)':'#13274F',
-            'Shane Bieber (CLE)':'#00385D',
-            'Corbin Burnes (MIL)':'#12284B',
-            'Framber Valdez (HOU)':'#002D62',
-            'Dylan Cease (CHW)':'#27251F',
-            'Zac Gallen (ARI)':'#A71930',
-            'Yu Darvish (SDP)':'#2F241D',
-            'Logan Webb (SFG)':'#FD5A1E',
-            'Alek Manoah (TOR)':'#134A8E',
-            'Tyler Anderson (LAD)':'#005A9C',
-            'Jose Quintana (- - -)':'#c0c0c0',
-            'Martin Perez (TEX)':'#003278',
-            'Triston McKenzie (CLE)':'#00385D',
-            'Shane McClanahan (TBR)':'#092C5C',
-            'Joe Musgrove (SDP)':'#2F241D',
-            'Merrill Kelly (ARI)':'#A71930',
-            'Gerrit Cole (NYY)':'#003087',
-            'Julio Urias (LAD)':'#005A9C',
-            'Logan Gilbert (SEA)':'#0C2C56',
-            'Corey Kluber (TBR)':'#092C5C',
-            'Kyle Wright (ATL)':'#13274F',
-            'Miles Mikolas (STL)':'#C41E3A',
-            'Adam Wainwright (STL)':'#C41E3A',
-            'Pablo Lopez (MIA)':'#000000',
-            'Chris Bassitt (NYM)':'#002D72',
-            'Jordan Montgomery (- - -)':'#c0c0c0',
-            'Kyle Freeland (COL)':'#333366',
-            'Jameson Taillon (NYY)':'#003087',
-            'Cal Quantrill (CLE)':'#00385D',
-            'Robbie Ray (SEA)':'#0C2C56',
-            'Kyle Gibson (PHI)':'#E81828',
-            'Nick Pivetta (BOS)':'#BD3039',
-            'Charlie Morton (ATL)':'#13274F',
-            'Jordan Lyles (BAL)':'#DF4601',
-            'Cole Irvin (OAK)':'#003831',
-            'German Marquez (COL)':'#333366',
-            'Jose Urquidy (HOU)':'#002D62',
-            'Jose Berrios (TOR)':'#134A8E',
-            'Marco Gonzales (SEA)':'#0C2C56',
-        }
-    )
+def charts(stat_selection2,stat_selection3,seasons,minimum_ip):
+    if minimum_ip is None:
+        minimum_ip = lowest_qualifying_minimum('player_pitching',seasons)
 
-    pitching_figure.update_xaxes(
-        title_font={
-        'size': 18,
-        'color': 'black'
-        },
-        tickfont=dict(
-            size=14,
-            color='black'
-        ),
-        showgrid=True,
-        gridwidth=0.5,
-        gridcolor='black',
-        showline=True,
-        linewidth=1,
-        linecolor='black'
-    )
+    return cached_figure('player_pitching',[stat_selection2,stat_selection3],[],seasons,lambda: pitching_chart(stat_selection2,stat_selection3,seasons,minimum_ip),options=[minimum_ip])
 
-    pitching_figure.update_yaxes(
-        title_font={
-        'size': 18,
-        'color': 'black'
-        },
-        tickfont=dict(
-            size=14,
-            color='black'
-        ),
-        showline=True,
-        linewidth=1,
-        linecolor='black',
-        showgrid=True,
-        gridwidth=1,
-        gridcolor='black',
-    )
+# Building the Pitching Chart on a Cache Miss
+def pitching_chart(stat_selection2,stat_selection3,seasons,minimum_ip):
+    # Making Pitching Data Arrays
+    with timed('subset'):
+        pitcher_labels,pitching_arrays=season_arrays('player_pitching',[stat_selection2,stat_selection3,'Team'],seasons,minimum_ip)
 
-    pitching_figure.update_layout(
-        title_font={
-        'size': 24,
-        'color': 'black'
-        },
-        title_x=0.5,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        margin=dict(l=0,r=0,t=0,b=0),
-        showlegend=False,
-    )
+    # Pitching Chart
+    with timed('build'):
+        return scatter_figure(
+            pitching_template,
+            pitcher_labels,
+            display_values(pitching_arrays[stat_selection2]),
+            display_values(pitching_arrays[stat_selection3]),
+            team_colors(pitching_arrays['Team']),
+            stat_selection2,
+            stat_selection3
+        )
+
+# Section for the Data Age Callback
+@callback(
+    Output('pitcher_data_age','children'),
+    Input('season_choice','value'),
+)
+
+def data_age(seasons):
+    return data_age_text('player_pitching',seasons)
 
-    pitching_figure.update_traces(
-        # marker_color='red',
-        marker_size=11,
-        marker_line_color='black',
-        marker_line_width=1,
-        textfont_size=14
+# Section for the Heatmap Callback
+@callback(
+    Output('pitcher_heatmap','figure'),
+    Input('pitcher_chart','clickData'),
+    Input('pitcher_heatmap_kind','value'),
+    Input('pitcher_heatmap_pitch_types','value'),
+    Input('pitcher_heatmap_hand','value'),
+    Input('season_choice','value'),
+)
+
+def heatmap(click_data,kind,pitch_types,hand,seasons):
+    # The clicked point carries the pitcher's label as its hover text
+    pitcher=click_data['points'][0]['hovertext'] if click_data else default_pitcher
+    return cached_heatmap(kind,'pitcher',pitcher,seasons,pitch_types,hand)
+
+# Section for the Download Links Callback
+@callback(
+    [Output('pitcher_export_{}'.format(x),'href') for x in EXPORT_FORMATS],
+    Input('pitcher_stat_dropdown1','value'),
+    Input('pitcher_stat_dropdown2','value'),
+    Input('season_choice','value'),
+    Input('pitcher_ip_threshold','value'),
+    Input('pitcher_export_scope','value'),
 )
 
-    return pitching_figure
+def export_hrefs(stat_selection2,stat_selection3,seasons,minimum_ip,scope):
+    # The links name the same data the chart was just drawn from
+    return export_links('player_pitching',seasons,None,[stat_selection2,stat_selection3],lowest_qualifying_minimum('player_pitching',seasons) if minimum_ip is None else minimum_ip,scope)
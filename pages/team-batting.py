@@ -1,96 +1,22 @@
 
-import pandas as pd
-import plotly.express as px
 import dash
 from dash import Dash, html, dcc, Input, Output, State, callback
 import dash_bootstrap_components as dbc
-from pybaseball import team_batting
-
-# Creating Batting Stats Dataframe
-batting_data_2022=team_batting(2022)
-batting_data=batting_data_2022[['Season','Team','G','PA','H','1B','2B','3B','HR','R','RBI','SO','K%','BB','BB%','IBB','BB/K','HBP','SF','SH','SB','CS','AVG','OBP','SLG','OPS','BABIP','LD%','GB%','FB%','wOBA','wRC','WAR']].copy()
-batting_data['Team']=batting_data['Team'].replace(
-    {
-        'NYY':'New York Yankees',
-        'BOS':'Boston Red Sox',
-        'BAL':'Baltimore Orioles',
-        'TBR':'Tampa Bay Rays',
-        'TOR':'Toronto Blue Jays',
-        'CLE':'Cleveland Guardians',
-        'DET':'Detroit Tigers',
-        'KCR':'Kansas City Royals',
-        'MIN':'Minnesota Twins',
-        'CHW':'Chicago White Sox',
-        'HOU':'Houston Astros',
-        'OAK':'Oakland Athletics',
-        'LAA':'Los Angeles Angels',
-        'SEA':'Seattle Mariners',
-        'TEX':'Texas Rangers',
-        'NYM':'New York Mets',
-        'ATL':'Atlanta Braves',
-        'WSN':'Washington Nationals',
-        'PHI':'Philadelphia Phillies',
-        'MIA':'Miami Marlins',
-        'STL':'St. Louis Cardinals',
-        'CHC':'Chicago Cubs',
-        'PIT':'Pittsburgh Pirates',
-        'MIL':'Milwaukee Brewers',
-        'CIN':'Cincinnati Reds',
-        'SDP':'San Diego Padres',
-        'LAD':'Los Angeles Dodgers',
-        'SFG':'San Francisco Giants',
-        'ARI':'Arizona Diamondbacks',
-        'COL':'Colorado Rockies'
-    }
-)
-batting_data.rename(
-    columns={
-        'G': 'Games Played (G)',
-        'PA':'Plate Appearances (PA)',
-        'H':'Hits (H)',
-        '1B':'Singles (1B)',
-        '2B':'Doubles (2B)',
-        '3B':'Triples (3B)',
-        'HR':'Home Runs (HR)',
-        'R':'Runs Scored (R)',
-        'RBI':'Runs Batted In (RBI)',
-        'SO':'Strikeouts (SO)',
-        'K%':'Strikeout Percentage (K%)',
-        'BB':'Walks (BB)',
-        'BB%':'Walk Percentage (BB%)',
-        'IBB':'Intentional Walks (IBB)',
-        'BB/K':'Walk-to-Strikeout Ratio (BB/K)',
-        'HBP':'Hit By Pitches (HBP)',
-        'SF':'Sacrifice Flies (SF)',
-        'SH':'Sacrifice Hits (Bunts)',
-        'SB':'Stolen Bases',
-        'CS':'Caught Stealing (CS)',
-        'AVG':'Batting Average (AVG)',
-        'OBP':'On-Base Percentage (OBP)',
-        'SLG':'Slugging Percentage (SLG)',
-        'OPS':'On-Base Plus Slugging (OPS)',
-        'BABIP':'Batting Average on Balls in Play (BABIP)',
-        'LD%':'Line Drive Percentage (LD%)',
-        'GB%':'Ground Ball Percentage (GD%)',
-        'FB%':'Fly Ball Percentage (FB%)',
-        'wOBA':'Weighted On-Base Average (wOBA)',
-        'wRC':'Weighted Runs Created (wRC)',
-        'WAR':'Wins Above Replacement (WAR)'
-    },
-    inplace=True
-)
-batting_data.loc[:,('Season')]
-
-# Creating and Setting an Index
-batting_data.loc[:,('Team')]
-batting_data.set_index('Team',inplace=True)
-
-# Removing Batting Dataframe Column
-batting_data.drop(columns=['Season'],inplace=True)
+from mlb.datasets import data_age_text, season_rows, stat_names
+from mlb.compact import display_values
+from mlb.export import EXPORT_FORMATS, export_links
+from mlb.figure_cache import cached_figure
+from mlb.instrumentation import timed
+from mlb.ranks import rank_rows
+from mlb.figures import bar_figure, bar_template
+from mlb.teams import TEAM_NAME_LIST, team_colors
 
 # Sorting Lists for Dashboard Components
-batting_stat_list=[x for x in batting_data.columns]
-batting_team_list=[x for x in batting_data.index]
+batting_stat_list=stat_names('team_batting')
+batting_team_list=TEAM_NAME_LIST
+
+# Building the Chart Template Once
+team_batting_template=bar_template('Team(s)')
 
 # Registering the Team Batting Page
 dash.register_page(__name__)
@@ -99,8 +25,8 @@ dash.register_page(__name__)
 layout=dbc.Container(
     children=[
     # Title and Dashboard Explanation
-    html.H1('MLB Team Batting Results (2022 Season)',className='text-center text-danger mt-3 mb-2 fs-1'),
-    html.P("You want batting data sorted by teams? You got it! Inside this page is a bar chart that includes more than 30 different statistical measures and all 30 MLB teams' seasonal batting data from the 2022 campaign. All that's needed to make this chart work is to have a statistical measure and MLB team(s) selected to compare with the statistical measure.",className='text-center text-dark mb-3 mt-2 fs-6'),
+    html.H1('MLB Team Batting Results (2015-Present)',className='text-center text-danger mt-3 mb-2 fs-1'),
+    html.P("You want batting data sorted by teams? You got it! Inside this page is a bar chart that includes more than 30 different statistical measures and all 30 MLB teams' seasonal batting data from every campaign since 2015. All that's needed to make this chart work is to have a statistical measure and MLB team(s) selected to compare with the statistical measure. Choose more than one season in the navigation bar to see how a team's offense changed from one year to the next.",className='text-center text-dark mb-3 mt-2 fs-6'),
     html.H3('Team Batting Data Bar Chart', className='text-primary text-center fs-2 mt-3 mb-0'),
     # The Graph
     dbc.Row([
@@ -111,11 +37,32 @@ layout=dbc.Container(
                     className='m-4',
                     config=dict(displayModeBar=False),
                 ),
+                html.P(id='team_batting_data_age',className='text-center text-muted fs-6 mb-0'),
             ],
             width=10,
             className='offset-md-1'
         )
     ]),
+    # Download Buttons
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.Span('Download the data behind this chart:',className='text-dark fs-6 me-2'),
+                dcc.RadioItems(
+                    id='team_batting_export_scope',
+                    options=[dict(label=' Charted Rows',value='selection'),dict(label=' Full Table',value='full')],
+                    value='selection',
+                    inline=True,
+                    inputClassName='ms-3',
+                    className='d-inline-block text-dark fs-6 me-2'
+                ),
+            ]+[
+                dbc.Button(EXPORT_FORMATS[x]['label'],id='team_batting_export_{}'.format(x),href='',external_link=True,color='primary',outline=True,size='sm',className='ms-2') for x in EXPORT_FORMATS
+            ],
+            width=10,
+            className='offset-md-1 text-center mt-2'
+        )
+    ]),
     # User Commands
     dbc.Row([
         dbc.Col(
@@ -169,6 +116,42 @@ layout=dbc.Container(
         )
     ]),
 
+    # Percentile Ordering and Filtering
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.P('Please choose how the bars are ordered.',className='text-center text-dark fs-5 mt-3'),
+                dcc.RadioItems(
+                    id='team_batting_bar_order',
+                    options=[dict(label=' Value',value='value'),dict(label=' Percentile',value='percentile')],
+                    value='value',
+                    inline=True,
+                    inputClassName='ms-3',
+                    className='text-center text-dark fs-6 mt-1 mb-3'
+                )
+            ],
+            width=4,
+            className='offset-md-1'
+        ),
+        dbc.Col(
+            children=[
+                html.P('Please select the minimum percentile a team needs to be charted.',className='text-center text-dark fs-5 mt-3'),
+                dcc.Slider(
+                    id='team_batting_min_percentile',
+                    min=0,
+                    max=100,
+                    step=5,
+                    value=0,
+                    marks={0:'0',25:'25th',50:'50th',75:'75th',100:'100th'},
+                    tooltip=dict(placement='bottom'),
+                    className='mt-1 mb-3'
+                )
+            ],
+            width=4,
+            className='offset-md-2'
+        )
+    ]),
+
     # Data Sources and Information
     html.Div(
         children=[
@@ -199,107 +182,59 @@ layout=dbc.Container(
     Output('team_batting_chart','figure'),
     Input('team_batting_stat_choice','value'),
     Input('team_dropdown','value'),
+    Input('season_choice','value'),
+    Input('team_batting_bar_order','value'),
+    Input('team_batting_min_percentile','value'),
 )
 
-def charts(stat_selection4,list_of_teams):
+def charts(stat_selection4,list_of_teams,seasons,bar_order,min_percentile):
     if len(stat_selection4)==0:
-        stat_selection4 = ['Home Runs (HR)']
+        stat_selection4 = 'Home Runs (HR)'
 
     if len(list_of_teams)==0:
         list_of_teams = ['Houston Astros']
 
-    # Making Batting Data Subset
-    team_batting_data_subset=batting_data.loc[list_of_teams,stat_selection4].copy().reset_index()
+    return cached_figure('team_batting',stat_selection4,list_of_teams,seasons,lambda: team_batting_chart(stat_selection4,list_of_teams,seasons,bar_order,min_percentile),options=[bar_order,min_percentile])
 
-    # Batting Chart
-    team_batting_figure=px.bar(
-        team_batting_data_subset,
-        x=stat_selection4,
-        y='Team',
-        orientation='h',
-        text_auto=True,
-        title=' ',
-        color='Team',
-        color_discrete_map={
-            'Arizona Diamondbacks':'#A71930',
-            'Atlanta Braves':'#13274F',
-            'Baltimore Orioles':'#DF4601',
-            'Boston Red Sox':'#BD3039',
-            'Chicago White Sox':'#27251F',
-            'Chicago Cubs':'#0E3386',
-            'Cincinnati Reds':'#C6011F',
-            'Cleveland Guardians':'#00385D',
-            'Colorado Rockies':'#333366',
-            'Detroit Tigers':'#0C2340',
-            'Houston Astros':'#002D62',
-            'Kansas City Royals':'#004687',
-            'Los Angeles Angels':'#BA0021',
-            'Los Angeles Dodgers':'#005A9C',
-            'Miami Marlins':'#000000',
-            'Milwaukee Brewers':'#12284B',
-            'Minnesota Twins':'#002B5C',
-            'New York Yankees':'#003087',
-            'New York Mets':'#002D72',
-            'Oakland Athletics':'#003831',
-            'Philadelphia Phillies':'#E81828',
-            'Pittsburgh Pirates':'#FDB827',
-            'San Diego Padres':'#2F241D',
-            'San Francisco Giants':'#FD5A1E',
-            'Seattle Mariners':'#0C2C56',
-            'St. Louis Cardinals':'#C41E3A',
-            'Tampa Bay Rays':'#092C5C',
-            'Texas Rangers':'#003278',
-            'Toronto Blue Jays':'#134A8E',
-            'Washington Nationals':'#AB0003',
-        }
-    )
+# Building the Batting Chart on a Cache Miss
+def team_batting_chart(stat_selection4,list_of_teams,seasons,bar_order,min_percentile):
+    # Making Batting Data Subset, Ranked Against the Whole League
+    with timed('subset'):
+        team_batting_data_subset=season_rows('team_batting',list_of_teams,stat_selection4,seasons)
+        team_batting_data_subset=rank_rows('team_batting',team_batting_data_subset,stat_selection4,min_percentile)
+        team_batting_order=team_batting_data_subset.sort_values('Percentile')['Team'].tolist() if bar_order=='percentile' else None
 
-    team_batting_figure.update_xaxes(
-        title_font={
-        'size': 18,
-        'color': 'black'
-        },
-        tickfont=dict(
-            size=14,
-            color='black'
-        ),
-        showgrid=True,
-        gridwidth=1,
-        gridcolor='black',
-        showline=True,
-        linewidth=1,
-        linecolor='black'
-    )
+    # Batting Chart
+    with timed('build'):
+        return bar_figure(
+            team_batting_template,
+            team_batting_data_subset['Team'].tolist(),
+            display_values(team_batting_data_subset[stat_selection4]),
+            team_colors(team_batting_data_subset['Team']),
+            stat_selection4,
+            'Team',
+            notes=team_batting_data_subset['Note'].tolist(),
+            order=team_batting_order
+        )
 
-    team_batting_figure.update_yaxes(
-        title_text='Team(s)',
-        title_font={
-        'size': 18,
-        'color': 'black'
-        },
-        tickfont=dict(
-            size=14,
-            color='black'
-        ),
-        showline=True,
-        linewidth=1,
-        linecolor='black',
-        categoryorder='total ascending'
-    )
+# Section for the Data Age Callback
+@callback(
+    Output('team_batting_data_age','children'),
+    Input('season_choice','value'),
+)
 
-    team_batting_figure.update_layout(
-        title_font={
-        'size': 24,
-        'color': 'black'
-        },
-        title_x=0.5,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        margin=dict(l=0,r=0,t=0,b=0),
-        showlegend=False,
-    )
+def data_age(seasons):
+    return data_age_text('team_batting',seasons)
 
-    team_batting_figure.update_traces(
-        textfont_size=14
+# Section for the Download Links Callback
+@callback(
+    [Output('team_batting_export_{}'.format(x),'href') for x in EXPORT_FORMATS],
+    Input('team_batting_stat_choice','value'),
+    Input('team_dropdown','value'),
+    Input('season_choice','value'),
+    Input('team_batting_export_scope','value'),
 )
-    return team_batting_figure
+
+def export_hrefs(stat_selection4,list_of_teams,seasons,scope):
+    # The links name the same data the chart was just drawn from
+    return export_links('team_batting',seasons,list_of_teams or ['Houston Astros'],[stat_selection4 or 'Home Runs (HR)'],None,scope)
@@ -1,97 +1,22 @@
 
-import pandas as pd
-import plotly.express as px
 import dash
 from dash import Dash, html, dcc, Input, Output, State, callback
 import dash_bootstrap_components as dbc
-from pybaseball import team_pitching
-
-# Creating Pitching Stats Dataframe
-pitching_data_2022=team_pitching(2022)
-pitching_data=pitching_data_2022[['Season','Team','Pitches','Strikes','W','L','SV','BS','G','CG','IP','TBF','H','R','ER','HR','BB','HBP','SO','WP','BK','K/9','BB/9','K/BB','GB/FB','LD%','GB%','FB%','LOB%','H/9','HR/9','AVG','ERA','WHIP','BABIP','FIP','WAR']].copy()
-pitching_data['Team']=pitching_data['Team'].replace(
-    {
-        'NYY':'New York Yankees',
-        'BOS':'Boston Red Sox',
-        'BAL':'Baltimore Orioles',
-        'TBR':'Tampa Bay Rays',
-        'TOR':'Toronto Blue Jays',
-        'CLE':'Cleveland Guardians',
-        'DET':'Detroit Tigers',
-        'KCR':'Kansas City Royals',
-        'MIN':'Minnesota Twins',
-        'CHW':'Chicago White Sox',
-        'HOU':'Houston Astros',
-        'OAK':'Oakland Athletics',
-        'LAA':'Los Angeles Angels',
-        'SEA':'Seattle Mariners',
-        'TEX':'Texas Rangers',
-        'NYM':'New York Mets',
-        'ATL':'Atlanta Braves',
-        'WSN':'Washington Nationals',
-        'PHI':'Philadelphia Phillies',
-        'MIA':'Miami Marlins',
-        'STL':'St. Louis Cardinals',
-        'CHC':'Chicago Cubs',
-        'PIT':'Pittsburgh Pirates',
-        'MIL':'Milwaukee Brewers',
-        'CIN':'Cincinnati Reds',
-        'SDP':'San Diego Padres',
-        'LAD':'Los Angeles Dodgers',
-        'SFG':'San Francisco Giants',
-        'ARI':'Arizona Diamondbacks',
-        'COL':'Colorado Rockies'
-    }
-)
-pitching_data.rename(
-    columns={
-        'W':'Wins (W)',
-        'L':'Losses (L)',
-        'SV':'Saves (SV)',
-        'BS':'Blown Saves (BS)',
-        'G':'Games Played (G)',
-        'CG':'Complete Games (CG)',
-        'IP':'Innings Pitched (IP)',
-        'TBF':'Total Batters Faced (TBF)',
-        'H':'Hits (H)',
-        'R':'Runs Scored Against (R)',
-        'ER':'Earned Runs (ER)',
-        'HR':'Home Runs Allowed (HR)',
-        'BB':'Walks (BB)',
-        'HBP':'Batters Hit By Pitches (HBP)',
-        'SO':'Strikeouts (SO)',
-        'WP':'Wild Pitches',
-        'BK':'Balks',
-        'K/9':'Number of Strikeouts Per 9 Innings (K/9)',
-        'BB/9':'Number of Walks Per 9 Innings (BB/9)',
-        'K/BB':'Strikeout to Walk Ratio (K/BB)',
-        'GB/FB':'Ground Ball-to-Fly Ball Ratio (GB/FB)','LD%':'Line Drive Percentage (LD%)',
-        'GB%':'Ground Ball Percentage (GB%)',
-        'FB%':'Fly Ball Percentage (FB%)',
-        'LOB%':'Runners Left On Base Percentage (LOB%)',
-        'H/9':'Hits Given Up Per 9 Innings (H/9)',
-        'HR/9':'Home Runs Given Up Per 9 Innings (HR/9)',
-        'AVG':"Opponents' Batting Average (AVG)",
-        'ERA':'Earned Run Average (ERA)',
-        'WHIP':'Walks And Hits Per Inning Pitched (WHIP)',
-        'BABIP':'Batting Average on Balls in Play (BABIP)',
-        'FIP':'Fielding Independent Pitching (FIP)',
-        'WAR':'Wins Above Replacement (WAR)'
-    },
-    inplace=True
-)
-pitching_data.loc[:,('Season')]
-
-# Creating and Setting an Index
-pitching_data.loc[:,('Team')]
-pitching_data.set_index('Team',inplace=True)
-
-# Removing Pitching Dataframe Column
-pitching_data.drop(columns=['Season'],inplace=True)
+from mlb.datasets import data_age_text, season_rows, stat_names
+from mlb.compact import display_values
+from mlb.export import EXPORT_FORMATS, export_links
+from mlb.figure_cache import cached_figure
+from mlb.instrumentation import timed
+from mlb.ranks import rank_rows
+from mlb.figures import bar_figure, bar_template
+from mlb.teams import TEAM_NAME_LIST, team_colors
 
 # Sorting a List for Dashboard Components
-pitching_stat_list=[x for x in pitching_data.columns]
-pitching_team_list=[x for x in pitching_data.index]
+pitching_stat_list=stat_names('team_pitching')
+pitching_team_list=TEAM_NAME_LIST
+
+# Building the Chart Template Once
+team_pitching_template=bar_template('Team(s)',title_size=20,tick_size=16)
 
 # Registering the Pitching Page
 dash.register_page(__name__)
@@ -100,8 +25,8 @@ dash.register_page(__name__)
 layout=dbc.Container(
     children=[
     # Title and Dashboard Explanation
-    html.H1('MLB Team Pitching Results (2022 Season)',className='text-center text-danger mt-3 mb-2 fs-1'),
-    html.P("This is the best place to be for pitching data sorted by teams! Much like the Team Batting Data page, this page includes more than 30 different statistical measures and all 30 MLB teams' seasonal pitching data from the 2022 campaign. This graph works as you select different statistical measures and choose different MLB teams to review with those statistical measures.",className='text-center text-dark mb-3 mt-2 fs-6'),
+    html.H1('MLB Team Pitching Results (2015-Present)',className='text-center text-danger mt-3 mb-2 fs-1'),
+    html.P("This is the best place to be for pitching data sorted by teams! Much like the Team Batting Data page, this page includes more than 30 different statistical measures and all 30 MLB teams' seasonal pitching data from every campaign since 2015. This graph works as you select different statistical measures and choose different MLB teams to review with those statistical measures. With several seasons picked in the navigation bar, each team's staff gets one bar per season so you can track it over the years.",className='text-center text-dark mb-3 mt-2 fs-6'),
     html.H3('Team Pitching Data Bar Chart', className='text-primary text-center fs-2 mt-3 mb-0'),
     # The Graph
     dbc.Row([
@@ -112,11 +37,32 @@ layout=dbc.Container(
                     className='m-4',
                     config=dict(displayModeBar=False),
                 ),
+                html.P(id='team_pitching_data_age',className='text-center text-muted fs-6 mb-0'),
             ],
             width=10,
             className='offset-md-1'
         )
     ]),
+    # Download Buttons
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.Span('Download the data behind this chart:',className='text-dark fs-6 me-2'),
+                dcc.RadioItems(
+                    id='team_pitching_export_scope',
+                    options=[dict(label=' Charted Rows',value='selection'),dict(label=' Full Table',value='full')],
+                    value='selection',
+                    inline=True,
+                    inputClassName='ms-3',
+                    className='d-inline-block text-dark fs-6 me-2'
+                ),
+            ]+[
+                dbc.Button(EXPORT_FORMATS[x]['label'],id='team_pitching_export_{}'.format(x),href='',external_link=True,color='primary',outline=True,size='sm',className='ms-2') for x in EXPORT_FORMATS
+            ],
+            width=10,
+            className='offset-md-1 text-center mt-2'
+        )
+    ]),
     # User Commands
     dbc.Row([
         dbc.Col(
@@ -169,6 +115,42 @@ layout=dbc.Container(
             className='offset-md-2'
         )
     ]),
+    # Percentile Ordering and Filtering
+    dbc.Row([
+        dbc.Col(
+            children=[
+                html.P('Please choose how the bars are ordered.',className='text-center text-dark fs-5 mt-3'),
+                dcc.RadioItems(
+                    id='team_pitching_bar_order',
+                    options=[dict(label=' Value',value='value'),dict(label=' Percentile',value='percentile')],
+                    value='value',
+                    inline=True,
+                    inputClassName='ms-3',
+                    className='text-center text-dark fs-6 mt-1 mb-3'
+                )
+            ],
+            width=4,
+            className='offset-md-1'
+        ),
+        dbc.Col(
+            children=[
+                html.P('Please select the minimum percentile a team needs to be charted.',className='text-center text-dark fs-5 mt-3'),
+                dcc.Slider(
+                    id='team_pitching_min_percentile',
+                    min=0,
+                    max=100,
+                    step=5,
+                    value=0,
+                    marks={0:'0',25:'25th',50:'50th',75:'75th',100:'100th'},
+                    tooltip=dict(placement='bottom'),
+                    className='mt-1 mb-3'
+                )
+            ],
+            width=4,
+            className='offset-md-2'
+        )
+    ]),
+
     # Data Sources and Information
     html.Div(
         children=[
@@ -199,107 +181,59 @@ layout=dbc.Container(
     Output('team_pitching_bar_chart','figure'),
     Input('team_pitching_stat_choice','value'),
     Input('pitching_team_dropdown','value'),
+    Input('season_choice','value'),
+    Input('team_pitching_bar_order','value'),
+    Input('team_pitching_min_percentile','value'),
 )
 
-def charts(stat_selection5,list_of_pitching_teams):
+def charts(stat_selection5,list_of_pitching_teams,seasons,bar_order,min_percentile):
     if len(stat_selection5)==0:
-        stat_selection5 = ['Earned Run Average (ERA)']
+        stat_selection5 = 'Earned Run Average (ERA)'
 
     if len(list_of_pitching_teams)==0:
         list_of_pitching_teams = ['Houston Astros']
 
-    # Making Batting Data Subset
-    team_pitching_data_subset=pitching_data.loc[list_of_pitching_teams,stat_selection5].copy().reset_index()
-
-    # Batting Chart
-    team_pitching_figure=px.bar(
-        team_pitching_data_subset,
-        x=stat_selection5,
-        y='Team',
-        orientation='h',
-        text_auto=True,
-        title=' ',
-        color='Team',
-        color_discrete_map={
-            'Arizona Diamondbacks':'#A71930',
-            'Atlanta Braves':'#13274F',
-            'Baltimore Orioles':'#DF4601',
-            'Boston Red Sox':'#BD3039',
-            'Chicago White Sox':'#27251F',
-            'Chicago Cubs':'#0E3386',
-            'Cincinnati Reds':'#C6011F',
-            'Cleveland Guardians':'#00385D',
-            'Colorado Rockies':'#333366',
-            'Detroit Tigers':'#0C2340',
-            'Houston Astros':'#002D62',
-            'Kansas City Royals':'#004687',
-            'Los Angeles Angels':'#BA0021',
-            'Los Angeles Dodgers':'#005A9C',
-            'Miami Marlins':'#000000',
-            'Milwaukee Brewers':'#12284B',
-            'Minnesota Twins':'#002B5C',
-            'New York Yankees':'#003087',
-            'New York Mets':'#002D72',
-            'Oakland Athletics':'#003831',
-            'Philadelphia Phillies':'#E81828',
-            'Pittsburgh Pirates':'#FDB827',
-            'San Diego Padres':'#2F241D',
-            'San Francisco Giants':'#FD5A1E',
-            'Seattle Mariners':'#0C2C56',
-            'St. Louis Cardinals':'#C41E3A',
-            'Tampa Bay Rays':'#092C5C',
-            'Texas Rangers':'#003278',
-            'Toronto Blue Jays':'#134A8E',
-            'Washington Nationals':'#AB0003',
-        }
-    )
-
-    team_pitching_figure.update_xaxes(
-        title_font={
-        'size': 20,
-        'color': 'black'
-        },
-        tickfont=dict(
-            size=16,
-            color='black'
-        ),
-        showgrid=True,
-        gridwidth=1,
-        gridcolor='black',
-        showline=True,
-        linewidth=1,
-        linecolor='black'
-    )
+    return cached_figure('team_pitching',stat_selection5,list_of_pitching_teams,seasons,lambda: team_pitching_chart(stat_selection5,list_of_pitching_teams,seasons,bar_order,min_percentile),options=[bar_order,min_percentile])
+
+# Building the Pitching Chart on a Cache Miss
+def team_pitching_chart(stat_selection5,list_of_pitching_teams,seasons,bar_order,min_percentile):
+    # Making Pitching Data Subset, Ranked Against the Whole League
+    with timed('subset'):
+        team_pitching_data_subset=season_rows('team_pitching',list_of_pitching_teams,stat_selection5,seasons)
+        team_pitching_data_subset=rank_rows('team_pitching',team_pitching_data_subset,stat_selection5,min_percentile)
+        team_pitching_order=team_pitching_data_subset.sort_values('Percentile')['Team'].tolist() if bar_order=='percentile' else None
+
+    # Pitching Chart
+    with timed('build'):
+        return bar_figure(
+            team_pitching_template,
+            team_pitching_data_subset['Team'].tolist(),
+            display_values(team_pitching_data_subset[stat_selection5]),
+            team_colors(team_pitching_data_subset['Team']),
+            stat_selection5,
+            'Team',
+            notes=team_pitching_data_subset['Note'].tolist(),
+            order=team_pitching_order
+        )
 
-    team_pitching_figure.update_yaxes(
-        title_text='Team(s)',
-        title_font={
-        'size': 20,
-        'color': 'black'
-        },
-        tickfont=dict(
-            size=16,
-            color='black'
-        ),
-        showline=True,
-        linewidth=1,
-        linecolor='black',
-        categoryorder='total ascending'
-    )
+# Section for the Data Age Callback
+@callback(
+    Output('team_pitching_data_age','children'),
+    Input('season_choice','value'),
+)
 
-    team_pitching_figure.update_layout(
-        title_font={
-        'size': 24,
-        'color': 'black'
-        },
-        title_x=0.5,
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        margin=dict(l=0,r=0,t=0,b=0),
-        showlegend=False,
-    )
+def data_age(seasons):
+    return data_age_text('team_pitching',seasons)
 
-    team_pitching_figure.update_traces(
-        textfont_size=14
+# Section for the Download Links Callback
+@callback(
+    [Output('team_pitching_export_{}'.format(x),'href') for x in EXPORT_FORMATS],
+    Input('team_pitching_stat_choice','value'),
+    Input('pitching_team_dropdown','value'),
+    Input('season_choice','value'),
+    Input('team_pitching_export_scope','value'),
 )
-    return team_pitching_figure
+
+def export_hrefs(stat_selection5,list_of_pitching_teams,seasons,scope):
+    # The links name the same data the chart was just drawn from
+    return export_links('team_pitching',seasons,list_of_pitching_teams or ['Houston Astros'],[stat_selection5 or 'Earned Run Average (ERA)'],None,scope)
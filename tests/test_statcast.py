@@ -0,0 +1,154 @@
+import importlib
+import os
+import zlib
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from mlb import config, statcast
+
+TEAMS = ['NYY', 'BOS', 'TB', 'TOR', 'BAL', 'HOU', 'SEA', 'LAD', 'SD', 'SF', 'ATL', 'NYM', 'PHI', 'WSH', 'CWS', 'KC']
+PITCH_TYPES = ['FF', 'SL', 'CH', 'CU', 'SI', 'FC']
+EVENTS = ['field_out', 'strikeout', 'single', 'walk', 'double', 'home_run', 'hit_by_pitch', 'sac_fly', 'triple']
+EVENT_WEIGHTS = [0.46, 0.22, 0.14, 0.08, 0.045, 0.03, 0.01, 0.01, 0.005]
+
+SEASON = 2022
+
+
+# Local Stand-In for pybaseball.statcast With Deterministic Pitches per Day
+class StatcastStandIn:
+    def __init__(self, pitchers=120, batters=300, games_per_day=8, pitches_per_game=290):
+        self.pitchers = pitchers
+        self.batters = batters
+        self.games_per_day = games_per_day
+        self.pitches_per_game = pitches_per_game
+        self.calls = []
+
+    def names(self, ids):
+        return {int(x): 'Batter {}'.format(int(x)) for x in ids}
+
+    def day(self, day):
+        count = self.games_per_day * self.pitches_per_game
+        if day.month < 4 or day.month > 9:
+            return None
+        random = np.random.default_rng(zlib.crc32(day.isoformat().encode()))
+        games = np.repeat(np.arange(self.games_per_day), self.pitches_per_game)
+        home = np.asarray(TEAMS)[games * 2 % len(TEAMS)]
+        away = np.asarray(TEAMS)[(games * 2 + 1) % len(TEAMS)]
+        pitchers = random.integers(0, self.pitchers, count)
+        # Every fourth pitch ends the plate appearance
+        last_pitch = np.arange(count) % 4 == 3
+        events = np.where(last_pitch, random.choice(EVENTS, count, p=EVENT_WEIGHTS), None)
+        return pd.DataFrame(dict(
+            game_date=day.isoformat(),
+            game_pk=day.toordinal() * 100 + games,
+            at_bat_number=np.arange(count) // 4 % 80 + 1,
+            pitch_number=np.arange(count) % 4 + 1,
+            inning_topbot=np.where(np.arange(count) // 20 % 2, 'Bot', 'Top'),
+            home_team=home,
+            away_team=away,
+            pitcher=600000 + pitchers,
+            player_name=['Pitcher, Number {}'.format(x) for x in pitchers],
+            batter=650000 + random.integers(0, self.batters, count),
+            p_throws=np.where(pitchers % 3, 'R', 'L'),
+            stand=np.where(random.random(count) < 0.4, 'L', 'R'),
+            pitch_type=random.choice(PITCH_TYPES, count),
+            release_speed=random.normal(91, 5, count).round(1),
+            release_spin_rate=random.normal(2300, 250, count).round(),
+            plate_x=random.normal(0, 0.8, count).round(3),
+            plate_z=random.normal(2.5, 0.9, count).round(3),
+            hc_x=random.normal(125, 40, count).round(2),
+            hc_y=random.normal(150, 40, count).round(2),
+            launch_speed=random.normal(88, 14, count).round(1),
+            launch_angle=random.normal(12, 25, count).round(),
+            events=events,
+        ))
+
+    def __call__(self, start, end):
+        self.calls.append((start, end))
+        days = [self.day(start + timedelta(days=x)) for x in range((end - start).days + 1)]
+        days = [x for x in days if x is not None]
+        return pd.concat(days, ignore_index=True) if days else pd.DataFrame(columns=['game_date', 'inning_topbot', 'home_team', 'away_team', 'player_name', 'batter'])
+
+
+class Interrupted(Exception):
+    pass
+
+
+def interrupt_after(fetch, chunks):
+    def wrapper(start, end):
+        if len(fetch.calls) >= chunks:
+            raise Interrupted()
+        return fetch(start, end)
+    return wrapper
+
+
+# Ingesting Into a Scratch Directory With a Small League
+@pytest.fixture
+def stand_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'STATCAST_DIR', str(tmp_path))
+    return StatcastStandIn(pitchers=12, batters=30, games_per_day=2, pitches_per_game=40)
+
+
+def ingest(stand_in, today, fetch=None):
+    return statcast.ingest_season(SEASON, fetch=fetch or stand_in, lookup=stand_in.names, chunk_days=7, today=today)
+
+
+def test_resume_skips_completed_chunks(stand_in):
+    # After the season every chunk is complete, so nothing is left to fetch once both runs finish
+    today = date(SEASON, 12, 31)
+    chunks = list(statcast.season_chunks(SEASON, 7, today))
+    with pytest.raises(Interrupted):
+        ingest(stand_in, today, interrupt_after(stand_in, 3))
+    assert stand_in.calls == chunks[:3]
+
+    ingest(stand_in, today)
+    # Each chunk is fetched exactly once across the interrupted run and the resumed one
+    assert stand_in.calls == chunks
+
+    ingest(stand_in, today)
+    assert stand_in.calls == chunks
+
+
+def test_manifest_records_each_chunk(stand_in):
+    today = date(SEASON, 4, 20)
+    manifest = ingest(stand_in, today)
+    chunks = list(statcast.season_chunks(SEASON, 7, today))
+
+    assert statcast.read_manifest(SEASON) == manifest
+    assert sorted(manifest['chunks']) == ['{}/{}'.format(start, end) for start, end in chunks]
+    for start, end in chunks:
+        entry = manifest['chunks']['{}/{}'.format(start, end)]
+        assert entry['rows'] == len(stand_in(start, end))
+        # Only the chunk reaching today can still gain games
+        assert entry['complete'] == (end < today)
+
+    # The open chunk is fetched again on the next run, the finished ones are not
+    stand_in.calls.clear()
+    ingest(stand_in, today)
+    assert stand_in.calls == chunks[-1:]
+
+
+def test_read_pitches_prunes_partitions_and_columns(stand_in, monkeypatch):
+    ingest(stand_in, date(SEASON, 4, 20))
+
+    # Files are listed without being opened, so only the partitions a read touches need to be valid
+    ds = importlib.import_module('pyarrow.dataset')
+    files = statcast.pitch_dataset(SEASON).files
+    partitioning = ds.partitioning(pa.schema([('game_date', pa.string())]), flavor='hive')
+    monkeypatch.setattr(statcast, 'pitch_dataset', lambda season: ds.dataset(files, format='parquet', partitioning=partitioning, partition_base_dir=statcast.season_dir(season)))
+    with open(os.path.join(statcast.partition_dir(SEASON, '{}-04-19'.format(SEASON)), 'part-0.parquet'), 'wb') as handle:
+        handle.write(b'not parquet')
+    with pytest.raises(Exception):
+        statcast.read_pitches(SEASON, ['plate_x'])
+
+    pitches = statcast.read_pitches(SEASON, ['plate_x', 'plate_z', 'pitcher_label'], start='{}-04-10'.format(SEASON), end='{}-04-12'.format(SEASON), pitcher_label=['Number 7 Pitcher (NYY)'])
+    assert list(pitches.columns) == ['plate_x', 'plate_z', 'pitcher_label']
+    assert len(pitches) > 0
+    assert set(pitches['pitcher_label']) == {'Number 7 Pitcher (NYY)'}
+
+    days = statcast.read_pitches(SEASON, ['game_date'], start='{}-04-10'.format(SEASON), end='{}-04-12'.format(SEASON))
+    assert set(days['game_date'].astype(str)) == {'{}-04-{}'.format(SEASON, x) for x in (10, 11, 12)}